@@ -1,14 +1,24 @@
 #!/usr/bin/env python3
 
-from flask import Flask, jsonify, request, render_template_string, send_from_directory
+from flask import Flask, jsonify, request
 from flask_cors import CORS
-from dbConfig import GetAllDB, get_kuliah_with_dosen_info, db, get_schedule_data
-from scheduler_wrapper import UniversityScheduler
-from parameter_optimizer import ParameterOptimizer
-import json
-import os
+from dbConfig import (GetAllDB, get_kuliah_with_dosen_info, db, get_schedule_data,
+                      load_compiled_preferences, upsert_preference,
+                      get_data_version, get_table_versions,
+                      delete_preference as db_delete_preference)
+from parameter_optimizer import ParameterOptimizer, InfeasibleScheduleError
+from parameter_tuner import run_tuning_job, TUNING_CACHE_DIR, TUNING_KEY_PARAMS, TUNING_MESSAGES
+from result_store import ScheduleResultStore
+from result_cache import ResultCache
+from runtime_model import RunHistory
+from job_manager import JobManager, ACTIVE_STATUSES
+from event_stream import stream_job_events, parse_last_event_id
+from read_cache import ReferenceCache, payload_response, encode_json
+from schedule_index import SessionIndexCache, FILTER_FIELDS, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from static_assets import StaticAssets
 import threading
-import time
+from collections import OrderedDict
+from functools import lru_cache, partial
 
 app = Flask(__name__)
 CORS(app)
@@ -16,114 +26,76 @@ CORS(app)
 # Configure Flask
 app.config['JSON_SORT_KEYS'] = False
 
-# Global variables for schedule generation
-current_schedule_task = None
-schedule_progress = {'status': 'idle', 'progress': 0, 'message': ''}
-generated_schedule = None
+# Measured runs that train ParameterOptimizer's runtime estimates
+run_history = RunHistory()
+
+# Schedule generation jobs (bounded worker pool, per-job progress and results,
+# identical requests served from the disk-backed result cache)
+job_manager = JobManager(result_cache=ResultCache(get_data_version), run_history=run_history)
+
+# Parameter tuning runs (successive halving over truncated trials), one at a
+# time, cached per data version
+tuning_manager = JobManager(runner=partial(run_tuning_job, generation_manager=job_manager), max_workers=1,
+                            result_cache=ResultCache(get_data_version, directory=TUNING_CACHE_DIR,
+                                                     key_params=TUNING_KEY_PARAMS),
+                            messages=TUNING_MESSAGES)
+
+# Persisted schedules (schedule_results / scheduling_logs)
+result_store = ScheduleResultStore()
+
+# Indexes over persisted sessions served when no job result is in memory
+session_indexes = SessionIndexCache(result_store.load_result)
+
+# Reference data for read endpoints, rebuilt only when data_version changes
+reference_cache = ReferenceCache(
+    build=lambda: load_reference_data(),
+    index_fields={
+        'waktu_by_day': ('waktu', 'nama_hari'),
+        'kuliah_by_prodi': ('kuliah', 'kode_prodi'),
+        'dosen_by_prodi': ('dosen', 'kode_prodi')
+    },
+    version_func=get_data_version,
+    dumps=app.json.dumps
+)
+
+# Page shell held in memory with precompressed variants (STATIC_RELOAD=1 picks up edits)
+static_assets = StaticAssets()
+static_assets.preload('index.html')
 
 @app.route('/')
 def index():
     """Serve the main HTML page"""
-    try:
-        with open('index.html', 'r', encoding='utf-8') as f:
-            html_content = f.read()
-        return html_content
-    except FileNotFoundError:
-        return "index.html not found", 404
+    # Not versioned by URL, so browsers revalidate it (a 304 from memory)
+    return static_assets.response('index.html', cache_control='no-cache')
+
+def load_reference_data():
+    """Load all reference data served by /api/data"""
+    return {
+        'dosen': GetAllDB('dosen'),
+        'kuliah': get_kuliah_with_dosen_info(),
+        'waktu': GetAllDB('waktu'),
+        'ruangan': GetAllDB('ruangan'),
+        'preferences': get_preferences_with_details()
+    }
 
 @app.route('/api/data')
 def get_all_data():
-    """Get all data needed for the frontend"""
+    """Get all data needed for the frontend (ETag / 304, gzip or brotli)"""
     try:
-        # Get all basic data
-        dosen_data = GetAllDB('dosen')
-        kuliah_data = get_kuliah_with_dosen_info()
-        waktu_data = GetAllDB('waktu')
-        ruangan_data = GetAllDB('ruangan')
-        
-        # Get preferences data
-        preferences_data = get_preferences_with_details()
-        
-        return jsonify({
-            'dosen': dosen_data,
-            'kuliah': kuliah_data,
-            'waktu': waktu_data,
-            'ruangan': ruangan_data,
-            'preferences': preferences_data
-        })
+        return payload_response(reference_cache.snapshot().payload())
     except Exception as e:
         print(f"Error getting data: {e}")
         return jsonify({'error': str(e)}), 500
 
 def get_preferences_with_details():
     """Get preferences data with waktu details"""
-    if not db.connect():
-        return []
-    
     try:
-        cursor = db.connection.cursor(dictionary=True)
-        
-        # Query to get preferences with waktu details
-        query = """
-        SELECT r.id, r.nidn, r.nama_dosen, r.hari, 
-               r.waktu_suka, r.waktu_tidak_bisa,
-               r.created_at, r.updated_at
-        FROM referensi_waktu_dosen r
-        ORDER BY r.nama_dosen, r.hari
-        """
-        
-        cursor.execute(query)
-        preferences = cursor.fetchall()
-        
-        # Process each preference to add waktu details
-        for pref in preferences:
-            # Parse JSON arrays
-            try:
-                waktu_suka_ids = json.loads(pref['waktu_suka']) if pref['waktu_suka'] else []
-                waktu_tidak_bisa_ids = json.loads(pref['waktu_tidak_bisa']) if pref['waktu_tidak_bisa'] else []
-            except:
-                waktu_suka_ids = []
-                waktu_tidak_bisa_ids = []
-            
-            # Get waktu details
-            pref['waktu_suka_detail'] = get_waktu_by_ids(waktu_suka_ids)
-            pref['waktu_tidak_bisa_detail'] = get_waktu_by_ids(waktu_tidak_bisa_ids)
-        
-        cursor.close()
-        return preferences
+        # Records come from the normalized slot table with waktu labels already joined
+        return load_compiled_preferences().records
         
     except Exception as e:
         print(f"Error getting preferences: {e}")
         return []
-    
-    finally:
-        db.disconnect()
-
-def get_waktu_by_ids(waktu_ids):
-    """Get waktu details by IDs"""
-    if not waktu_ids:
-        return []
-    
-    if not db.connection or not db.connection.is_connected():
-        if not db.connect():
-            return []
-    
-    try:
-        cursor = db.connection.cursor(dictionary=True)
-        
-        # Create placeholder string for IN clause
-        placeholders = ','.join(['%s'] * len(waktu_ids))
-        query = f"SELECT waktu FROM waktu WHERE kode_waktu IN ({placeholders}) ORDER BY kode_waktu"
-        
-        cursor.execute(query, waktu_ids)
-        results = cursor.fetchall()
-        cursor.close()
-        
-        return [result['waktu'] for result in results]
-        
-    except Exception as e:
-        print(f"Error getting waktu by IDs: {e}")
-        return []
 
 @app.route('/api/preferences', methods=['POST'])
 def add_preference():
@@ -145,47 +117,24 @@ def add_preference():
         if not dosen_name:
             return jsonify({'error': 'Dosen not found'}), 404
         
-        if not db.connect():
-            return jsonify({'error': 'Database connection failed'}), 500
-        
         try:
-            cursor = db.connection.cursor()
-            
-            # Convert arrays to JSON strings
-            waktu_suka = json.dumps(data.get('waktu_suka', []))
-            waktu_tidak_bisa = json.dumps(data.get('waktu_tidak_bisa', []))
-            
             # Insert or update preference
-            insert_sql = """
-            INSERT INTO referensi_waktu_dosen 
-            (nidn, nama_dosen, hari, waktu_suka, waktu_tidak_bisa) 
-            VALUES (%s, %s, %s, %s, %s)
-            ON DUPLICATE KEY UPDATE
-            waktu_suka = VALUES(waktu_suka),
-            waktu_tidak_bisa = VALUES(waktu_tidak_bisa),
-            updated_at = CURRENT_TIMESTAMP
-            """
-            
-            cursor.execute(insert_sql, (
+            upsert_preference(
                 data['nidn'],
                 dosen_name,
                 data['hari'],
-                waktu_suka,
-                waktu_tidak_bisa
-            ))
-            
-            db.connection.commit()
-            cursor.close()
+                data.get('waktu_suka', []),
+                data.get('waktu_tidak_bisa', [])
+            )
             
             return jsonify({'message': 'Preference added successfully'})
             
+        except ValueError as e:
+            return jsonify({'error': f'Invalid waktu list: {str(e)}'}), 400
+        except ConnectionError as e:
+            return jsonify({'error': str(e)}), 500
         except Exception as e:
-            if db.connection:
-                db.connection.rollback()
             return jsonify({'error': f'Database error: {str(e)}'}), 500
-        
-        finally:
-            db.disconnect()
             
     except Exception as e:
         return jsonify({'error': f'Server error: {str(e)}'}), 500
@@ -194,42 +143,49 @@ def add_preference():
 def delete_preference(pref_id):
     """Delete a preference"""
     try:
-        if not db.connect():
-            return jsonify({'error': 'Database connection failed'}), 500
+        # Delete preference
+        if db_delete_preference(pref_id) == 0:
+            return jsonify({'error': 'Preference not found'}), 404
         
-        try:
-            cursor = db.connection.cursor()
-            
-            # Delete preference
-            delete_sql = "DELETE FROM referensi_waktu_dosen WHERE id = %s"
-            cursor.execute(delete_sql, (pref_id,))
-            
-            if cursor.rowcount == 0:
-                return jsonify({'error': 'Preference not found'}), 404
-            
-            db.connection.commit()
-            cursor.close()
-            
-            return jsonify({'message': 'Preference deleted successfully'})
-            
-        except Exception as e:
-            if db.connection:
-                db.connection.rollback()
-            return jsonify({'error': f'Database error: {str(e)}'}), 500
+        return jsonify({'message': 'Preference deleted successfully'})
         
-        finally:
-            db.disconnect()
-            
+    except ConnectionError as e:
+        return jsonify({'error': str(e)}), 500
     except Exception as e:
-        return jsonify({'error': f'Server error: {str(e)}'}), 500
+        return jsonify({'error': f'Database error: {str(e)}'}), 500
+
+@app.route('/api/data-version')
+def data_version():
+    """Get the current reference data version (changes on any dosen/kuliah/waktu/ruangan/preference write)"""
+    try:
+        return jsonify({
+            'version': get_data_version(),
+            'tables': get_table_versions()
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
 
 @app.route('/api/waktu/by-day/<day>')
 def get_waktu_by_day(day):
     """Get waktu slots for a specific day"""
     try:
-        waktu_data = GetAllDB('waktu')
-        day_waktu = [w for w in waktu_data if w['nama_hari'] == day.upper()]
-        return jsonify(day_waktu)
+        return payload_response(reference_cache.snapshot().payload('waktu_by_day', day.upper()))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/kuliah/by-prodi/<kode_prodi>')
+def get_kuliah_by_prodi(kode_prodi):
+    """Get kuliah (with dosen) of one prodi"""
+    try:
+        return payload_response(reference_cache.snapshot().payload('kuliah_by_prodi', kode_prodi))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/dosen/by-prodi/<kode_prodi>')
+def get_dosen_by_prodi(kode_prodi):
+    """Get dosen of one prodi"""
+    try:
+        return payload_response(reference_cache.snapshot().payload('dosen_by_prodi', kode_prodi))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -237,139 +193,410 @@ def get_waktu_by_day(day):
 def not_found(error):
     return jsonify({'error': 'Endpoint not found'}), 404
 
+# Feasibility reports of the current data version, by prodi filter (small LRU)
+MAX_FEASIBILITY_REPORTS = 32
+feasibility_reports = OrderedDict()
+feasibility_lock = threading.Lock()
+
+def feasibility_report(kode_prodi=None):
+    """Capacity check of the current data (optionally a prodi subset), cached per data version"""
+    if isinstance(kode_prodi, str):
+        kode_prodi = [kode_prodi]
+    version = get_data_version()
+    key = (version, tuple(sorted(kode_prodi)) if kode_prodi else None)
+    
+    if version is not None:
+        with feasibility_lock:
+            report = feasibility_reports.get(key)
+            if report is not None:
+                feasibility_reports.move_to_end(key)
+                return report
+                
+    data = get_schedule_data()
+    if kode_prodi:
+        data['kuliah'] = [k for k in data['kuliah'] if k['kode_prodi'] in kode_prodi]
+    report = ParameterOptimizer(data).check_feasibility()
+    if version is not None:
+        with feasibility_lock:
+            if any(cached_version != version for cached_version, _ in feasibility_reports):
+                feasibility_reports.clear()
+            feasibility_reports[key] = report
+            while len(feasibility_reports) > MAX_FEASIBILITY_REPORTS:
+                feasibility_reports.popitem(last=False)
+    return report
+
+def submit_generation_job(data):
+    """
+    Queue a generation job from request parameters
+    
+    Inputs that cannot have a conflict-free schedule are rejected with
+    InfeasibleScheduleError unless allow_infeasible is set.
+    """
+    priority = data.get('priority', 0)
+    if not isinstance(priority, int):
+        raise ValueError('priority must be an integer')
+    if data.get('seed') is not None and not isinstance(data['seed'], int):
+        raise ValueError('seed must be an integer')
+    if not data.get('allow_infeasible'):
+        report = feasibility_report(data.get('kode_prodi'))
+        if not report['feasible']:
+            raise InfeasibleScheduleError(report)
+    return job_manager.submit(data, priority=max(-10, min(10, priority)))
+
+def resolve_job(statuses=None):
+    """Job named by ?job_id=, or the latest job (optionally with one of the given statuses)"""
+    job_id = request.args.get('job_id')
+    if job_id:
+        return job_manager.get(job_id)
+    return job_manager.latest(statuses)
+
+def request_wants_force():
+    """Whether a cancel request asks to kill the worker (?force=1 or {"force": true})"""
+    if request.args.get('force') in ('1', 'true'):
+        return True
+    data = request.get_json(silent=True) or {}
+    return bool(data.get('force'))
+
 @app.route('/api/generate-schedule', methods=['POST'])
 def generate_schedule():
     """Generate schedule using genetic algorithm"""
-    global current_schedule_task, schedule_progress, generated_schedule
-    
     try:
         data = request.get_json() or {}
+        job = submit_generation_job(data)
         
-        # Check if already generating
-        if schedule_progress['status'] == 'generating':
-            return jsonify({'error': 'Schedule generation already in progress'}), 400
-        
-        # Initialize scheduler
-        scheduler = UniversityScheduler()
-        
-        # Update parameters if provided
-        if 'population_size' in data:
-            scheduler.population_size = max(4, min(20, data['population_size']))
-        if 'max_generations' in data:
-            scheduler.max_generations = max(10, min(500, data['max_generations']))
-        if 'crossover_rate' in data:
-            scheduler.crossover_rate = max(0.1, min(1.0, data['crossover_rate']))
-        if 'mutation_rate' in data:
-            scheduler.mutation_rate = max(0.01, min(0.5, data['mutation_rate']))
-        
-        def progress_callback(progress_data):
-            """Update progress during generation"""
-            global schedule_progress
-            schedule_progress.update({
-                'status': 'generating',
-                'progress': progress_data['progress'],
-                'generation': progress_data['generation'],
-                'max_generations': progress_data['max_generations'],
-                'best_fitness': progress_data['best_fitness'],
-                'avg_fitness': progress_data['avg_fitness'],
-                'message': f"Generation {progress_data['generation']}/{progress_data['max_generations']}"
-            })
-        
-        def generate_async():
-            """Run schedule generation in background"""
-            global schedule_progress, generated_schedule
-            try:
-                schedule_progress.update({
-                    'status': 'generating',
-                    'progress': 0,
-                    'message': 'Initializing genetic algorithm...'
-                })
-                
-                result = scheduler.generate_schedule(progress_callback)
-                
-                if result['success']:
-                    generated_schedule = result
-                    schedule_progress.update({
-                        'status': 'completed',
-                        'progress': 100,
-                        'message': 'Schedule generation completed successfully!'
-                    })
-                else:
-                    schedule_progress.update({
-                        'status': 'error',
-                        'progress': 0,
-                        'message': 'Schedule generation failed'
-                    })
-                    
-            except Exception as e:
-                schedule_progress.update({
-                    'status': 'error',
-                    'progress': 0,
-                    'message': f'Error: {str(e)}'
-                })
-        
-        # Start generation in background thread
-        current_schedule_task = threading.Thread(target=generate_async)
-        current_schedule_task.daemon = True
-        current_schedule_task.start()
-        
-        return jsonify({
+        response = {
             'message': 'Schedule generation started',
-            'status': 'generating'
-        })
-        
+            'status': job.status,
+            'job_id': job.job_id,
+            'session_name': job.session_name,
+            'cached': job.cached
+        }
+        if job.status == 'completed':
+            # Served from the result cache: nothing left to wait for
+            response['message'] = 'Schedule loaded from cache'
+            response['result_url'] = f'/api/jobs/{job.job_id}/result'
+        return jsonify(response)
+        
+    except InfeasibleScheduleError as e:
+        return jsonify({'error': f'Infeasible input: {e}', 'feasibility': e.report}), 422
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': f'Failed to start schedule generation: {str(e)}'}), 500
 
+@app.route('/api/jobs', methods=['POST'])
+def create_job():
+    """Queue a schedule generation job"""
+    try:
+        job = submit_generation_job(request.get_json() or {})
+        summary = job.summary()
+        summary['queue_position'] = job_manager.queue_position(job)
+        return jsonify(summary), 202
+        
+    except InfeasibleScheduleError as e:
+        return jsonify({'error': f'Infeasible input: {e}', 'feasibility': e.report}), 422
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': f'Failed to queue job: {str(e)}'}), 500
+
+@app.route('/api/jobs')
+def list_jobs():
+    """List generation jobs, newest first (?status= to filter)"""
+    return jsonify({
+        'workers': job_manager.max_workers,
+        'jobs': job_manager.list_jobs(request.args.get('status'))
+    })
+
+@app.route('/api/jobs/<job_id>')
+def get_job(job_id):
+    """Get the status and progress of a job"""
+    job = job_manager.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    summary = job.summary()
+    summary['queue_position'] = job_manager.queue_position(job)
+    return jsonify(summary)
+
+@app.route('/api/jobs/<job_id>/result')
+def get_job_result(job_id):
+    """Get the generated schedule of a completed job"""
+    job = job_manager.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    if job.result_payload is None:
+        return jsonify({'error': f'Job has no result (status: {job.status})'}), 409
+    
+    # A job's result never changes once set
+    return payload_response(job.result_payload, cache_control='private, max-age=3600')
+
+@app.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Cancel a queued or running job (?force=1 kills its worker process)"""
+    if not job_manager.get(job_id):
+        return jsonify({'error': 'Job not found'}), 404
+    
+    if job_manager.cancel(job_id, force=request_wants_force()):
+        return jsonify({'message': 'Schedule generation cancelled'})
+    
+    return jsonify({'message': 'Job already finished'})
+
+@app.route('/api/jobs/<job_id>/events')
+def job_events(job_id):
+    """Server-Sent Events stream of a job's progress"""
+    job = job_manager.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    return stream_job_events(job, parse_last_event_id())
+
+@app.route('/api/schedule-progress/stream')
+def stream_schedule_progress():
+    """Server-Sent Events stream of the latest job's progress (or ?job_id=)"""
+    job = resolve_job()
+    if not job:
+        return jsonify({'error': 'No schedule generation job found'}), 404
+    
+    return stream_job_events(job, parse_last_event_id())
+
 @app.route('/api/schedule-progress')
 def get_schedule_progress():
-    """Get current progress of schedule generation"""
-    global schedule_progress
-    return jsonify(schedule_progress)
+    """Get current progress of schedule generation (latest job, or ?job_id=)"""
+    job = resolve_job()
+    if not job:
+        return jsonify({'status': 'idle', 'progress': 0, 'message': ''})
+    
+    return jsonify(dict(job.progress, job_id=job.job_id))
+
+@lru_cache(maxsize=8)
+def persisted_result_payload(session_name):
+    """Serialized payload of a persisted session (loaded and encoded once)"""
+    result = result_store.load_result(session_name)
+    return encode_json(result, etag=f"session-{session_name}") if result else None
 
 @app.route('/api/generated-schedule')
 def get_generated_schedule():
-    """Get the generated schedule"""
-    global generated_schedule
+    """Get the generated schedule (latest completed job, or ?job_id=)"""
+    job = resolve_job(statuses=('completed',))
+    if job and job.result_payload is not None:
+        return payload_response(job.result_payload)
+    
+    if not request.args.get('job_id'):
+        # Fall back to the last persisted session (e.g. after a restart)
+        try:
+            session_name = result_store.latest_session_name()
+            payload = persisted_result_payload(session_name) if session_name else None
+            if payload:
+                return payload_response(payload)
+        except Exception as e:
+            print(f"Error loading persisted schedule: {e}")
+    
+    return jsonify({'error': 'No schedule has been generated yet'}), 404
+
+def resolve_schedule_index(job_id=None):
+    """
+    Index of a job's schedule (job_id or ?job_id=), of a persisted session
+    (?session_name=), or of the latest completed job / persisted session
+    """
+    job_id = job_id or request.args.get('job_id')
+    if job_id:
+        job = job_manager.get(job_id)
+        return job.schedule_index if job else None
+    
+    session_name = request.args.get('session_name')
+    if not session_name:
+        job = job_manager.latest(statuses=('completed',))
+        if job and job.schedule_index is not None:
+            return job.schedule_index
+        session_name = result_store.latest_session_name()
+    
+    return session_indexes.get(session_name) if session_name else None
+
+def parse_page_args():
+    """page/per_page query parameters, clamped; raises ValueError when not integers"""
+    page = int(request.args.get('page', 1))
+    per_page = int(request.args.get('per_page', DEFAULT_PAGE_SIZE))
+    return max(1, page), max(1, min(MAX_PAGE_SIZE, per_page))
+
+def schedule_page_response(index):
+    """Filtered (?hari=&dosen=&ruangan=&prodi=) and paginated rows of a schedule"""
+    if index is None:
+        return jsonify({'error': 'No schedule has been generated yet'}), 404
     
-    if not generated_schedule:
+    try:
+        page, per_page = parse_page_args()
+    except ValueError:
+        return jsonify({'error': 'page and per_page must be integers'}), 400
+    
+    filters = {field: request.args.get(field) for field in FILTER_FIELDS}
+    if filters['hari']:
+        filters['hari'] = filters['hari'].upper()
+    return jsonify(index.page(filters, page, per_page))
+
+def timetable_response(index, field, value):
+    """Timetable of one dosen or room"""
+    if index is None:
         return jsonify({'error': 'No schedule has been generated yet'}), 404
     
-    return jsonify(generated_schedule)
+    timetable = index.timetable(field, value)
+    if timetable is None:
+        return jsonify({'error': f'{field} not found in schedule'}), 404
+    return jsonify(timetable)
+
+@app.route('/api/generated-schedule/rows')
+def get_generated_schedule_rows():
+    """Paginated, filtered rows of the generated schedule"""
+    return schedule_page_response(resolve_schedule_index())
+
+@app.route('/api/generated-schedule/dosen/<path:dosen>')
+def get_dosen_timetable(dosen):
+    """Timetable of one dosen in the generated schedule"""
+    return timetable_response(resolve_schedule_index(), 'dosen', dosen)
+
+@app.route('/api/generated-schedule/ruangan/<path:ruangan>')
+def get_ruangan_timetable(ruangan):
+    """Timetable of one room in the generated schedule"""
+    return timetable_response(resolve_schedule_index(), 'ruangan', ruangan)
+
+@app.route('/api/jobs/<job_id>/schedule')
+def get_job_schedule_rows(job_id):
+    """Paginated, filtered rows of a job's schedule"""
+    return schedule_page_response(resolve_schedule_index(job_id))
+
+@app.route('/api/jobs/<job_id>/schedule/dosen/<path:dosen>')
+def get_job_dosen_timetable(job_id, dosen):
+    """Timetable of one dosen in a job's schedule"""
+    return timetable_response(resolve_schedule_index(job_id), 'dosen', dosen)
+
+@app.route('/api/jobs/<job_id>/schedule/ruangan/<path:ruangan>')
+def get_job_ruangan_timetable(job_id, ruangan):
+    """Timetable of one room in a job's schedule"""
+    return timetable_response(resolve_schedule_index(job_id), 'ruangan', ruangan)
+
+@app.route('/api/schedule-sessions')
+def list_schedule_sessions():
+    """List persisted schedule sessions, newest first"""
+    try:
+        limit = max(1, min(500, request.args.get('limit', 50, type=int)))
+        return jsonify(result_store.list_sessions(limit))
+    except Exception as e:
+        return jsonify({'error': f'Failed to list sessions: {str(e)}'}), 500
+
+@app.route('/api/schedule-sessions/<session_name>')
+def get_schedule_session(session_name):
+    """Load a persisted schedule by session name"""
+    try:
+        result = result_store.load_result(session_name)
+    except Exception as e:
+        return jsonify({'error': f'Failed to load session: {str(e)}'}), 500
+    
+    if not result:
+        return jsonify({'error': 'Session not found'}), 404
+    
+    return jsonify(result)
 
 @app.route('/api/cancel-generation', methods=['POST'])
 def cancel_generation():
-    """Cancel current schedule generation"""
-    global schedule_progress, current_schedule_task
+    """Cancel current schedule generation (latest active job, or ?job_id=)"""
+    job = resolve_job(statuses=ACTIVE_STATUSES)
     
-    if schedule_progress['status'] == 'generating':
-        schedule_progress.update({
-            'status': 'cancelled',
-            'progress': 0,
-            'message': 'Schedule generation cancelled'
-        })
-        # Note: Thread cancellation is limited in Python, but we set status to cancelled
-        return jsonify({'message': 'Schedule generation cancelled'})
+    if job and job_manager.cancel(job.job_id, force=request_wants_force()):
+        return jsonify({'message': 'Schedule generation cancelled', 'job_id': job.job_id})
     
     return jsonify({'message': 'No active generation to cancel'})
 
 @app.route('/api/parameter-recommendations')
 def get_parameter_recommendations():
-    """Get optimal parameter recommendations based on data"""
+    """
+    Get optimal parameter recommendations based on data
+    
+    ?time_budget=<seconds> adds parameters chosen to finish within that time.
+    """
+    time_budget = request.args.get('time_budget')
+    if time_budget is not None:
+        try:
+            time_budget = float(time_budget)
+            if time_budget <= 0:
+                raise ValueError
+        except ValueError:
+            return jsonify({'error': 'time_budget must be a positive number of seconds'}), 400
+            
     try:
         # Get current data
         data = get_schedule_data()
         
-        # Create optimizer and get recommendations
-        optimizer = ParameterOptimizer(data)
+        # Create optimizer (with the model learned from recorded runs) and get recommendations
+        optimizer = ParameterOptimizer(data, runtime_model=run_history.model())
         recommendations = optimizer.get_parameter_recommendations()
-        
+        if time_budget is not None:
+            recommendations['budget'] = optimizer.recommend_for_budget(time_budget)
+            
         return jsonify(recommendations)
         
     except Exception as e:
         print(f"Error getting parameter recommendations: {e}")
         return jsonify({'error': f'Failed to get recommendations: {str(e)}'}), 500
 
+@app.route('/api/parameter-tuning', methods=['POST'])
+def start_parameter_tuning():
+    """
+    Start a background tuning run
+    
+    Body (all optional): candidates, trial_seconds, eta, seed, kode_prodi,
+    use_cache. Returns the job; poll GET /api/parameter-tuning/<job_id>.
+    """
+    data = request.get_json(silent=True) or {}
+    for name in ('candidates', 'eta', 'seed'):
+        if data.get(name) is not None and not isinstance(data[name], int):
+            return jsonify({'error': f'{name} must be an integer'}), 400
+    if data.get('trial_seconds') is not None and not isinstance(data['trial_seconds'], (int, float)):
+        return jsonify({'error': 'trial_seconds must be a number'}), 400
+        
+    try:
+        params = dict(data, session_name=ScheduleResultStore.new_session_name('tuning'))
+        job = tuning_manager.submit(params)
+        return jsonify(job.summary()), 202
+    except Exception as e:
+        return jsonify({'error': f'Failed to start parameter tuning: {str(e)}'}), 500
+
+@app.route('/api/parameter-tuning')
+def list_parameter_tuning():
+    """List tuning runs, newest first"""
+    return jsonify({'jobs': tuning_manager.list_jobs(request.args.get('status'))})
+
+@app.route('/api/parameter-tuning/<job_id>')
+def get_parameter_tuning(job_id):
+    """Progress of a tuning run, with the winner and all trials once it finished"""
+    job = tuning_manager.get(job_id)
+    if not job:
+        return jsonify({'error': 'Tuning job not found'}), 404
+        
+    summary = job.summary()
+    summary['result'] = job.result
+    return jsonify(summary)
+
+@app.route('/api/parameter-tuning/<job_id>/cancel', methods=['POST'])
+def cancel_parameter_tuning(job_id):
+    """Stop a tuning run; finished rounds still pick a winner"""
+    if not tuning_manager.get(job_id):
+        return jsonify({'error': 'Tuning job not found'}), 404
+        
+    if tuning_manager.cancel(job_id):
+        return jsonify({'message': 'Parameter tuning cancelled'})
+        
+    return jsonify({'message': 'Job already finished'})
+
+@app.route('/api/feasibility')
+def check_feasibility():
+    """Capacity bounds of the current data (?kode_prodi= to check one prodi)"""
+    try:
+        return jsonify(feasibility_report(request.args.getlist('kode_prodi') or None))
+    except Exception as e:
+        print(f"Error checking feasibility: {e}")
+        return jsonify({'error': f'Failed to check feasibility: {str(e)}'}), 500
+
 @app.route('/api/analyze-complexity')
 def analyze_complexity():
     """Analyze problem complexity"""
@@ -398,7 +625,7 @@ if __name__ == '__main__':
     try:
         # Test database connection
         if db.connect():
-            print("✓ Database connected successfully")
+            print(f"✓ Database connected successfully ({db.backend})")
             db.disconnect()
         else:
             print("✗ Database connection failed")
@@ -0,0 +1,227 @@
+-- ===================================================================
+-- DATABASE SCHEMA SQLITE UNTUK UNIVERSITY SCHEDULING SYSTEM
+-- ===================================================================
+-- Dipakai oleh SQLiteConnection di dbConfig.py (DATABASE_URL=sqlite:///...)
+-- Struktur tabel mengikuti query yang dipakai GetAllDB, get_kuliah_with_dosen_info
+-- dan endpoint preferensi di app.py, sehingga backend MySQL dan SQLite
+-- mengembalikan baris dengan kolom yang sama.
+-- Semua statement idempotent (IF NOT EXISTS) dan dijalankan saat koneksi pertama.
+
+-- ===================================================================
+-- 1. TABEL MASTER DATA
+-- ===================================================================
+
+CREATE TABLE IF NOT EXISTS dosen (
+    nidn VARCHAR(255) PRIMARY KEY,
+    nama VARCHAR(255) NOT NULL,
+    kode_prodi VARCHAR(20)
+);
+
+CREATE INDEX IF NOT EXISTS idx_dosen_nama ON dosen(nama);
+
+CREATE TABLE IF NOT EXISTS kuliah (
+    kode_kuliah INTEGER PRIMARY KEY,
+    kode_matakuliah VARCHAR(50) NOT NULL,
+    kode_dosen VARCHAR(255),
+    nama_kelas VARCHAR(50),
+    kode_prodi VARCHAR(20),
+    sks INTEGER NOT NULL CHECK (sks >= 1)
+);
+
+CREATE INDEX IF NOT EXISTS idx_kuliah_kode_dosen ON kuliah(kode_dosen);
+CREATE INDEX IF NOT EXISTS idx_kuliah_prodi ON kuliah(kode_prodi);
+
+CREATE TABLE IF NOT EXISTS ruangan (
+    id INTEGER PRIMARY KEY,
+    nama_ruangan VARCHAR(50) NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS waktu (
+    kode_waktu INTEGER PRIMARY KEY,
+    nama_hari VARCHAR(10) NOT NULL,
+    waktu VARCHAR(5) NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_waktu_hari ON waktu(nama_hari);
+
+-- ===================================================================
+-- 2. TABEL PREFERENSI DOSEN
+-- ===================================================================
+
+CREATE TABLE IF NOT EXISTS referensi_waktu_dosen (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    nidn VARCHAR(255) NOT NULL,
+    nama_dosen VARCHAR(255) NOT NULL,
+    hari VARCHAR(10) NOT NULL CHECK (hari IN ('SENIN', 'SELASA', 'RABU', 'KAMIS', 'JUMAT', 'SABTU')),
+    waktu_suka TEXT, -- JSON array kode_waktu: [1,2,3]
+    waktu_tidak_bisa TEXT, -- JSON array kode_waktu: [6,7]
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (nidn, hari)
+);
+
+CREATE INDEX IF NOT EXISTS idx_referensi_nama_dosen ON referensi_waktu_dosen(nama_dosen, hari);
+
+-- Preferensi ternormalisasi: satu baris per (nidn, kode_waktu, kind).
+-- Menggantikan pembacaan kolom JSON waktu_suka/waktu_tidak_bisa di atas
+-- (kolom JSON tetap ditulis untuk kompatibilitas).
+CREATE TABLE IF NOT EXISTS preferensi_slot (
+    nidn VARCHAR(255) NOT NULL,
+    kode_waktu INTEGER NOT NULL,
+    kind VARCHAR(10) NOT NULL CHECK (kind IN ('suka', 'tidak_bisa')),
+    referensi_id INTEGER NOT NULL REFERENCES referensi_waktu_dosen(id) ON DELETE CASCADE,
+    PRIMARY KEY (nidn, kode_waktu, kind)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_slot_referensi ON preferensi_slot(referensi_id);
+CREATE INDEX IF NOT EXISTS idx_slot_waktu_kind ON preferensi_slot(kode_waktu, kind);
+
+-- ===================================================================
+-- 3. TABEL HASIL SCHEDULING
+-- ===================================================================
+-- kuliah_id/waktu_id/ruang_id merujuk kuliah.kode_kuliah, waktu.kode_waktu
+-- dan ruangan.id (tanpa foreign key agar hasil lama tetap bisa dibaca
+-- setelah data master berubah).
+
+CREATE TABLE IF NOT EXISTS schedule_results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_name VARCHAR(100),
+    kuliah_id INTEGER NOT NULL,
+    waktu_id INTEGER NOT NULL,
+    ruang_id INTEGER NOT NULL,
+    fitness_score DECIMAL(10,6),
+    generation_found INTEGER,
+    has_violations BOOLEAN DEFAULT FALSE,
+    violation_details TEXT, -- JSON format
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_schedule_session ON schedule_results(session_name);
+CREATE INDEX IF NOT EXISTS idx_schedule_session_fitness ON schedule_results(session_name, fitness_score);
+
+CREATE TABLE IF NOT EXISTS scheduling_logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_name VARCHAR(100),
+    generation INTEGER,
+    best_fitness DECIMAL(10,6),
+    total_penalties INTEGER,
+    reserved_violations INTEGER,
+    preference_violations INTEGER,
+    traditional_clashes INTEGER,
+    execution_time DECIMAL(10,3),
+    ram_usage INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_logs_session_generation ON scheduling_logs(session_name, generation);
+
+-- ===================================================================
+-- 4. VERSI DATA (CHANGE DETECTION)
+-- ===================================================================
+-- Satu counter per tabel master, dinaikkan oleh trigger pada setiap
+-- INSERT/UPDATE/DELETE. Cache dan ETag cukup membandingkan
+-- SUM(version) (lihat get_data_version() di dbConfig.py) tanpa membaca ulang tabel.
+
+CREATE TABLE IF NOT EXISTS data_version (
+    table_name VARCHAR(64) PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT OR IGNORE INTO data_version (table_name, version) VALUES
+('dosen', 0),
+('kuliah', 0),
+('waktu', 0),
+('ruangan', 0),
+('referensi_waktu_dosen', 0),
+('preferensi_slot', 0);
+
+CREATE TRIGGER IF NOT EXISTS trg_dosen_insert_version AFTER INSERT ON dosen
+BEGIN
+    UPDATE data_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE table_name = 'dosen';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_dosen_update_version AFTER UPDATE ON dosen
+BEGIN
+    UPDATE data_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE table_name = 'dosen';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_dosen_delete_version AFTER DELETE ON dosen
+BEGIN
+    UPDATE data_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE table_name = 'dosen';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_kuliah_insert_version AFTER INSERT ON kuliah
+BEGIN
+    UPDATE data_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE table_name = 'kuliah';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_kuliah_update_version AFTER UPDATE ON kuliah
+BEGIN
+    UPDATE data_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE table_name = 'kuliah';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_kuliah_delete_version AFTER DELETE ON kuliah
+BEGIN
+    UPDATE data_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE table_name = 'kuliah';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_waktu_insert_version AFTER INSERT ON waktu
+BEGIN
+    UPDATE data_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE table_name = 'waktu';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_waktu_update_version AFTER UPDATE ON waktu
+BEGIN
+    UPDATE data_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE table_name = 'waktu';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_waktu_delete_version AFTER DELETE ON waktu
+BEGIN
+    UPDATE data_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE table_name = 'waktu';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_ruangan_insert_version AFTER INSERT ON ruangan
+BEGIN
+    UPDATE data_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE table_name = 'ruangan';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_ruangan_update_version AFTER UPDATE ON ruangan
+BEGIN
+    UPDATE data_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE table_name = 'ruangan';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_ruangan_delete_version AFTER DELETE ON ruangan
+BEGIN
+    UPDATE data_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE table_name = 'ruangan';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_referensi_waktu_dosen_insert_version AFTER INSERT ON referensi_waktu_dosen
+BEGIN
+    UPDATE data_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE table_name = 'referensi_waktu_dosen';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_referensi_waktu_dosen_update_version AFTER UPDATE ON referensi_waktu_dosen
+BEGIN
+    UPDATE data_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE table_name = 'referensi_waktu_dosen';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_referensi_waktu_dosen_delete_version AFTER DELETE ON referensi_waktu_dosen
+BEGIN
+    UPDATE data_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE table_name = 'referensi_waktu_dosen';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_preferensi_slot_insert_version AFTER INSERT ON preferensi_slot
+BEGIN
+    UPDATE data_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE table_name = 'preferensi_slot';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_preferensi_slot_update_version AFTER UPDATE ON preferensi_slot
+BEGIN
+    UPDATE data_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE table_name = 'preferensi_slot';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_preferensi_slot_delete_version AFTER DELETE ON preferensi_slot
+BEGIN
+    UPDATE data_version SET version = version + 1, updated_at = CURRENT_TIMESTAMP WHERE table_name = 'preferensi_slot';
+END;
@@ -1,12 +1,44 @@
-import mysql.connector
 import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from dotenv import load_dotenv
 import json
 
+from preferences import CompiledPreferences, parse_waktu_ids, KIND_SUKA, KIND_TIDAK_BISA
+
+try:
+    import mysql.connector
+except ImportError:  # SQLite-only deployments do not need the MySQL driver
+    mysql = None
+
 # Load environment variables from .env file
 load_dotenv()
 
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SQLITE_SCHEMA_FILE = os.path.join(BASE_DIR, 'database_schema_sqlite.sql')
+
 class DatabaseConnection:
+    """MySQL storage backend"""
+    
+    backend = 'mysql'
+    placeholder = '%s'
+    upsert_preference_sql = """
+        INSERT INTO referensi_waktu_dosen 
+        (nidn, nama_dosen, hari, waktu_suka, waktu_tidak_bisa) 
+        VALUES (%s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+        waktu_suka = VALUES(waktu_suka),
+        waktu_tidak_bisa = VALUES(waktu_tidak_bisa),
+        updated_at = CURRENT_TIMESTAMP
+    """
+    upsert_preference_slot_sql = """
+        INSERT INTO preferensi_slot (nidn, kode_waktu, kind, referensi_id)
+        VALUES (%s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE referensi_id = VALUES(referensi_id)
+    """
+    
     def __init__(self):
         self.host = os.getenv('DB_HOST', 'localhost')
         self.port = int(os.getenv('DB_PORT', 3306))
@@ -17,29 +49,41 @@ class DatabaseConnection:
     
     def connect(self):
         """Establish database connection"""
+        if mysql is None:
+            print("Error connecting to MySQL database: mysql-connector-python is not installed")
+            return False
+        
         try:
-            self.connection = mysql.connector.connect(
-                host=self.host,
-                port=self.port,
-                database=self.database,
-                user=self.user,
-                password=self.password,
-                charset='utf8mb4',
-                collation='utf8mb4_unicode_ci'
-            )
+            self.connection = self._open_connection()
             return True
         except mysql.connector.Error as err:
             print(f"Error connecting to MySQL database: {err}")
             return False
     
+    def _open_connection(self):
+        """Open a new MySQL connection with the configured credentials"""
+        return mysql.connector.connect(
+            host=self.host,
+            port=self.port,
+            database=self.database,
+            user=self.user,
+            password=self.password,
+            charset='utf8mb4',
+            collation='utf8mb4_unicode_ci'
+        )
+    
     def disconnect(self):
         """Close database connection"""
         if self.connection and self.connection.is_connected():
             self.connection.close()
     
+    def is_connected(self):
+        """Check whether the connection is open"""
+        return bool(self.connection and self.connection.is_connected())
+    
     def execute_query(self, query, params=None):
         """Execute a SELECT query and return results"""
-        if not self.connection or not self.connection.is_connected():
+        if not self.is_connected():
             if not self.connect():
                 return None
         
@@ -52,9 +96,252 @@ class DatabaseConnection:
         except mysql.connector.Error as err:
             print(f"Error executing query: {err}")
             return None
+    
+    def iter_query(self, query, params=None, batch_size=1000):
+        """
+        Stream a SELECT query as plain tuples, batch_size rows at a time
+        
+        Uses an unbuffered cursor on a dedicated connection, so the server
+        sends rows as they are fetched and other queries on the shared
+        connection are not blocked while the stream is open.
+        """
+        if mysql is None:
+            raise ConnectionError("Database connection failed")
+        
+        connection = self._open_connection()
+        cursor = connection.cursor(buffered=False)
+        try:
+            cursor.execute(query, params or ())
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
+            connection.close()
+    
+    def execute_write(self, query, params=None):
+        """Execute an INSERT/UPDATE/DELETE in its own transaction and return the affected row count"""
+        if not self.is_connected():
+            if not self.connect():
+                raise ConnectionError("Database connection failed")
+        
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(query, params or ())
+            self.connection.commit()
+            return cursor.rowcount
+        except Exception:
+            self.connection.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    def execute_many(self, query, rows):
+        """Execute a parameterized write for every row in one transaction and return the affected row count"""
+        if not self.is_connected():
+            if not self.connect():
+                raise ConnectionError("Database connection failed")
+        
+        cursor = self.connection.cursor()
+        try:
+            cursor.executemany(query, rows)
+            self.connection.commit()
+            return cursor.rowcount
+        except Exception:
+            self.connection.rollback()
+            raise
+        finally:
+            cursor.close()
+    
+    @contextmanager
+    def transaction(self):
+        """Run several statements on one cursor and commit them together (rollback on error)"""
+        if not self.is_connected():
+            if not self.connect():
+                raise ConnectionError("Database connection failed")
+        
+        # Buffered so a SELECT inside the transaction can be followed by more statements
+        cursor = self.connection.cursor(buffered=True)
+        try:
+            yield cursor
+            self.connection.commit()
+        except Exception:
+            self.connection.rollback()
+            raise
+        finally:
+            cursor.close()
+
+class SQLiteConnection:
+    """
+    Embedded SQLite storage backend
+    
+    Each thread gets its own connection (Flask serves requests from several
+    threads), opened in WAL mode so readers never wait on the writer. Queries
+    use ``?`` parameters and sqlite3's per-connection statement cache, so
+    repeated reference-data reads skip re-parsing the SQL.
+    """
+    
+    backend = 'sqlite'
+    placeholder = '?'
+    upsert_preference_sql = """
+        INSERT INTO referensi_waktu_dosen 
+        (nidn, nama_dosen, hari, waktu_suka, waktu_tidak_bisa) 
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT (nidn, hari) DO UPDATE SET
+        waktu_suka = excluded.waktu_suka,
+        waktu_tidak_bisa = excluded.waktu_tidak_bisa,
+        updated_at = CURRENT_TIMESTAMP
+    """
+    upsert_preference_slot_sql = """
+        INSERT INTO preferensi_slot (nidn, kode_waktu, kind, referensi_id)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT (nidn, kode_waktu, kind) DO UPDATE SET
+        referensi_id = excluded.referensi_id
+    """
+    
+    def __init__(self, path=None):
+        self.path = path or os.getenv('SQLITE_PATH', os.path.join(BASE_DIR, 'scheduling.db'))
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._schema_ready = False
+    
+    @property
+    def connection(self):
+        """Connection owned by the calling thread (None until connect())"""
+        return getattr(self._local, 'connection', None)
+    
+    def connect(self):
+        """Open (or reuse) this thread's connection and make sure the schema exists"""
+        if self.connection is not None:
+            return True
+        
+        try:
+            connection = sqlite3.connect(
+                self.path,
+                check_same_thread=False,
+                cached_statements=256
+            )
+            connection.row_factory = _dict_row_factory
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA foreign_keys=ON")
+            connection.execute("PRAGMA busy_timeout=5000")
+            self._local.connection = connection
+            self._ensure_schema(connection)
+            return True
+        except (sqlite3.Error, OSError) as err:
+            print(f"Error connecting to SQLite database: {err}")
+            self._local.connection = None
+            return False
+    
+    def disconnect(self):
+        """Close this thread's connection"""
+        connection = self.connection
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+    
+    def is_connected(self):
+        """Check whether this thread has an open connection"""
+        return self.connection is not None
+    
+    def _ensure_schema(self, connection):
+        """Apply database_schema_sqlite.sql once per process"""
+        if self._schema_ready:
+            return
+        
+        with self._schema_lock:
+            if self._schema_ready:
+                return
+            with open(SQLITE_SCHEMA_FILE, 'r', encoding='utf-8') as f:
+                connection.executescript(f.read())
+            self._schema_ready = True
+    
+    def execute_query(self, query, params=None):
+        """Execute a SELECT query and return results"""
+        if not self.connect():
+            return None
+        
+        try:
+            return self.connection.execute(query, params or ()).fetchall()
+        except sqlite3.Error as err:
+            print(f"Error executing query: {err}")
+            return None
+    
+    def iter_query(self, query, params=None, batch_size=1000):
+        """Stream a SELECT query as plain tuples, batch_size rows at a time"""
+        if not self.connect():
+            raise ConnectionError("Database connection failed")
+        
+        cursor = self.connection.cursor()
+        cursor.row_factory = None  # tuples, not per-row dicts
+        try:
+            cursor.execute(query, params or ())
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            cursor.close()
+    
+    def execute_write(self, query, params=None):
+        """Execute an INSERT/UPDATE/DELETE in its own transaction and return the affected row count"""
+        if not self.connect():
+            raise ConnectionError("Database connection failed")
+        
+        # The connection context manager commits, or rolls back on error
+        with self.connection as connection:
+            cursor = connection.execute(query, params or ())
+        return cursor.rowcount
+    
+    def execute_many(self, query, rows):
+        """Execute a parameterized write for every row in one transaction and return the affected row count"""
+        if not self.connect():
+            raise ConnectionError("Database connection failed")
+        
+        with self.connection as connection:
+            cursor = connection.executemany(query, rows)
+        return cursor.rowcount
+    
+    @contextmanager
+    def transaction(self):
+        """Run several statements on one cursor and commit them together (rollback on error)"""
+        if not self.connect():
+            raise ConnectionError("Database connection failed")
+        
+        with self.connection as connection:
+            cursor = connection.cursor()
+            cursor.row_factory = None
+            try:
+                yield cursor
+            finally:
+                cursor.close()
+
+def _dict_row_factory(cursor, row):
+    """Return SQLite rows as dicts, matching mysql.connector's dictionary cursor"""
+    return {column[0]: row[idx] for idx, column in enumerate(cursor.description)}
+
+def create_database_connection():
+    """
+    Create the storage backend selected by the environment
+    
+    DATABASE_URL=sqlite:///path/to/file.db (or DB_BACKEND=sqlite) selects the
+    embedded SQLite backend; anything else uses MySQL with the DB_* settings.
+    """
+    database_url = os.getenv('DATABASE_URL', '')
+    backend = os.getenv('DB_BACKEND', '').lower()
+    
+    if database_url.startswith('sqlite:///'):
+        return SQLiteConnection(database_url[len('sqlite:///'):] or None)
+    if backend == 'sqlite':
+        return SQLiteConnection()
+    return DatabaseConnection()
 
 # Global database connection instance
-db = DatabaseConnection()
+db = create_database_connection()
 
 def GetAllDB(table_name):
     """Fetch all records from specified table based on actual database schema"""
@@ -80,9 +367,7 @@ def GetAllDB(table_name):
     
     return results
 
-def get_kuliah_with_dosen_info():
-    """Get kuliah data joined with dosen information"""
-    query = """
+KULIAH_WITH_DOSEN_QUERY = """
     SELECT 
         k.kode_kuliah,
         k.kode_matakuliah, 
@@ -93,12 +378,280 @@ def get_kuliah_with_dosen_info():
         d.nidn
     FROM kuliah k
     LEFT JOIN dosen d ON k.kode_dosen = d.nidn
+    {where}
     ORDER BY k.kode_kuliah
     """
-    
-    results = db.execute_query(query)
+
+# Column order of the tuples yielded by iter_kuliah_with_dosen_info()
+KULIAH_WITH_DOSEN_COLUMNS = ('kode_kuliah', 'kode_matakuliah', 'nama_kelas', 'sks',
+                             'kode_prodi', 'nama_dosen', 'nidn')
+
+def get_kuliah_with_dosen_info():
+    """Get kuliah data joined with dosen information"""
+    results = db.execute_query(KULIAH_WITH_DOSEN_QUERY.format(where=''))
     return results if results else []
 
+def iter_kuliah_with_dosen_info(batch_size=1000, kode_prodi=None):
+    """
+    Stream kuliah joined with dosen as tuples (see KULIAH_WITH_DOSEN_COLUMNS)
+    
+    Rows are fetched batch_size at a time, so loading a whole-university
+    kuliah table never holds the full result set in memory at once.
+    kode_prodi (a code or list of codes) limits the rows to those prodi.
+    """
+    where, params = '', ()
+    if kode_prodi:
+        codes = [kode_prodi] if isinstance(kode_prodi, str) else list(kode_prodi)
+        where = f"WHERE k.kode_prodi IN ({','.join([db.placeholder] * len(codes))})"
+        params = tuple(codes)
+    
+    return db.iter_query(KULIAH_WITH_DOSEN_QUERY.format(where=where), params, batch_size=batch_size)
+
+PREFERENCES_QUERY = """
+    SELECT r.id, r.nidn, r.nama_dosen, r.hari,
+           r.created_at, r.updated_at,
+           s.kode_waktu, s.kind, w.waktu
+    FROM referensi_waktu_dosen r
+    LEFT JOIN preferensi_slot s ON s.referensi_id = r.id
+    LEFT JOIN waktu w ON w.kode_waktu = s.kode_waktu
+    ORDER BY r.nama_dosen, r.hari, r.id, s.kode_waktu
+    """
+
+MYSQL_PREFERENCE_SLOT_TABLE = """
+    CREATE TABLE IF NOT EXISTS preferensi_slot (
+        nidn VARCHAR(255) NOT NULL,
+        kode_waktu INT NOT NULL,
+        kind ENUM('suka', 'tidak_bisa') NOT NULL,
+        referensi_id INT NOT NULL,
+        PRIMARY KEY (nidn, kode_waktu, kind),
+        INDEX idx_slot_referensi (referensi_id),
+        INDEX idx_slot_waktu_kind (kode_waktu, kind),
+        FOREIGN KEY (referensi_id) REFERENCES referensi_waktu_dosen(id) ON DELETE CASCADE
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """
+
+# Set once preferensi_slot is known to exist on the MySQL server
+_preference_slot_table_ready = False
+
+def ensure_preference_slot_table():
+    """
+    Create preferensi_slot on MySQL if it does not exist yet
+    
+    database_schema.sql predates the table, so it is created on first use.
+    The SQLite schema already contains it. Errors are raised, not ignored.
+    """
+    global _preference_slot_table_ready
+    if db.backend == 'mysql' and not _preference_slot_table_ready:
+        db.execute_write(MYSQL_PREFERENCE_SLOT_TABLE)
+        _preference_slot_table_ready = True
+
+def load_compiled_preferences():
+    """
+    Load dosen preferences from the normalized preferensi_slot table
+    
+    One joined query returns every preference record with its slots and
+    waktu labels; the result is compiled into per-dosen bitmasks.
+    Raises ConnectionError when the preferences cannot be read.
+    """
+    ensure_preference_slot_table()
+    results = db.execute_query(PREFERENCES_QUERY)
+    if results is None:
+        raise ConnectionError("Failed to load dosen preferences")
+    return CompiledPreferences.from_rows(results)
+
+def upsert_preference(nidn, nama_dosen, hari, waktu_suka, waktu_tidak_bisa):
+    """
+    Insert a dosen preference, or replace the existing one for the same (nidn, hari)
+    
+    waktu_suka/waktu_tidak_bisa are validated with parse_waktu_ids (ValueError on
+    bad input). The legacy JSON columns are still written for older readers.
+    """
+    waktu_suka = parse_waktu_ids(waktu_suka)
+    waktu_tidak_bisa = parse_waktu_ids(waktu_tidak_bisa)
+    p = db.placeholder
+    ensure_preference_slot_table()
+    
+    with db.transaction() as cursor:
+        cursor.execute(db.upsert_preference_sql, (
+            nidn,
+            nama_dosen,
+            hari,
+            json.dumps(waktu_suka),
+            json.dumps(waktu_tidak_bisa)
+        ))
+        cursor.execute(f"SELECT id FROM referensi_waktu_dosen WHERE nidn = {p} AND hari = {p}", (nidn, hari))
+        pref_id = cursor.fetchone()[0]
+        
+        cursor.execute(f"DELETE FROM preferensi_slot WHERE referensi_id = {p}", (pref_id,))
+        slots = ([(nidn, waktu_id, KIND_SUKA, pref_id) for waktu_id in waktu_suka] +
+                 [(nidn, waktu_id, KIND_TIDAK_BISA, pref_id) for waktu_id in waktu_tidak_bisa])
+        if slots:
+            cursor.executemany(db.upsert_preference_slot_sql, slots)
+    
+    note_local_write()
+    return pref_id
+
+def delete_preference(pref_id):
+    """Delete a preference (and its slots) by id and return the number of deleted rows"""
+    p = db.placeholder
+    ensure_preference_slot_table()
+    
+    with db.transaction() as cursor:
+        cursor.execute(f"DELETE FROM preferensi_slot WHERE referensi_id = {p}", (pref_id,))
+        cursor.execute(f"DELETE FROM referensi_waktu_dosen WHERE id = {p}", (pref_id,))
+        deleted = cursor.rowcount
+    
+    note_local_write()
+    return deleted
+
+def migrate_preference_json():
+    """
+    Copy the legacy JSON columns of referensi_waktu_dosen into preferensi_slot
+    
+    Safe to run repeatedly. Values that cannot be parsed are reported in
+    'errors' and left out, never silently skipped.
+    
+    Returns:
+        Dictionary with migrated record/slot counts and per-record errors
+    """
+    ensure_preference_slot_table()
+    
+    rows = db.execute_query(
+        "SELECT id, nidn, waktu_suka, waktu_tidak_bisa FROM referensi_waktu_dosen ORDER BY id"
+    )
+    if rows is None:
+        raise ConnectionError("Failed to read referensi_waktu_dosen")
+    
+    slots = []
+    errors = []
+    for row in rows:
+        for column, kind in (('waktu_suka', KIND_SUKA), ('waktu_tidak_bisa', KIND_TIDAK_BISA)):
+            try:
+                waktu_ids = parse_waktu_ids(row[column])
+            except ValueError as e:
+                errors.append({'id': row['id'], 'nidn': row['nidn'], 'column': column, 'error': str(e)})
+                continue
+            slots.extend((row['nidn'], waktu_id, kind, row['id']) for waktu_id in waktu_ids)
+    
+    if slots:
+        db.execute_many(db.upsert_preference_slot_sql, slots)
+        note_local_write()
+    
+    return {
+        'records': len(rows),
+        'slots': len(slots),
+        'errors': errors
+    }
+
+# Tables whose changes bump data_version (see database_schema_sqlite.sql / install_data_version)
+VERSIONED_TABLES = ['dosen', 'kuliah', 'waktu', 'ruangan', 'referensi_waktu_dosen', 'preferensi_slot']
+
+def install_data_version():
+    """
+    Create the data_version table and its change triggers on MySQL
+    
+    The SQLite schema already contains them. Safe to run repeatedly:
+    triggers are dropped and recreated, since CREATE TRIGGER IF NOT EXISTS
+    needs MySQL 8.0.29+. preferensi_slot is created first; other versioned
+    tables that do not exist are skipped with a warning.
+    """
+    if db.backend != 'mysql':
+        return db.connect()
+    
+    existing = db.execute_query(
+        "SELECT table_name AS name FROM information_schema.tables WHERE table_schema = DATABASE()"
+    )
+    if existing is None:
+        raise ConnectionError("Failed to list database tables")
+    existing = {row['name'] for row in existing}
+    if 'referensi_waktu_dosen' in existing:
+        ensure_preference_slot_table()
+        existing.add('preferensi_slot')
+    
+    db.execute_write("""
+    CREATE TABLE IF NOT EXISTS data_version (
+        table_name VARCHAR(64) PRIMARY KEY,
+        version BIGINT NOT NULL DEFAULT 0,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """)
+    db.execute_many("INSERT IGNORE INTO data_version (table_name) VALUES (%s)",
+                    [(table,) for table in VERSIONED_TABLES])
+    
+    for table in VERSIONED_TABLES:
+        if table not in existing:
+            print(f"Warning: table {table} does not exist, its changes are not versioned")
+            continue
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            trigger = f"trg_{table}_{event.lower()}_version"
+            db.execute_write(f"DROP TRIGGER IF EXISTS {trigger}")
+            db.execute_write(f"""
+            CREATE TRIGGER {trigger}
+            AFTER {event} ON {table} FOR EACH ROW
+            UPDATE data_version SET version = version + 1 WHERE table_name = '{table}'
+            """)
+    
+    global _data_version_installed
+    _data_version_installed = True
+    return True
+
+# Whether the data_version table exists (None until checked), and the version
+# used without it: fixed per process, bumped by writes made through this process
+_data_version_installed = None
+_fallback_version = None
+
+def data_version_installed():
+    """Check once whether the data_version table exists (None if the check failed)"""
+    global _data_version_installed, _fallback_version
+    if _data_version_installed is None:
+        if db.backend == 'mysql':
+            query = ("SELECT COUNT(*) AS n FROM information_schema.tables "
+                     "WHERE table_schema = DATABASE() AND table_name = 'data_version'")
+        else:
+            query = "SELECT COUNT(*) AS n FROM sqlite_master WHERE type = 'table' AND name = 'data_version'"
+        results = db.execute_query(query)
+        if not results:
+            return None
+        _data_version_installed = bool(results[0]['n'])
+        if not _data_version_installed:
+            _fallback_version = int(time.time())
+            print("Warning: data_version table not found (run install_data_version.py); "
+                  "caches only see changes made through this process")
+    return _data_version_installed
+
+def note_local_write():
+    """Bump the fallback version after a write, so caches drop the old data"""
+    global _fallback_version
+    if _fallback_version is not None:
+        _fallback_version += 1
+
+def get_data_version():
+    """
+    Get a single number that changes whenever any reference table changes
+    
+    One indexed single-row query, cheap enough to validate caches and ETags
+    on every request. Without the data_version table (install_data_version
+    not run on MySQL) a per-process fallback version is returned quietly,
+    so caches still work and only see this process's own writes. Returns
+    None when the version cannot be read, in which case callers must not
+    trust cached data.
+    """
+    installed = data_version_installed()
+    if not installed:
+        return _fallback_version if installed is False else None
+        
+    results = db.execute_query("SELECT SUM(version) AS version FROM data_version")
+    if not results or results[0]['version'] is None:
+        return None
+    return int(results[0]['version'])
+
+def get_table_versions():
+    """Get the change counter of every versioned table"""
+    if not data_version_installed():
+        return {}
+    results = db.execute_query("SELECT table_name, version FROM data_version")
+    return {row['table_name']: int(row['version']) for row in results} if results else {}
+
 def create_50_minute_time_slots():
     """Create standardized 50-minute interval time slots"""
     from datetime import datetime, timedelta
@@ -147,16 +700,25 @@ def map_database_time_to_array():
     
     return time_mapping
 
-def get_schedule_data():
-    """Get all data needed for scheduling algorithm"""
-    return {
+def get_schedule_data(include_kuliah=True):
+    """
+    Get all data needed for scheduling algorithm
+    
+    Args:
+        include_kuliah: Set False when the caller streams kuliah itself
+                        via iter_kuliah_with_dosen_info()
+    """
+    data = {
         'dosen': GetAllDB('dosen'),
-        'kuliah': get_kuliah_with_dosen_info(),
         'ruangan': GetAllDB('ruangan'),
         'waktu': GetAllDB('waktu'),
         'waktu_50_minutes': create_50_minute_time_slots(),
-        'time_mapping': map_database_time_to_array()
+        'time_mapping': map_database_time_to_array(),
+        'preferences': load_compiled_preferences()
     }
+    if include_kuliah:
+        data['kuliah'] = get_kuliah_with_dosen_info()
+    return data
 
 def GenerateData(raw_data):
     """Convert raw database data to format expected by the scheduling algorithm"""
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+
+import json
+import threading
+from collections import deque
+from typing import Dict, List, Any, Optional, Tuple
+
+from flask import Response, request
+
+# Seconds between keep-alive comments on an idle stream
+SSE_KEEPALIVE_SECONDS = 15
+
+# Milliseconds the browser waits before reconnecting a dropped stream
+SSE_RETRY_MS = 2000
+
+def coalesce_events(events: List[tuple], progress_event: str = 'progress') -> List[tuple]:
+    """
+    Drop all but the newest progress_event from a backlog
+    
+    A client that reads slower than generations finish gets the latest
+    numbers instead of a growing queue; other events are kept.
+    """
+    last_progress = None
+    for event in events:
+        if event[1] == progress_event:
+            last_progress = event
+    return [event for event in events if event[1] != progress_event or event is last_progress]
+
+def format_sse(data, event=None, event_id=None) -> str:
+    """Encode one Server-Sent Events message"""
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    if event:
+        lines.append(f'event: {event}')
+    lines.append(f'data: {json.dumps(data)}')
+    return '\n'.join(lines) + '\n\n'
+
+def parse_last_event_id() -> Optional[int]:
+    """Resume point from the Last-Event-ID header (or ?last_event_id= for a first connect)"""
+    value = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+class EventHistory:
+    """
+    Numbered, bounded event history of one job
+    
+    Every subscriber keeps only a cursor into the shared history, so any
+    number of clients can follow a job without a queue each. Subclasses
+    keep their state in self.progress (guarded by self._changed) and name
+    their final statuses, their final event types and the event type that
+    may be coalesced.
+    """
+    
+    FINAL_STATUSES: Tuple[str, ...] = ()
+    FINAL_EVENTS: Tuple[str, ...] = ()
+    PROGRESS_EVENT = 'progress'
+    
+    def __init__(self, job_id: str, maxlen: int):
+        self.job_id = job_id
+        self.events = deque(maxlen=maxlen)
+        self.last_event_id = 0
+        self._changed = threading.Condition()
+        
+    @property
+    def status(self) -> str:
+        return self.progress['status']
+        
+    def _append_event(self, event_type: str, data: Dict[str, Any]) -> None:
+        """Number an event, add it to the history and wake subscribers (caller holds _changed)"""
+        self.last_event_id += 1
+        self.events.append((self.last_event_id, event_type, dict(data, job_id=self.job_id)))
+        self._changed.notify_all()
+        
+    def snapshot(self) -> Tuple[int, Dict[str, Any]]:
+        """
+        Current progress and the id of the last event it includes
+        
+        For a finished job the id stops short of the final event, so a
+        client catching up from a snapshot still receives it.
+        """
+        with self._changed:
+            cursor = self.last_event_id
+            if self.status in self.FINAL_STATUSES:
+                cursor -= 1
+            return cursor, dict(self.progress)
+            
+    def events_since(self, last_event_id: int, timeout: float = None) -> Optional[List[tuple]]:
+        """
+        Events after last_event_id, waiting up to timeout for the first one
+        
+        Returns None when events after last_event_id have already been dropped
+        from the history (the caller should resend a snapshot), and an empty
+        list on timeout or when the job is finished and nothing is left.
+        """
+        with self._changed:
+            if self.last_event_id <= last_event_id and self.status not in self.FINAL_STATUSES:
+                self._changed.wait(timeout)
+            if not self.events or self.last_event_id <= last_event_id:
+                return []
+            if self.events[0][0] > last_event_id + 1:
+                return None
+            return [event for event in self.events if event[0] > last_event_id]
+
+def stream_job_events(job: EventHistory, last_event_id: int = None,
+                      keepalive: float = SSE_KEEPALIVE_SECONDS) -> Response:
+    """
+    text/event-stream response following one job's events
+    
+    A new client (or one whose Last-Event-ID fell out of the history) first
+    gets a 'snapshot' of the current progress. After that it gets every
+    event, except that a backlog of progress events collapses to the newest,
+    so a slow reader skips generations instead of falling behind. The stream
+    ends with the job's final event, which is sent again to a client that
+    reconnects after the job finished.
+    """
+    def generate():
+        cursor = last_event_id
+        yield f'retry: {SSE_RETRY_MS}\n\n'
+        
+        while True:
+            events = job.events_since(cursor, keepalive) if cursor is not None else None
+            
+            if events is None:
+                cursor, progress = job.snapshot()
+                yield format_sse(dict(progress, type='snapshot', job_id=job.job_id), 'snapshot', cursor)
+                continue
+                
+            if not events:
+                if job.status in job.FINAL_STATUSES:
+                    # Nothing new for a finished job: resend its final event so the client stops
+                    cursor = job.snapshot()[0]
+                    continue
+                yield ': keep-alive\n\n'
+                continue
+                
+            for event_id, event_type, data in coalesce_events(events, job.PROGRESS_EVENT):
+                yield format_sse(data, event_type, event_id)
+                if event_type in job.FINAL_EVENTS:
+                    return
+            cursor = events[-1][0]
+            
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'  # let nginx pass events through immediately
+    })
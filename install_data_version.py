@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+
+from dbConfig import db, install_data_version, get_table_versions
+
+def install():
+    """Install the data_version table and change-tracking triggers"""
+    print(f"Installing data_version change tracking ({db.backend})...")
+    
+    try:
+        install_data_version()
+    except Exception as e:
+        print(f"✗ Failed to install data_version: {e}")
+        return False
+    
+    print("✓ data_version installed. Current table versions:")
+    for table, version in get_table_versions().items():
+        print(f"   - {table}: {version}")
+    return True
+
+if __name__ == "__main__":
+    install()
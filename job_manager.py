@@ -0,0 +1,503 @@
+#!/usr/bin/env python3
+
+import itertools
+import multiprocessing
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Any, Callable, Optional
+
+from scheduler_wrapper import UniversityScheduler, CancellationToken
+from progress_reporter import ProgressReporter, REPORT_INTERVAL, REPORT_EVERY_GENERATIONS
+from schedule_index import ScheduleIndex
+from read_cache import encode_json
+from result_cache import ResultCache
+from runtime_model import RunHistory
+from result_store import ScheduleResultStore, SchedulingLogWriter
+from event_stream import EventHistory
+
+# Job states; queued/generating are active, the rest are final
+ACTIVE_STATUSES = ('queued', 'generating')
+FINAL_STATUSES = ('completed', 'error', 'cancelled')
+
+# Worker processes are spawned, not forked: a forked child would inherit the
+# parent's open database connections and lock state
+PROCESS_CONTEXT = multiprocessing.get_context('spawn')
+
+# Seconds a worker process gets to stop cooperatively before it is killed
+CANCEL_GRACE_SECONDS = 10.0
+
+# Progress events kept per job for Last-Event-ID resume
+EVENT_HISTORY = 500
+
+# Finished jobs kept in memory (results are also persisted in schedule_results)
+MAX_FINISHED_JOBS = 50
+
+# Status texts of a JobManager's jobs (other runners pass their own)
+GENERATION_MESSAGES = {
+    'cached': 'Schedule loaded from result cache',
+    'cancelled': 'Schedule generation cancelled',
+    'cancelled_partial': 'Schedule generation cancelled (best schedule so far kept)',
+    'completed': 'Schedule generation completed successfully!',
+    'failed': 'Schedule generation failed'
+}
+
+def default_worker_count() -> int:
+    """Number of generation workers: the CPU cores this process may run on"""
+    if hasattr(os, 'sched_getaffinity'):
+        return max(1, len(os.sched_getaffinity(0)))
+    return max(1, os.cpu_count() or 1)
+
+def apply_generation_params(scheduler: UniversityScheduler, params: Dict[str, Any]) -> None:
+    """Copy request parameters onto a scheduler, clamped to the supported ranges"""
+    if 'population_size' in params:
+        scheduler.population_size = max(4, min(20, params['population_size']))
+    if 'max_generations' in params:
+        scheduler.max_generations = max(10, min(500, params['max_generations']))
+    if 'crossover_rate' in params:
+        scheduler.crossover_rate = max(0.1, min(1.0, params['crossover_rate']))
+    if 'mutation_rate' in params:
+        scheduler.mutation_rate = max(0.01, min(0.5, params['mutation_rate']))
+
+class GenerationJob(EventHistory):
+    """One schedule generation request and its progress/result"""
+    
+    FINAL_STATUSES = FINAL_STATUSES
+    FINAL_EVENTS = ('done',)
+    
+    def __init__(self, params: Dict[str, Any], priority: int = 0):
+        # Numbered progress events: (event_id, event_type, progress snapshot)
+        super().__init__(uuid.uuid4().hex[:12], EVENT_HISTORY)
+        self.params = params
+        self.priority = priority
+        self.kode_prodi = params.get('kode_prodi')
+        self.session_name = params.get('session_name') or ScheduleResultStore.new_session_name()
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.result = None
+        self.schedule_index = None  # built once from result['schedule']
+        self.result_payload = None  # result serialized (and compressed) once
+        self.cache_key = None  # ResultCache key when the result may be cached
+        self.data_version = None
+        self.cached = False
+        self.process = None  # worker process while running out of process
+        self.cancel_token = CancellationToken()
+        self.cancel_requested_at = None
+        
+        # Same shape as the old global schedule_progress
+        self.progress = {
+            'status': 'queued',
+            'progress': 0,
+            'message': 'Waiting for a free worker...'
+        }
+        
+    def update_progress(self, **fields) -> None:
+        """Merge fields into the progress snapshot and publish it as an event"""
+        with self._changed:
+            self.progress.update(fields)
+            if self.progress['status'] in FINAL_STATUSES:
+                event_type = 'done'
+            elif 'generation' in fields:
+                event_type = 'progress'
+            else:
+                event_type = 'status'
+            self._append_event(event_type, self.progress)
+            
+    def set_result(self, result: Dict[str, Any]) -> None:
+        """
+        Attach a finished result together with its schedule index (when it
+        has a schedule) and its pre-serialized, precompressed response payload
+        """
+        if 'schedule' in result:
+            self.schedule_index = ScheduleIndex(result['schedule'])
+        self.result_payload = encode_json(result, etag=f"job-{self.job_id}")
+        self.result = result
+        
+    def summary(self) -> Dict[str, Any]:
+        """Job metadata without the (possibly large) result"""
+        return {
+            'job_id': self.job_id,
+            'session_name': self.session_name,
+            'kode_prodi': self.kode_prodi,
+            'priority': self.priority,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'has_result': self.result is not None,
+            'cached': self.cached,
+            **self.progress
+        }
+
+def execute_generation(params: Dict[str, Any], job_id: str, session_name: str,
+                       report: Callable[..., None],
+                       cancel_token: CancellationToken = None) -> Optional[Dict[str, Any]]:
+    """
+    Run the genetic algorithm and persist the final schedule under session_name
+    
+    report(**fields) receives progress fields in the shape of job.progress;
+    it is the only way this function talks back, so it can run in a thread
+    or in a worker process. A run stopped through cancel_token returns its
+    best-so-far schedule with result['cancelled'] set; it is not persisted.
+    """
+    report(status='generating', progress=0, message='Initializing genetic algorithm...')
+    
+    scheduler = UniversityScheduler(kode_prodi=params.get('kode_prodi'), seed=params.get('seed'))
+    apply_generation_params(scheduler, params)
+    
+    log_writer = SchedulingLogWriter(session_name)
+    
+    def progress_callback(progress_data):
+        """Forward progress during generation"""
+        log_writer.log_generation(progress_data)
+        report(
+            status='generating',
+            progress=progress_data['progress'],
+            generation=progress_data['generation'],
+            max_generations=progress_data['max_generations'],
+            best_fitness=progress_data['best_fitness'],
+            avg_fitness=progress_data['avg_fitness'],
+            total_conflicts=progress_data['total_conflicts'],
+            conflicts=progress_data['conflicts'],
+            timings=progress_data['timings'],
+            elapsed_time=progress_data['elapsed_time'],
+            message=(
+                'Cancelling...' if cancel_token and cancel_token.is_cancelled()
+                else f"Generation {progress_data['generation']}/{progress_data['max_generations']}"
+            )
+        )
+        
+    # Progress (and its scheduling_logs row) is throttled; the per-generation
+    # curve is kept in the reporter's fixed-size stats buffer instead
+    reporter = ProgressReporter(
+        progress_callback,
+        min_interval=max(0.0, min(10.0, float(params.get('progress_interval', REPORT_INTERVAL)))),
+        every_generations=max(1, min(1000, int(params.get('progress_every', REPORT_EVERY_GENERATIONS))))
+    )
+    
+    log_writer.start()
+    try:
+        result = scheduler.generate_schedule(progress_callback, cancel_token, reporter)
+    finally:
+        log_writer.close()
+        
+    if not result['success']:
+        return None
+        
+    result['job_id'] = job_id
+    result['session_name'] = session_name
+    if result.get('cancelled'):
+        result['persisted'] = False
+        return result
+        
+    try:
+        log_writer.store.save_result(session_name, result)
+        result['persisted'] = True
+    except Exception as e:
+        print(f"Error saving schedule {session_name}: {e}")
+        result['persisted'] = False
+        
+    return result
+
+def run_generation_job(job: GenerationJob) -> Optional[Dict[str, Any]]:
+    """Run a job in the calling thread (holds the GIL for the whole run)"""
+    return execute_generation(job.params, job.job_id, job.session_name, job.update_progress,
+                              job.cancel_token)
+
+def _generation_process_main(params: Dict[str, Any], job_id: str, session_name: str,
+                             conn, cancel_event) -> None:
+    """Entry point of a generation worker process; talks to the parent over conn"""
+    def report(**fields):
+        conn.send(('progress', fields))
+        
+    try:
+        result = execute_generation(params, job_id, session_name, report,
+                                    CancellationToken(cancel_event))
+        conn.send(('result', result))
+    except Exception as e:
+        conn.send(('error', str(e)))
+    finally:
+        conn.close()
+
+def terminate_process(process) -> None:
+    """Hard-stop a worker process (SIGTERM, then SIGKILL if it lingers)"""
+    if not process.is_alive():
+        return
+    process.terminate()
+    process.join(2.0)
+    if process.is_alive():
+        process.kill()
+
+def run_generation_process(job: GenerationJob) -> Optional[Dict[str, Any]]:
+    """
+    Run a job in a separate process
+    
+    The GA loop is pure Python and would hold the GIL of the web process for
+    the whole run; in a child process it only competes for a CPU core. The
+    child sends progress fields and finally the result over a pipe, and the
+    calling worker thread applies them to the job. The child is started with
+    'spawn' so it opens its own database connections instead of sharing the
+    parent's sockets.
+    
+    Cancellation is shared with the child through a multiprocessing Event.
+    If the child has not stopped CANCEL_GRACE_SECONDS after cancel() it is
+    terminated and the job ends without a result.
+    """
+    cancel_event = PROCESS_CONTEXT.Event()
+    previous_token, job.cancel_token = job.cancel_token, CancellationToken(cancel_event)
+    if previous_token.is_cancelled():
+        cancel_event.set()
+        
+    parent_conn, child_conn = PROCESS_CONTEXT.Pipe(duplex=False)
+    process = PROCESS_CONTEXT.Process(
+        target=_generation_process_main,
+        args=(job.params, job.job_id, job.session_name, child_conn, cancel_event),
+        name=f"generation-{job.job_id}",
+        daemon=True
+    )
+    process.start()
+    child_conn.close()  # so recv() raises EOFError if the child dies
+    job.process = process
+    
+    try:
+        while True:
+            if not parent_conn.poll(0.5):
+                if job.cancel_requested_at and time.time() - job.cancel_requested_at > CANCEL_GRACE_SECONDS:
+                    terminate_process(process)
+                    return None
+                continue
+            try:
+                kind, payload = parent_conn.recv()
+            except EOFError:
+                if job.cancel_token.is_cancelled():
+                    return None  # killed by cancel(force=True)
+                raise RuntimeError(f"Generation process exited unexpectedly (exit code {process.exitcode})")
+            if kind == 'progress':
+                job.update_progress(**payload)
+            elif kind == 'result':
+                return payload
+            else:
+                raise RuntimeError(payload)
+    finally:
+        parent_conn.close()
+        process.join()
+        job.process = None
+
+class JobManager:
+    """
+    Queue of generation jobs served by a bounded pool of worker threads
+    
+    Jobs wait in a priority queue (lower number first, FIFO within a
+    priority) until one of max_workers workers is free. Progress and
+    results are kept per job, so several faculties can generate at once
+    without overwriting each other. By default each worker thread only
+    supervises a generation process (run_generation_process); pass
+    runner=run_generation_job to run in-thread instead.
+    """
+    
+    def __init__(self, runner: Callable[[GenerationJob], Optional[Dict[str, Any]]] = run_generation_process,
+                 max_workers: int = None, max_finished_jobs: int = MAX_FINISHED_JOBS,
+                 result_cache: ResultCache = None, run_history: RunHistory = None,
+                 messages: Dict[str, str] = GENERATION_MESSAGES):
+        self.runner = runner
+        self.messages = messages
+        self.result_cache = result_cache
+        self.run_history = run_history  # measured runs for ParameterOptimizer's runtime model
+        self._inflight: Dict[str, str] = {}  # cache key -> id of the active job computing it
+        self.max_workers = max_workers or default_worker_count()
+        self.max_finished_jobs = max_finished_jobs
+        self.jobs: 'OrderedDict[str, GenerationJob]' = OrderedDict()
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._workers = []
+        
+    def _ensure_workers(self) -> None:
+        """Start the worker threads on first use"""
+        if self._workers:
+            return
+        for index in range(self.max_workers):
+            worker = threading.Thread(target=self._worker_loop, name=f"generation-worker-{index}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+            
+    def submit(self, params: Dict[str, Any], priority: int = 0) -> GenerationJob:
+        """
+        Queue a new generation job
+        
+        With a result cache, a request identical to an active job (same data
+        version, parameters and seed) joins that job, and one that was
+        computed before completes at once from the cache; pass
+        use_cache=False in params to always run the GA.
+        """
+        cache_key = data_version = None
+        if self.result_cache is not None and params.get('use_cache', True):
+            data_version = self.result_cache.version_func()
+            cache_key = self.result_cache.key_for(params, data_version)
+            
+        if cache_key:
+            with self._lock:
+                running = self.jobs.get(self._inflight.get(cache_key))
+            if running is not None and running.status in ACTIVE_STATUSES \
+                    and not running.cancel_token.is_cancelled():
+                return running
+                
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                return self._complete_from_cache(params, priority, cached)
+                
+        job = GenerationJob(params, priority)
+        job.cache_key = cache_key
+        job.data_version = data_version
+        with self._lock:
+            self._ensure_workers()
+            self.jobs[job.job_id] = job
+            if cache_key:
+                self._inflight[cache_key] = job.job_id
+            self._prune()
+        self._queue.put((priority, next(self._sequence), job.job_id))
+        return job
+        
+    def _complete_from_cache(self, params: Dict[str, Any], priority: int,
+                             cached: Dict[str, Any]) -> GenerationJob:
+        """Register a job that is already completed with a cached result"""
+        job = GenerationJob(dict(params, session_name=cached.get('session_name')), priority)
+        job.set_result(dict(cached, job_id=job.job_id, cached=True))
+        job.cached = True
+        job.started_at = job.finished_at = time.time()
+        
+        metadata = job.result.get('metadata', {})
+        job.update_progress(
+            status='completed',
+            progress=100,
+            generation=metadata.get('generations'),
+            max_generations=metadata.get('algorithm_params', {}).get('max_generations'),
+            best_fitness=metadata.get('best_fitness'),
+            message=self.messages['cached']
+        )
+        
+        with self._lock:
+            self.jobs[job.job_id] = job
+            self._prune()
+        return job
+        
+    def _store_in_cache(self, job: GenerationJob) -> None:
+        """Cache a completed job's result unless the data changed while it ran"""
+        try:
+            if self.result_cache.version_func() == job.data_version:
+                self.result_cache.put(job.cache_key, job.result)
+        except Exception as e:
+            print(f"Error caching result of job {job.job_id}: {e}")
+            
+    def _record_run(self, job: GenerationJob) -> None:
+        """Add a finished run's data sizes, parameters and timings to the run history"""
+        if self.run_history is None:
+            return
+        try:
+            self.run_history.record(job.result)
+        except Exception as e:
+            print(f"Error recording run of job {job.job_id}: {e}")
+            
+    def get(self, job_id: str) -> Optional[GenerationJob]:
+        """Look up a job by id"""
+        return self.jobs.get(job_id)
+        
+    def list_jobs(self, status: str = None) -> List[Dict[str, Any]]:
+        """Summaries of all known jobs, newest first"""
+        with self._lock:
+            jobs = list(self.jobs.values())
+        return [job.summary() for job in reversed(jobs) if status is None or job.status == status]
+        
+    def latest(self, statuses=None) -> Optional[GenerationJob]:
+        """Most recently submitted job, optionally limited to some statuses"""
+        with self._lock:
+            jobs = list(self.jobs.values())
+        for job in reversed(jobs):
+            if statuses is None or job.status in statuses:
+                return job
+        return None
+        
+    def running_count(self) -> int:
+        """Jobs generating right now (each keeps a core busy)"""
+        with self._lock:
+            return sum(1 for job in self.jobs.values() if job.status == 'generating')
+            
+    def queue_position(self, job: GenerationJob) -> int:
+        """How many queued jobs run before this one (0 when not queued)"""
+        if job.status != 'queued':
+            return 0
+        key = (job.priority, job.created_at)
+        with self._lock:
+            return sum(1 for other in self.jobs.values()
+                       if other.status == 'queued' and (other.priority, other.created_at) < key)
+                       
+    def cancel(self, job_id: str, force: bool = False) -> bool:
+        """
+        Cancel a queued or running job; returns False if it already finished
+        
+        A queued job is dropped at once. A running job is asked to stop at its
+        next check and finishes as 'cancelled' with its best-so-far schedule;
+        force=True kills its worker process instead (no result).
+        """
+        job = self.get(job_id)
+        # Under the lock a worker cannot start the job between the check and the cancel
+        with self._lock:
+            if not job or job.status not in ACTIVE_STATUSES:
+                return False
+                
+            job.cancel_token.cancel()
+            if job.status == 'queued':
+                job.update_progress(status='cancelled', progress=0, message=self.messages['cancelled'])
+                job.finished_at = time.time()
+                return True
+                
+        job.cancel_requested_at = job.cancel_requested_at or time.time()
+        job.update_progress(cancel_requested=True, message='Cancelling...')
+        if force and job.process is not None:
+            terminate_process(job.process)
+        return True
+        
+    def _worker_loop(self) -> None:
+        """Take jobs off the queue and run them until the process exits"""
+        while True:
+            _, _, job_id = self._queue.get()
+            job = self.get(job_id)
+            # Mark the job started under the lock, so cancel() no longer treats it as queued
+            with self._lock:
+                if job is None or job.status != 'queued':
+                    continue  # cancelled while waiting, or pruned
+                job.started_at = time.time()
+                job.update_progress(status='generating', message='Starting...')
+                
+            try:
+                result = self.runner(job)
+                if result is not None:
+                    job.set_result(result)
+                    self._record_run(job)
+                    
+                if job.cancel_token.is_cancelled():
+                    job.update_progress(status='cancelled',
+                                        message=self.messages['cancelled_partial' if result else 'cancelled'])
+                elif result is not None:
+                    job.update_progress(status='completed', progress=100, message=self.messages['completed'])
+                    if job.cache_key:
+                        self._store_in_cache(job)
+                else:
+                    job.update_progress(status='error', progress=0, message=self.messages['failed'])
+            except Exception as e:
+                job.update_progress(status='error', progress=0, message=f'Error: {str(e)}')
+            finally:
+                job.finished_at = job.finished_at or time.time()
+                if job.cache_key:
+                    with self._lock:
+                        if self._inflight.get(job.cache_key) == job.job_id:
+                            del self._inflight[job.cache_key]
+                            
+    def _prune(self) -> None:
+        """Forget the oldest finished jobs beyond max_finished_jobs (caller holds the lock)"""
+        finished = [job_id for job_id, job in self.jobs.items() if job.status in FINAL_STATUSES]
+        for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self.jobs[job_id]
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+
+from dbConfig import db, migrate_preference_json
+
+def migrate_preferences():
+    """Move referensi_waktu_dosen JSON preferences into the preferensi_slot table"""
+    print(f"Migrating dosen preferences to preferensi_slot ({db.backend})...")
+    
+    try:
+        summary = migrate_preference_json()
+    except Exception as e:
+        print(f"✗ Migration failed: {e}")
+        return False
+    
+    print(f"✓ {summary['slots']} slots migrated from {summary['records']} preference records")
+    
+    if summary['errors']:
+        print(f"✗ {len(summary['errors'])} values could not be parsed and were NOT migrated:")
+        for error in summary['errors']:
+            print(f"   - id={error['id']} nidn={error['nidn']} {error['column']}: {error['error']}")
+        return False
+    
+    return True
+
+if __name__ == "__main__":
+    migrate_preferences()
@@ -1,7 +1,27 @@
 #!/usr/bin/env python3
 
 import math
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Optional
+
+from runtime_model import RuntimeModel
+
+# Dosen listed individually in a feasibility report (the tightest first)
+FEASIBILITY_DOSEN_LIMIT = 20
+
+# Slot utilization above which a feasible input is still reported as tight
+TIGHT_UTILIZATION = 0.9
+
+class InfeasibleScheduleError(ValueError):
+    """The input cannot have a conflict-free schedule; report holds the details"""
+    
+    def __init__(self, report: Dict[str, Any]):
+        super().__init__('; '.join(issue['message'] for issue in report['issues']))
+        self.report = report
+
+# Parameter ranges searched when fitting a time budget
+BUDGET_POPULATION_SIZES = range(4, 21, 2)
+BUDGET_MIN_GENERATIONS = 10
+BUDGET_MAX_GENERATIONS = 500
 
 class ParameterOptimizer:
     """
@@ -9,14 +29,18 @@ class ParameterOptimizer:
     based on data characteristics and problem complexity
     """
     
-    def __init__(self, data: Dict[str, List]):
+    def __init__(self, data: Dict[str, List], runtime_model: RuntimeModel = None):
         """
         Initialize with schedule data
         
         Args:
             data: Dictionary containing kuliah, dosen, waktu, ruangan, preferences
+            runtime_model: Optional model learned from recorded runs
+                           (RunHistory.model()); time estimates fall back to
+                           a heuristic while it has too few runs
         """
         self.data = data
+        self.runtime_model = runtime_model
         self.kuliah = data.get('kuliah', [])
         self.dosen = data.get('dosen', [])
         self.waktu = data.get('waktu', [])
@@ -36,8 +60,8 @@ class ParameterOptimizer:
         n_ruangan = len(self.ruangan)
         n_preferences = len(self.preferences)
         
-        # Calculate search space size (rough estimate)
-        search_space_size = (n_waktu * n_ruangan) ** n_kuliah
+        # Search space size in log10: (W×R)^n_kuliah itself has thousands of digits
+        search_space_log10 = n_kuliah * math.log10(max(n_waktu * n_ruangan, 1))
         
         # Calculate constraint density
         total_possible_assignments = n_kuliah * n_waktu * n_ruangan
@@ -62,7 +86,7 @@ class ParameterOptimizer:
         
         # Complexity score (0-1, where 1 is most complex)
         complexity_factors = [
-            min(math.log10(max(search_space_size, 1)) / 20, 1.0),  # Search space complexity
+            min(search_space_log10 / 20, 1.0),  # Search space complexity
             min(constraint_density * 10, 1.0),  # Constraint complexity
             min(load_variance / 10, 1.0),  # Load distribution complexity
             min(time_utilization / 2, 1.0),  # Time pressure
@@ -77,7 +101,7 @@ class ParameterOptimizer:
             'n_waktu': n_waktu,
             'n_ruangan': n_ruangan,
             'n_preferences': n_preferences,
-            'search_space_size': search_space_size,
+            'search_space_log10': round(search_space_log10, 2),
             'constraint_density': constraint_density,
             'avg_dosen_load': avg_dosen_load,
             'max_dosen_load': max_dosen_load,
@@ -85,7 +109,112 @@ class ParameterOptimizer:
             'time_utilization': time_utilization,
             'room_utilization': room_utilization,
             'overall_complexity': overall_complexity,
-            'complexity_level': self._get_complexity_level(overall_complexity)
+            'complexity_level': self._get_complexity_level(overall_complexity),
+            'feasibility': self.check_feasibility()
+        }
+        
+    def check_feasibility(self) -> Dict[str, Any]:
+        """
+        Capacity bounds that any conflict-free schedule must satisfy
+        
+        Each kuliah takes one (waktu, ruangan) slot, so:
+        - the kuliah must fit in W×R slots;
+        - a dosen needs one distinct waktu per kuliah, among the waktu
+          they have not blocked ('tidak_bisa');
+        - kuliah sharing a dosen are pairwise in conflict. With one dosen
+          per kuliah that conflict graph is a union of per-dosen cliques, so
+          its maximum clique is the largest dosen load, and it needs that
+          many distinct waktu.
+        Total SKS against W×R is reported as a warning only: the GA places
+        a kuliah in one slot whatever its SKS.
+        
+        Linear in the number of kuliah; no GA run needed.
+        """
+        n_waktu = len(self.waktu)
+        n_ruangan = len(self.ruangan)
+        n_slots = n_waktu * n_ruangan
+        n_kuliah = len(self.kuliah)
+        issues = []
+        warnings = []
+        
+        dosen_loads: Dict[str, int] = {}
+        total_sks = 0
+        for kuliah in self.kuliah:
+            dosen = kuliah.get('nama_dosen', 'Unknown')
+            dosen_loads[dosen] = dosen_loads.get(dosen, 0) + 1
+            total_sks += int(kuliah.get('sks') or 0)
+            
+        if n_slots == 0:
+            issues.append({'type': 'no_slots', 'message': 'No waktu or ruangan to schedule into'})
+        elif n_kuliah > n_slots:
+            issues.append({
+                'type': 'slot_capacity',
+                'message': f'{n_kuliah} kuliah need more than the {n_slots} waktu×ruangan slots',
+                'required': n_kuliah,
+                'available': n_slots
+            })
+            
+        clique_dosen, max_clique = max(dosen_loads.items(), key=lambda item: item[1], default=(None, 0))
+        if n_waktu and max_clique > n_waktu:
+            issues.append({
+                'type': 'dosen_clique',
+                'message': f'{clique_dosen} teaches {max_clique} kuliah but there are only {n_waktu} waktu',
+                'dosen': clique_dosen,
+                'required': max_clique,
+                'available': n_waktu
+            })
+            
+        # Waktu each dosen can still teach: all waktu minus their blocked ones
+        all_waktu = 0
+        for waktu in self.waktu:
+            all_waktu |= 1 << int(waktu['kode_waktu'])
+        blocked_masks = getattr(self.preferences, 'tidak_bisa_by_dosen', {})
+        
+        dosen_capacity = []
+        for dosen, required in dosen_loads.items():
+            available = n_waktu - bin(blocked_masks.get(dosen, 0) & all_waktu).count('1')
+            dosen_capacity.append({'dosen': dosen, 'required': required, 'available': available})
+        dosen_capacity.sort(key=lambda d: d['available'] - d['required'])
+        
+        over_capacity = [d for d in dosen_capacity if d['required'] > d['available']]
+        for d in over_capacity[:FEASIBILITY_DOSEN_LIMIT]:
+            if d['dosen'] == clique_dosen and d['available'] == n_waktu:
+                continue  # already reported as the clique bound
+            issues.append({
+                'type': 'dosen_availability',
+                'message': f"{d['dosen']} needs {d['required']} waktu but only {d['available']} are not blocked",
+                **d
+            })
+            
+        slot_utilization = n_kuliah / n_slots if n_slots else None
+        sks_utilization = total_sks / n_slots if n_slots else None
+        if sks_utilization is not None and sks_utilization > 1:
+            warnings.append({
+                'type': 'sks_capacity',
+                'message': f'{total_sks} SKS exceed the {n_slots} waktu×ruangan slots'
+            })
+        if slot_utilization is not None and TIGHT_UTILIZATION < slot_utilization <= 1:
+            warnings.append({
+                'type': 'tight_slots',
+                'message': f'{slot_utilization:.0%} of all waktu×ruangan slots are needed'
+            })
+            
+        return {
+            'feasible': not issues,
+            'issues': issues,
+            'warnings': warnings,
+            'bounds': {
+                'kuliah': n_kuliah,
+                'slots': n_slots,
+                'slot_utilization': round(slot_utilization, 3) if slot_utilization is not None else None,
+                'total_sks': total_sks,
+                'sks_slot_utilization': round(sks_utilization, 3) if sks_utilization is not None else None,
+                'max_clique': max_clique,
+                'max_clique_dosen': clique_dosen,
+                'waktu': n_waktu,
+                'dosen_over_capacity': len(over_capacity)
+            },
+            'tightest_dosen': dosen_capacity[:FEASIBILITY_DOSEN_LIMIT]
         }
     
     def _get_complexity_level(self, complexity: float) -> str:
@@ -175,13 +304,89 @@ class ParameterOptimizer:
         }
     
     def _estimate_execution_time(self, pop_size: int, max_gen: int, n_kuliah: int) -> float:
-        """Estimate execution time in seconds"""
-        # Base time per generation per chromosome (empirical)
+        """Estimate execution time in seconds (upper bound: all max_gen generations run)"""
+        return round(self._seconds_per_generation(pop_size, n_kuliah) * max_gen, 1)
+        
+    def _seconds_per_generation(self, pop_size: int, n_kuliah: int) -> float:
+        """Time of one generation, from the runtime model when it is trained"""
+        if self.runtime_model is not None:
+            n_slots = len(self.waktu) * len(self.ruangan)
+            seconds = self.runtime_model.seconds_per_generation(pop_size, n_kuliah, n_slots)
+            if seconds is not None:
+                return seconds
+                
+        # Base time per generation per chromosome (heuristic)
         base_time_per_gen = 0.01  # seconds
         kuliah_factor = math.log10(max(n_kuliah, 1)) / 3  # Scale with problem size
+        return pop_size * base_time_per_gen * (1 + kuliah_factor)
+        
+    def _estimate_conflict_free_generation(self, pop_size: int, mutation_rate: float) -> Optional[float]:
+        """Expected generation of the first conflict-free schedule, if the model knows"""
+        if self.runtime_model is None:
+            return None
+        n_slots = len(self.waktu) * len(self.ruangan)
+        return self.runtime_model.conflict_free_generation(pop_size, len(self.kuliah), n_slots, mutation_rate)
+        
+    def _estimate_source(self) -> str:
+        if self.runtime_model is not None and self.runtime_model.time_fit is not None:
+            return 'model'
+        return 'heuristic'
         
-        estimated_time = pop_size * max_gen * base_time_per_gen * (1 + kuliah_factor)
-        return round(estimated_time, 1)
+    def recommend_for_budget(self, time_budget: float) -> Dict[str, Any]:
+        """
+        Recommend parameters whose run fits a time budget (seconds)
+        
+        Every population size gets as many generations as the budget allows.
+        With a convergence model the candidate with the most generations to
+        spare beyond the expected first conflict-free generation wins;
+        otherwise the largest population that still gets the balanced
+        generation count (or, failing that, the most generations).
+        """
+        optimal = self.calculate_optimal_parameters()
+        base_params = optimal['parameters']
+        n_kuliah = len(self.kuliah)
+        
+        candidates = []
+        for pop_size in BUDGET_POPULATION_SIZES:
+            seconds = self._seconds_per_generation(pop_size, n_kuliah)
+            generations = min(BUDGET_MAX_GENERATIONS, int(time_budget / seconds))
+            if generations < BUDGET_MIN_GENERATIONS:
+                continue
+            needed = self._estimate_conflict_free_generation(pop_size, base_params['mutation_rate'])
+            candidates.append({
+                'population_size': pop_size,
+                'max_generations': generations,
+                'estimated_time': round(seconds * generations, 1),
+                'expected_conflict_free_generation': round(needed) if needed is not None else None
+            })
+            
+        if not candidates:
+            pop_size = min(BUDGET_POPULATION_SIZES)
+            seconds = self._seconds_per_generation(pop_size, n_kuliah)
+            return {
+                'time_budget': time_budget,
+                'fits_budget': False,
+                'parameters': dict(base_params, population_size=pop_size, max_generations=BUDGET_MIN_GENERATIONS),
+                'estimated_time': round(seconds * BUDGET_MIN_GENERATIONS, 1),
+                'estimate_source': self._estimate_source(),
+                'expected_conflict_free_generation': None
+            }
+            
+        if all(c['expected_conflict_free_generation'] for c in candidates):
+            best = max(candidates, key=lambda c: c['max_generations'] / c['expected_conflict_free_generation'])
+        else:
+            enough = [c for c in candidates if c['max_generations'] >= base_params['max_generations']]
+            best = enough[-1] if enough else max(candidates, key=lambda c: c['max_generations'])
+            
+        return {
+            'time_budget': time_budget,
+            'fits_budget': True,
+            'parameters': dict(base_params, population_size=best['population_size'],
+                               max_generations=best['max_generations']),
+            'estimated_time': best['estimated_time'],
+            'estimate_source': self._estimate_source(),
+            'expected_conflict_free_generation': best['expected_conflict_free_generation']
+        }
     
     def _estimate_convergence_probability(self, pop_size: int, max_gen: int, complexity: float) -> float:
         """Estimate probability of finding good solution"""
@@ -288,5 +493,7 @@ class ParameterOptimizer:
                 }
             },
             'optimal_choice': 'balanced',  # Default recommendation
-            'explanations': optimal['recommendations']['explanation']
+            'explanations': optimal['recommendations']['explanation'],
+            'estimate_source': self._estimate_source(),
+            'runtime_model': self.runtime_model.summary() if self.runtime_model is not None else None
         }
\ No newline at end of file
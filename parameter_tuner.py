@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Dict, List, Any, Optional
+
+from dbConfig import get_schedule_data
+from job_manager import GenerationJob, JobManager, PROCESS_CONTEXT, apply_generation_params, default_worker_count
+from parameter_optimizer import ParameterOptimizer
+from result_cache import RESULT_CACHE_DIR
+from scheduler_wrapper import UniversityScheduler, CancellationToken
+
+# Where tuning results are cached (per data version, see ResultCache)
+TUNING_CACHE_DIR = os.getenv('TUNING_CACHE_DIR', os.path.join(os.path.dirname(RESULT_CACHE_DIR), 'tuning'))
+
+# Defaults: 8 candidates, 2 s trials in the first rung, half survive each rung
+TUNING_CANDIDATES = 8
+TUNING_TRIAL_SECONDS = 2.0
+TUNING_ETA = 2
+
+# Longest trial of any rung (later rungs multiply the first rung's time by eta)
+MAX_TRIAL_SECONDS = 60.0
+
+# Request parameters that change a tuning result
+TUNING_KEY_PARAMS = ('candidates', 'trial_seconds', 'eta')
+
+# Ranges random candidates are drawn from
+PARAMETER_RANGES = {
+    'population_size': (4, 20),
+    'crossover_rate': (0.5, 0.9),
+    'mutation_rate': (0.05, 0.4)
+}
+
+# Upper bound on trial length in generations (trials are cut by time)
+TRIAL_MAX_GENERATIONS = 500
+
+# Status texts of tuning jobs (see JobManager)
+TUNING_MESSAGES = {
+    'cached': 'Tuning result loaded from cache',
+    'cancelled': 'Parameter tuning cancelled',
+    'cancelled_partial': 'Parameter tuning cancelled (best parameters of finished rounds kept)',
+    'completed': 'Parameter tuning completed successfully!',
+    'failed': 'Parameter tuning failed'
+}
+
+# Cancel event and data snapshot of the tuning job, inherited by every trial
+# process (set by init_trial_worker)
+_tuning_cancel_event = None
+_tuning_data = None
+
+class TrialToken(CancellationToken):
+    """Cancelled once the trial's time is up or the whole tuning job is cancelled"""
+    
+    def __init__(self, seconds: float, job_event=None):
+        super().__init__()
+        self.deadline = time.monotonic() + seconds
+        self.job_event = job_event
+        
+    def is_cancelled(self) -> bool:
+        return (self.event.is_set() or time.monotonic() >= self.deadline
+                or (self.job_event is not None and self.job_event.is_set()))
+
+def init_trial_worker(cancel_event, data: Dict[str, Any]) -> None:
+    global _tuning_cancel_event, _tuning_data
+    _tuning_cancel_event = cancel_event
+    _tuning_data = data
+
+def trial_slots(generation_manager: Optional[JobManager]) -> int:
+    """Trials to run at once: the cores not taken by running generation jobs (at least 1)"""
+    busy = generation_manager.running_count() if generation_manager is not None else 0
+    return max(1, default_worker_count() - busy)
+
+def sample_candidates(presets: List[Dict[str, Any]], count: int, rng: random.Random) -> List[Dict[str, Any]]:
+    """The optimizer's presets first, then random parameter sets from PARAMETER_RANGES"""
+    candidates = [{name: preset[name] for name in PARAMETER_RANGES} for preset in presets[:count]]
+    while len(candidates) < count:
+        candidates.append({
+            'population_size': rng.randint(*PARAMETER_RANGES['population_size']),
+            'crossover_rate': round(rng.uniform(*PARAMETER_RANGES['crossover_rate']), 2),
+            'mutation_rate': round(rng.uniform(*PARAMETER_RANGES['mutation_rate']), 3)
+        })
+    return candidates
+
+def run_trial(parameters: Dict[str, Any], seed: int, seconds: float) -> Dict[str, Any]:
+    """
+    One truncated GA run (in a worker process)
+    
+    Runs as many generations as fit in `seconds` and scores the best
+    schedule found by then. Every candidate of a rung gets the same seed
+    and the same wall-clock budget, so a large population has to earn its
+    slower generations. Every trial schedules the tuning job's data
+    snapshot. Cancelling the tuning job stops the trial at its next
+    generation.
+    """
+    scheduler = UniversityScheduler(seed=seed, data=_tuning_data)
+    apply_generation_params(scheduler, dict(parameters, max_generations=TRIAL_MAX_GENERATIONS))
+    
+    result = scheduler.generate_schedule(cancel_token=TrialToken(seconds, _tuning_cancel_event))
+    metadata = result['metadata']
+    return {
+        'parameters': parameters,
+        'best_fitness': metadata['best_fitness'],
+        'total_conflicts': sum(metadata['final_conflicts'].values()),
+        'generations': metadata['generations'],
+        'execution_time': metadata['execution_time'],
+        'conflict_free': metadata['conflict_free'],
+        'conflict_free_generation': metadata['conflict_free_generation']
+    }
+
+def trial_rank(trial: Dict[str, Any]) -> tuple:
+    """
+    Sort key: best fitness, then fewest conflicts (fitness bottoms out at 0
+    on heavily conflicted data), earliest conflict-free generation, speed
+    """
+    return (-trial['best_fitness'], trial['total_conflicts'],
+            trial['conflict_free_generation'] or float('inf'), trial['execution_time'])
+
+def rung_plan(candidates: int, eta: int) -> List[int]:
+    """Candidates per rung of successive halving, e.g. 8, 4, 2 for eta 2"""
+    plan = [candidates]
+    while plan[-1] // eta >= 2:
+        plan.append(plan[-1] // eta)
+    return plan
+
+def run_tuning_job(job: GenerationJob, generation_manager: JobManager = None) -> Optional[Dict[str, Any]]:
+    """
+    Tune GA parameters by successive halving (JobManager runner)
+    
+    Candidate parameter sets race in truncated trials on a process pool.
+    After each rung the best 1/eta survive and get eta times longer
+    trials (up to MAX_TRIAL_SECONDS), until one is left. Only as many
+    trials run at once as cores are left by generation_manager's running
+    jobs. Returns the winner with its measured performance and every
+    rung's results; a cancelled run returns what finished rungs found
+    (None if none did).
+    
+    The schedule data is loaded once and handed to every trial process,
+    so all trials race on the same snapshot even if the data changes
+    meanwhile. Cancellation is shared with the trial processes through a
+    multiprocessing Event, so running trials stop at their next
+    generation.
+    """
+    cancel_event = PROCESS_CONTEXT.Event()
+    previous_token, job.cancel_token = job.cancel_token, CancellationToken(cancel_event)
+    if previous_token.is_cancelled():
+        cancel_event.set()
+        
+    params = job.params
+    count = max(2, min(32, int(params.get('candidates', TUNING_CANDIDATES))))
+    seconds = max(0.5, min(MAX_TRIAL_SECONDS, float(params.get('trial_seconds', TUNING_TRIAL_SECONDS))))
+    eta = max(2, min(4, int(params.get('eta', TUNING_ETA))))
+    rng = random.Random(params.get('seed'))
+    base_seed = rng.randrange(2 ** 32)
+    start_time = time.time()
+    
+    data = get_schedule_data()
+    if job.kode_prodi:
+        kode_prodi = [job.kode_prodi] if isinstance(job.kode_prodi, str) else job.kode_prodi
+        data['kuliah'] = [k for k in data['kuliah'] if k['kode_prodi'] in kode_prodi]
+        
+    optimizer = ParameterOptimizer(data)
+    recommendations = optimizer.get_parameter_recommendations()['recommendations']
+    presets = [recommendations[name]['parameters'] for name in ('balanced', 'conservative', 'aggressive')]
+    max_generations = recommendations['balanced']['parameters']['max_generations']
+    
+    survivors = sample_candidates(presets, count, rng)
+    plan = rung_plan(count, eta)
+    total_trials = sum(plan)
+    finished_trials = 0
+    rungs = []
+    
+    job.update_progress(status='generating', progress=0,
+                        message=f'Racing {count} parameter sets in {len(plan)} rounds...')
+                        
+    with ProcessPoolExecutor(max_workers=default_worker_count(), mp_context=PROCESS_CONTEXT,
+                             initializer=init_trial_worker, initargs=(cancel_event, data)) as pool:
+        for rung, _ in enumerate(plan):
+            seed = base_seed + rung
+            pending = list(survivors)
+            running = set()
+            trials = []
+            while (pending or running) and not job.cancel_token.is_cancelled():
+                # Top up to the free cores; generation jobs started meanwhile get theirs back
+                while pending and len(running) < trial_slots(generation_manager):
+                    running.add(pool.submit(run_trial, pending.pop(0), seed, seconds))
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    trials.append(future.result())
+                    finished_trials += 1
+                job.update_progress(progress=int(finished_trials / total_trials * 100),
+                                    message=f'Round {rung + 1}/{len(plan)}: '
+                                    f'{len(trials)}/{len(survivors)} trials of {seconds:g}s done')
+                                    
+            if job.cancel_token.is_cancelled():
+                break
+                
+            trials.sort(key=trial_rank)
+            rungs.append({'rung': rung + 1, 'trial_seconds': seconds, 'seed': seed, 'trials': trials})
+            survivors = [trial['parameters'] for trial in trials[:max(1, len(trials) // eta)]]
+            seconds = min(MAX_TRIAL_SECONDS, seconds * eta)
+            
+    if not rungs:
+        return None
+        
+    winner = rungs[-1]['trials'][0]
+    return {
+        'success': True,
+        'cancelled': job.cancel_token.is_cancelled(),
+        'parameters': dict(winner['parameters'], max_generations=max_generations),
+        'measured': winner,
+        'rungs': rungs,
+        'metadata': {
+            'candidates': count,
+            'eta': eta,
+            'trial_seconds': rungs[0]['trial_seconds'],
+            'trials': sum(len(r['trials']) for r in rungs),
+            'execution_time': round(time.time() - start_time, 2),
+            'data_version': job.data_version
+        }
+    }
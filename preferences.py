@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+
+import json
+from typing import Dict, List, Any, Iterable
+
+# Values of preferensi_slot.kind
+KIND_SUKA = 'suka'
+KIND_TIDAK_BISA = 'tidak_bisa'
+PREFERENCE_KINDS = (KIND_SUKA, KIND_TIDAK_BISA)
+
+def parse_waktu_ids(value) -> List[int]:
+    """
+    Parse a list of kode_waktu from a request body or a legacy JSON column
+    
+    Accepts a list, a JSON array string or None. Raises ValueError for anything
+    that is not a list of non-negative integers instead of silently dropping it.
+    """
+    if value is None or value == '':
+        return []
+        
+    if isinstance(value, (bytes, bytearray)):
+        value = value.decode('utf-8')
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"invalid JSON array: {e}")
+            
+    if not isinstance(value, list):
+        raise ValueError(f"expected a list of kode_waktu, got {type(value).__name__}")
+        
+    waktu_ids = []
+    for item in value:
+        try:
+            waktu_id = int(item)
+        except (TypeError, ValueError):
+            raise ValueError(f"invalid kode_waktu: {item!r}")
+        if waktu_id < 0:
+            raise ValueError(f"invalid kode_waktu: {item!r}")
+        waktu_ids.append(waktu_id)
+        
+    return sorted(set(waktu_ids))
+
+def mask_to_ids(mask: int) -> List[int]:
+    """Expand a kode_waktu bitmask back into a sorted list of kode_waktu"""
+    waktu_ids = []
+    while mask:
+        low_bit = mask & -mask
+        waktu_ids.append(low_bit.bit_length() - 1)
+        mask ^= low_bit
+    return waktu_ids
+
+class CompiledPreferences:
+    """
+    Dosen time preferences compiled into per-dosen bitmasks
+    
+    Bit k of a mask is set when kode_waktu k is preferred ('suka') or blocked
+    ('tidak_bisa'). Masks are kept per dosen name (what the scheduler genes
+    carry) and per nidn. ``records`` holds the per (nidn, hari) rows in the
+    shape served by /api/data.
+    """
+    
+    def __init__(self):
+        self.records: List[Dict[str, Any]] = []
+        self.suka_by_dosen: Dict[str, int] = {}
+        self.tidak_bisa_by_dosen: Dict[str, int] = {}
+        self.suka_by_nidn: Dict[str, int] = {}
+        self.tidak_bisa_by_nidn: Dict[str, int] = {}
+        
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]]) -> 'CompiledPreferences':
+        """
+        Build from rows of referensi_waktu_dosen LEFT JOIN preferensi_slot LEFT JOIN waktu,
+        ordered so the slots of one preference record are adjacent
+        """
+        compiled = cls()
+        current = None
+        
+        for row in rows:
+            if current is None or current['id'] != row['id']:
+                current = {
+                    'id': row['id'],
+                    'nidn': row['nidn'],
+                    'nama_dosen': row['nama_dosen'],
+                    'hari': row['hari'],
+                    'waktu_suka': [],
+                    'waktu_tidak_bisa': [],
+                    'created_at': row['created_at'],
+                    'updated_at': row['updated_at'],
+                    'waktu_suka_detail': [],
+                    'waktu_tidak_bisa_detail': []
+                }
+                compiled.records.append(current)
+                
+            kind = row['kind']
+            if kind is None:
+                continue  # preference record without any slot
+                
+            waktu_id = int(row['kode_waktu'])
+            bit = 1 << waktu_id
+            if kind == KIND_SUKA:
+                by_dosen, by_nidn = compiled.suka_by_dosen, compiled.suka_by_nidn
+            else:
+                by_dosen, by_nidn = compiled.tidak_bisa_by_dosen, compiled.tidak_bisa_by_nidn
+            by_dosen[row['nama_dosen']] = by_dosen.get(row['nama_dosen'], 0) | bit
+            by_nidn[row['nidn']] = by_nidn.get(row['nidn'], 0) | bit
+            
+            current[f'waktu_{kind}'].append(waktu_id)
+            if row['waktu'] is not None:
+                current[f'waktu_{kind}_detail'].append(row['waktu'])
+                
+        return compiled
+        
+    def is_blocked(self, dosen: str, waktu_id: int) -> bool:
+        """Whether the dosen cannot teach at kode_waktu"""
+        return bool((self.tidak_bisa_by_dosen.get(dosen, 0) >> waktu_id) & 1)
+        
+    def is_preferred(self, dosen: str, waktu_id: int) -> bool:
+        """Whether the dosen prefers kode_waktu"""
+        return bool((self.suka_by_dosen.get(dosen, 0) >> waktu_id) & 1)
+        
+    def __contains__(self, dosen: str) -> bool:
+        """Whether the dosen has any preferred or blocked slot"""
+        return dosen in self.suka_by_dosen or dosen in self.tidak_bisa_by_dosen
+        
+    def __len__(self) -> int:
+        return len(self.records)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+
+from array import array
+from time import perf_counter
+from typing import Dict, List, Any, Callable, Optional
+
+# Generations of numeric stats kept per run (older ones are overwritten)
+GENERATION_STATS_CAPACITY = 1000
+
+# Points in the serialized generation_data curve
+GENERATION_DATA_POINTS = 200
+
+# Default throttle: at most one report per REPORT_INTERVAL seconds
+REPORT_INTERVAL = 0.25
+REPORT_EVERY_GENERATIONS = 1
+
+class GenerationStats:
+    """
+    Fixed-size ring buffer of per-generation numbers
+    
+    Values live in preallocated typed arrays, so recording a generation
+    only overwrites slots and memory stays constant however long the run.
+    """
+    
+    def __init__(self, capacity: int = GENERATION_STATS_CAPACITY):
+        self.capacity = capacity
+        self.generation = array('l', [0]) * capacity
+        self.best_fitness = array('d', [0.0]) * capacity
+        self.avg_fitness = array('d', [0.0]) * capacity
+        self.total_conflicts = array('l', [0]) * capacity
+        self.count = 0  # generations recorded in total
+        
+    def append(self, generation: int, best_fitness: float, avg_fitness: float,
+               total_conflicts: int) -> None:
+        index = self.count % self.capacity
+        self.generation[index] = generation
+        self.best_fitness[index] = best_fitness
+        self.avg_fitness[index] = avg_fitness
+        self.total_conflicts[index] = total_conflicts
+        self.count += 1
+        
+    def __len__(self) -> int:
+        return min(self.count, self.capacity)
+        
+    def to_list(self, max_points: int = GENERATION_DATA_POINTS) -> List[Dict[str, Any]]:
+        """
+        Retained generations, oldest first, in the generation_data shape
+        
+        Downsampled by an even stride to at most max_points entries; the
+        newest generation is always included.
+        """
+        size = len(self)
+        if size == 0:
+            return []
+            
+        start = self.count - size
+        stride = max(1, -(-size // max_points)) if max_points else 1
+        offsets = list(range(0, size, stride))
+        if offsets[-1] != size - 1:
+            if max_points and len(offsets) >= max_points:
+                offsets[-1] = size - 1
+            else:
+                offsets.append(size - 1)
+                
+        points = []
+        for offset in offsets:
+            index = (start + offset) % self.capacity
+            points.append({
+                'generation': self.generation[index],
+                'best_fitness': self.best_fitness[index],
+                'avg_fitness': self.avg_fitness[index],
+                'total_conflicts': self.total_conflicts[index]
+            })
+        return points
+
+class ProgressReporter:
+    """
+    Throttled progress reporting for UniversityScheduler.generate_schedule
+    
+    record() is called every generation and only stores numbers. It returns
+    True when a report is due: at least every_generations generations and
+    min_interval seconds after the previous one (the first generation is
+    always due). Only then does the scheduler build the progress dict for
+    emit(); finish_due() tells whether the last generation still needs one.
+    """
+    
+    def __init__(self, callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 min_interval: float = REPORT_INTERVAL,
+                 every_generations: int = REPORT_EVERY_GENERATIONS,
+                 capacity: int = GENERATION_STATS_CAPACITY):
+        self.callback = callback
+        self.min_interval = min_interval
+        self.every_generations = max(1, every_generations)
+        self.stats = GenerationStats(capacity)
+        self.reports = 0
+        self._last_generation = None
+        self._last_time = 0.0
+        self._recorded_generation = None
+        
+    def record(self, generation: int, best_fitness: float, avg_fitness: float,
+               total_conflicts: int) -> bool:
+        """Store one generation's numbers; returns whether a report is due"""
+        self.stats.append(generation, best_fitness, avg_fitness, total_conflicts)
+        self._recorded_generation = generation
+        
+        if self.callback is None:
+            return False
+        if self._last_generation is None:
+            return True
+        if generation - self._last_generation < self.every_generations:
+            return False
+        return perf_counter() - self._last_time >= self.min_interval
+        
+    def emit(self, progress_data: Dict[str, Any]) -> None:
+        """Send a report for the most recently recorded generation"""
+        self._last_generation = self._recorded_generation
+        self._last_time = perf_counter()
+        self.reports += 1
+        self.callback(progress_data)
+        
+    def finish_due(self) -> bool:
+        """Whether the last recorded generation still has to be reported"""
+        return (self.callback is not None and self._recorded_generation is not None
+                and self._last_generation != self._recorded_generation)
+                
+    def generation_data(self, max_points: int = GENERATION_DATA_POINTS) -> List[Dict[str, Any]]:
+        return self.stats.to_list(max_points)
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+
+import gzip
+import hashlib
+import json
+import threading
+from typing import Dict, List, Any, Callable, Optional
+
+from flask import Response, request
+
+try:
+    import brotli
+except ImportError:  # gzip only without the optional brotli package
+    brotli = None
+
+# Bodies smaller than this are sent uncompressed
+MIN_COMPRESS_SIZE = 1024
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+class EncodedPayload:
+    """
+    A JSON response body with its ETag and lazily built compressed variants
+    
+    Each variant is compressed once and reused by every later request.
+    """
+    
+    def __init__(self, body: bytes, etag: str):
+        self.body = body
+        self.etag = etag
+        self._encoded: Dict[str, bytes] = {'identity': body}
+        self._lock = threading.Lock()
+        
+    def encoded(self, encoding: str) -> bytes:
+        """Body in the given content-coding ('identity', 'gzip' or 'br')"""
+        data = self._encoded.get(encoding)
+        if data is not None:
+            return data
+            
+        with self._lock:
+            if encoding not in self._encoded:
+                if encoding == 'br':
+                    self._encoded[encoding] = brotli.compress(self.body, quality=BROTLI_QUALITY)
+                else:
+                    self._encoded[encoding] = gzip.compress(self.body, compresslevel=GZIP_LEVEL, mtime=0)
+            return self._encoded[encoding]
+            
+    def precompress(self) -> 'EncodedPayload':
+        """Build every available compressed variant now instead of on first request"""
+        if len(self.body) >= MIN_COMPRESS_SIZE:
+            self.encoded('gzip')
+            if brotli is not None:
+                self.encoded('br')
+        return self
+
+def encode_json(value: Any, etag: str = None) -> EncodedPayload:
+    """
+    Serialize a value once into compact JSON bytes with precompressed variants
+    
+    Without an etag the content hash is used.
+    """
+    body = json.dumps(value, separators=(',', ':'), default=str).encode('utf-8')
+    return EncodedPayload(body, etag or hashlib.sha1(body).hexdigest()).precompress()
+
+def choose_encoding(body_size: int) -> str:
+    """Best content-coding the client accepts for a body of this size"""
+    if body_size < MIN_COMPRESS_SIZE:
+        return 'identity'
+    accepted = request.accept_encodings
+    if brotli is not None and accepted['br']:
+        return 'br'
+    if accepted['gzip']:
+        return 'gzip'
+    return 'identity'
+
+def payload_response(payload: EncodedPayload, cache_control: str = 'no-cache') -> Response:
+    """
+    Conditional, compressed response for a payload
+    
+    Answers 304 when If-None-Match already names the payload's ETag. The
+    ETag is weak so the same tag covers every content-coding.
+    """
+    if request.if_none_match.contains_weak(payload.etag):
+        response = Response(status=304)
+    else:
+        encoding = choose_encoding(len(payload.body))
+        response = Response(payload.encoded(encoding), mimetype='application/json')
+        if encoding != 'identity':
+            response.headers['Content-Encoding'] = encoding
+            
+    response.set_etag(payload.etag, weak=True)
+    response.headers['Cache-Control'] = cache_control
+    response.vary.add('Accept-Encoding')
+    return response
+
+def group_by(rows: List[Dict[str, Any]], field: str) -> Dict[Any, List[Dict[str, Any]]]:
+    """Index rows by one column, keeping their order within each group"""
+    index: Dict[Any, List[Dict[str, Any]]] = {}
+    for row in rows:
+        index.setdefault(row[field], []).append(row)
+    return index
+
+class ReferenceSnapshot:
+    """
+    Reference data of one data version plus lookup indexes over it
+    
+    Payloads for the whole dataset and for single index entries are
+    serialized on first use and then served as-is until the version changes.
+    """
+    
+    def __init__(self, version: Optional[int], data: Dict[str, Any],
+                 indexes: Dict[str, Dict[Any, List[Dict[str, Any]]]],
+                 dumps: Callable[[Any], str]):
+        self.version = version
+        self.data = data
+        self.indexes = indexes
+        self._dumps = dumps
+        self._payloads: Dict[tuple, EncodedPayload] = {}
+        self._lock = threading.Lock()
+        
+    def payload(self, index_name: str = None, key=None) -> EncodedPayload:
+        """Encoded payload of the whole snapshot, or of one index entry"""
+        cache_key = (index_name, key)
+        payload = self._payloads.get(cache_key)
+        if payload is not None:
+            return payload
+            
+        if index_name is None:
+            value = self.data
+        else:
+            value = self.indexes[index_name].get(key, [])
+            
+        body = self._dumps(value).encode('utf-8')
+        if self.version is not None:
+            etag = f"v{self.version}" if index_name is None else f"v{self.version}-{index_name}-{key}"
+        else:
+            etag = hashlib.sha1(body).hexdigest()
+        payload = EncodedPayload(body, etag)
+        
+        # Unknown keys are answered but not kept, so arbitrary URLs cannot grow the cache
+        if index_name is None or key in self.indexes[index_name]:
+            with self._lock:
+                payload = self._payloads.setdefault(cache_key, payload)
+        return payload
+
+class ReferenceCache:
+    """
+    Read-side cache of reference data keyed by the data_version counter
+    
+    Every request costs one data_version lookup; the tables are only read
+    again (and the indexes rebuilt) after a write bumped the version. When
+    the version is unavailable nothing is cached, but responses still get
+    content-hash ETags.
+    """
+    
+    def __init__(self, build: Callable[[], Dict[str, Any]],
+                 index_fields: Dict[str, tuple],
+                 version_func: Callable[[], Optional[int]],
+                 dumps: Callable[[Any], str] = json.dumps):
+        """
+        Args:
+            build: Loads the full reference data as a dict of row lists
+            index_fields: Index name -> (data key, row field), e.g.
+                          {'waktu_by_day': ('waktu', 'nama_hari')}
+            version_func: Returns the current data version (or None)
+            dumps: JSON serializer (the Flask app's, so rows encode the same)
+        """
+        self.build = build
+        self.index_fields = index_fields
+        self.version_func = version_func
+        self.dumps = dumps
+        self._snapshot: Optional[ReferenceSnapshot] = None
+        self._lock = threading.Lock()
+        
+    def snapshot(self) -> ReferenceSnapshot:
+        """Snapshot for the current data version, rebuilt only when it changed"""
+        version = self.version_func()
+        snapshot = self._snapshot
+        if snapshot is not None and version is not None and snapshot.version == version:
+            return snapshot
+            
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is not None and version is not None and snapshot.version == version:
+                return snapshot
+                
+            data = self.build()
+            indexes = {
+                name: group_by(data[source], field)
+                for name, (source, field) in self.index_fields.items()
+            }
+            snapshot = ReferenceSnapshot(version, data, indexes, self.dumps)
+            if version is not None:
+                self._snapshot = snapshot
+            return snapshot
+            
+    def invalidate(self) -> None:
+        """Drop the cached snapshot (e.g. after writes on a backend without versions)"""
+        self._snapshot = None
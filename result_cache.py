@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Any, Callable, Optional
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Where cached results live and how much disk they may use
+RESULT_CACHE_DIR = os.getenv('RESULT_CACHE_DIR', os.path.join(BASE_DIR, 'cache', 'results'))
+RESULT_CACHE_MAX_BYTES = int(os.getenv('RESULT_CACHE_MAX_BYTES', 200 * 1024 * 1024))
+
+# Request parameters that change the generated schedule
+CACHE_KEY_PARAMS = ('population_size', 'max_generations', 'crossover_rate', 'mutation_rate')
+
+class DiskCache:
+    """
+    Directory of cache files, one per key, trimmed by last use
+    
+    Entries are written atomically (temp file + rename) and marked as used
+    on every read; when the directory grows past max_bytes the least
+    recently used files are deleted. Subclasses pick the file SUFFIX and
+    how entries are encoded.
+    """
+    
+    SUFFIX = ''
+    
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}{self.SUFFIX}")
+        
+    def _load(self, key: str, decode: Callable[[bytes], Any]) -> Optional[Any]:
+        """Decoded entry for key, or None (unreadable entries are deleted)"""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                entry = decode(f.read())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Error reading cache entry {key}: {e}")
+            self._remove(path)
+            return None
+            
+        try:
+            os.utime(path)  # mark as recently used for eviction
+        except OSError:
+            pass
+        return entry
+        
+    def _store(self, key: str, body: bytes) -> None:
+        """Write an encoded entry (atomically) and evict old entries beyond max_bytes"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(body)
+        os.replace(temp_path, path)
+        
+        self.evict()
+        
+    def evict(self) -> int:
+        """Delete least recently used entries until the cache fits max_bytes"""
+        with self._lock:
+            try:
+                entries = []
+                with os.scandir(self.directory) as it:
+                    for entry in it:
+                        if entry.name.endswith(self.SUFFIX):
+                            stat = entry.stat()
+                            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            except FileNotFoundError:
+                return 0
+                
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+            for _, size, path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                self._remove(path)
+                total -= size
+                removed += 1
+            return removed
+            
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+class ResultCache(DiskCache):
+    """
+    Content-addressed, disk-backed cache of generation results
+    
+    Results are keyed by a hash of (data version, prodi filter, algorithm
+    parameters, seed) and stored as gzip-compressed compact JSON, one file
+    per key, so they survive restarts. When the directory grows past
+    max_bytes the least recently used files are deleted.
+    """
+    
+    SUFFIX = '.json.gz'
+    
+    def __init__(self, version_func: Callable[[], Optional[int]],
+                 directory: str = RESULT_CACHE_DIR, max_bytes: int = RESULT_CACHE_MAX_BYTES,
+                 key_params: tuple = CACHE_KEY_PARAMS):
+        super().__init__(directory, max_bytes)
+        self.version_func = version_func
+        self.key_params = key_params
+        
+    def key_for(self, params: Dict[str, Any], data_version: Optional[int] = None) -> Optional[str]:
+        """
+        Cache key of a generation request, or None when it must not be cached
+        
+        Without an explicit seed the key holds seed None: any earlier unseeded
+        run with the same data and parameters is an acceptable answer.
+        """
+        if data_version is None:
+            data_version = self.version_func()
+        if data_version is None:
+            return None  # data changes cannot be detected
+            
+        kode_prodi = params.get('kode_prodi')
+        if isinstance(kode_prodi, str):
+            kode_prodi = [kode_prodi]
+            
+        key_data = {
+            'data_version': data_version,
+            'kode_prodi': sorted(kode_prodi) if kode_prodi else None,
+            'params': {name: params.get(name) for name in self.key_params},
+            'seed': params.get('seed')
+        }
+        canonical = json.dumps(key_data, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+        
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached result for key, or None"""
+        return self._load(key, lambda body: json.loads(gzip.decompress(body)))
+        
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        """Store a result (atomically) and evict old entries beyond max_bytes"""
+        body = json.dumps(result, separators=(',', ':'), default=str).encode('utf-8')
+        self._store(key, gzip.compress(body, compresslevel=6, mtime=0))
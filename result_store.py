@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+
+import json
+import queue
+import threading
+import uuid
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+
+from dbConfig import create_database_connection
+
+# Rows per executemany when saving a final schedule (all chunks share one transaction)
+RESULT_CHUNK_SIZE = 500
+
+# Pending log rows the GA may queue before new rows are dropped
+LOG_QUEUE_SIZE = 1000
+LOG_BATCH_SIZE = 200
+
+# Result tables for the MySQL backend. database_schema.sql ties these tables to
+# kuliah_teknik/waktu2, which the application database does not have, so the
+# store creates FK-free versions keyed by kode_kuliah/kode_waktu/ruangan.id.
+# The SQLite backend gets the same tables from database_schema_sqlite.sql.
+MYSQL_RESULT_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS schedule_results (
+        id INT PRIMARY KEY AUTO_INCREMENT,
+        session_name VARCHAR(100),
+        kuliah_id INT NOT NULL,
+        waktu_id INT NOT NULL,
+        ruang_id INT NOT NULL,
+        fitness_score DECIMAL(10,6),
+        generation_found INT,
+        has_violations BOOLEAN DEFAULT FALSE,
+        violation_details TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        INDEX idx_schedule_session (session_name),
+        INDEX idx_schedule_session_fitness (session_name, fitness_score)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS scheduling_logs (
+        id INT PRIMARY KEY AUTO_INCREMENT,
+        session_name VARCHAR(100),
+        generation INT,
+        best_fitness DECIMAL(10,6),
+        total_penalties INT,
+        reserved_violations INT,
+        preference_violations INT,
+        traditional_clashes INT,
+        execution_time DECIMAL(10,3),
+        ram_usage INT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        INDEX idx_logs_session_generation (session_name, generation)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
+    """
+]
+
+class ScheduleResultStore:
+    """
+    Persist generated schedules into schedule_results and scheduling_logs
+    and load them back by session_name
+    """
+    
+    def __init__(self, connection=None):
+        """
+        Args:
+            connection: Storage backend from dbConfig; a dedicated one is created
+                        by default so writes never share a connection with requests
+        """
+        self.db = connection or create_database_connection()
+        self._tables_ready = False
+        
+    def ensure_tables(self) -> None:
+        """Create the result tables if the backend does not have them yet"""
+        if self._tables_ready:
+            return
+            
+        if self.db.backend == 'mysql':
+            for ddl in MYSQL_RESULT_TABLES:
+                self.db.execute_write(ddl)
+        elif not self.db.connect():
+            # SQLite creates the tables from its schema file on connect
+            raise ConnectionError("Database connection failed")
+            
+        self._tables_ready = True
+        
+    @staticmethod
+    def new_session_name(prefix: str = 'schedule') -> str:
+        """Create a unique session name that sorts by creation time"""
+        return f"{prefix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        
+    def save_result(self, session_name: str, result: Dict[str, Any],
+                    chunk_size: int = RESULT_CHUNK_SIZE) -> int:
+        """
+        Write the final assignment of a generated schedule
+        
+        Rows are inserted with executemany in chunks, all inside one
+        transaction, so readers never see a half-written session.
+        
+        Returns:
+            Number of rows written
+        """
+        self.ensure_tables()
+        
+        schedule = result.get('schedule', [])
+        metadata = result.get('metadata', {})
+        fitness = metadata.get('best_fitness')
+        generation_found = metadata.get('generations')
+        
+        # Flag rows that share a room or a dosen with another row at the same time
+        room_usage = Counter((row['waktu_id'], row['ruangan_id']) for row in schedule)
+        dosen_usage = Counter((row['waktu_id'], row['dosen']) for row in schedule)
+        
+        rows = []
+        for row in schedule:
+            violations = []
+            if room_usage[(row['waktu_id'], row['ruangan_id'])] > 1:
+                violations.append('room_time')
+            if dosen_usage[(row['waktu_id'], row['dosen'])] > 1:
+                violations.append('dosen_time')
+                
+            rows.append((
+                session_name,
+                row['kuliah_id'],
+                row['waktu_id'],
+                row['ruangan_id'],
+                fitness,
+                generation_found,
+                bool(violations),
+                json.dumps(violations) if violations else None
+            ))
+            
+        p = self.db.placeholder
+        insert_sql = f"""
+        INSERT INTO schedule_results
+        (session_name, kuliah_id, waktu_id, ruang_id, fitness_score,
+         generation_found, has_violations, violation_details)
+        VALUES ({', '.join([p] * 8)})
+        """
+        
+        with self.db.transaction() as cursor:
+            for start in range(0, len(rows), chunk_size):
+                cursor.executemany(insert_sql, rows[start:start + chunk_size])
+            
+        return len(rows)
+        
+    def write_logs(self, log_rows: List[tuple]) -> int:
+        """Append scheduling_logs rows in a single transaction"""
+        if not log_rows:
+            return 0
+            
+        self.ensure_tables()
+        
+        p = self.db.placeholder
+        insert_sql = f"""
+        INSERT INTO scheduling_logs
+        (session_name, generation, best_fitness, total_penalties, reserved_violations,
+         preference_violations, traditional_clashes, execution_time, ram_usage)
+        VALUES ({', '.join([p] * 9)})
+        """
+        return self.db.execute_many(insert_sql, log_rows)
+        
+    def list_sessions(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """List persisted sessions, newest first"""
+        self.ensure_tables()
+        
+        query = f"""
+        SELECT session_name,
+               COUNT(*) AS total_classes,
+               MAX(fitness_score) AS best_fitness,
+               SUM(CASE WHEN has_violations THEN 1 ELSE 0 END) AS classes_with_violations,
+               MAX(created_at) AS created_at
+        FROM schedule_results
+        GROUP BY session_name
+        ORDER BY MAX(id) DESC
+        LIMIT {int(limit)}
+        """
+        
+        results = self.db.execute_query(query)
+        if not results:
+            return []
+            
+        for session in results:
+            session['best_fitness'] = _to_float(session['best_fitness'])
+            session['classes_with_violations'] = int(session['classes_with_violations'] or 0)
+            session['created_at'] = str(session['created_at'])
+        return results
+        
+    def latest_session_name(self) -> Optional[str]:
+        """Name of the most recently saved session, if any"""
+        sessions = self.list_sessions(limit=1)
+        return sessions[0]['session_name'] if sessions else None
+        
+    def load_result(self, session_name: str) -> Optional[Dict[str, Any]]:
+        """
+        Load a persisted session in the same shape as
+        UniversityScheduler.generate_schedule() results
+        
+        Course, dosen, day and room labels are joined from the current
+        reference tables.
+        """
+        self.ensure_tables()
+        
+        p = self.db.placeholder
+        schedule_query = f"""
+        SELECT sr.kuliah_id,
+               k.kode_matakuliah,
+               k.nama_kelas,
+               d.nama AS dosen,
+               k.sks,
+               k.kode_prodi AS prodi,
+               w.nama_hari AS hari,
+               w.waktu,
+               r.nama_ruangan AS ruangan,
+               sr.waktu_id,
+               sr.ruang_id AS ruangan_id,
+               sr.fitness_score,
+               sr.generation_found,
+               sr.has_violations
+        FROM schedule_results sr
+        LEFT JOIN kuliah k ON sr.kuliah_id = k.kode_kuliah
+        LEFT JOIN dosen d ON k.kode_dosen = d.nidn
+        LEFT JOIN waktu w ON sr.waktu_id = w.kode_waktu
+        LEFT JOIN ruangan r ON sr.ruang_id = r.id
+        WHERE sr.session_name = {p}
+        ORDER BY sr.id
+        """
+        
+        rows = self.db.execute_query(schedule_query, (session_name,))
+        if not rows:
+            return None
+            
+        logs_query = f"""
+        SELECT generation, best_fitness, total_penalties, preference_violations,
+               traditional_clashes, execution_time
+        FROM scheduling_logs
+        WHERE session_name = {p}
+        ORDER BY generation
+        """
+        logs = self.db.execute_query(logs_query, (session_name,)) or []
+        
+        schedule = []
+        for row in rows:
+            schedule.append({
+                'kuliah_id': row['kuliah_id'],
+                'kode_matakuliah': row['kode_matakuliah'],
+                'nama_kelas': row['nama_kelas'],
+                'dosen': row['dosen'],
+                'sks': int(row['sks']) if row['sks'] is not None else None,
+                'prodi': row['prodi'],
+                'hari': row['hari'] or 'Unknown',
+                'waktu': row['waktu'] or 'Unknown',
+                'ruangan': row['ruangan'] or 'Unknown',
+                'waktu_id': row['waktu_id'],
+                'ruangan_id': row['ruangan_id']
+            })
+            
+        generation_data = [{
+            'generation': log['generation'],
+            'best_fitness': _to_float(log['best_fitness']),
+            'total_conflicts': (log['traditional_clashes'] or 0) + (log['preference_violations'] or 0)
+        } for log in logs]
+        
+        classes_with_violations = sum(1 for row in rows if row['has_violations'])
+        
+        return {
+            'success': True,
+            'session_name': session_name,
+            'schedule': schedule,
+            'metadata': {
+                'generations': rows[0]['generation_found'],
+                'best_fitness': _to_float(rows[0]['fitness_score']),
+                'execution_time': _to_float(logs[-1]['execution_time']) if logs else None,
+                'total_kuliah': len(schedule),
+                'conflict_free': classes_with_violations == 0,
+                'classes_with_violations': classes_with_violations
+            },
+            'generation_data': generation_data
+        }
+
+class SchedulingLogWriter(threading.Thread):
+    """
+    Background writer for per-generation scheduling_logs rows
+    
+    The GA thread only does a non-blocking put into a bounded queue; this
+    thread drains it and writes batches with executemany. If the database
+    falls behind and the queue fills up, new rows are dropped and counted
+    instead of stalling the GA loop.
+    """
+    
+    _STOP = object()
+    
+    def __init__(self, session_name: str, store: ScheduleResultStore = None,
+                 maxsize: int = LOG_QUEUE_SIZE, batch_size: int = LOG_BATCH_SIZE):
+        super().__init__(name=f"log-writer-{session_name}", daemon=True)
+        self.session_name = session_name
+        self.store = store or ScheduleResultStore()
+        self.batch_size = batch_size
+        self.queue = queue.Queue(maxsize=maxsize)
+        self.dropped = 0
+        self.written = 0
+        self.error = None
+        
+    def log_generation(self, progress_data: Dict[str, Any]) -> bool:
+        """Queue one generation's stats (from the progress callback); never blocks"""
+        conflicts = progress_data.get('conflicts', {})
+        row = (
+            self.session_name,
+            progress_data['generation'],
+            progress_data['best_fitness'],
+            progress_data.get('penalty'),
+            0,  # reserved slots are not modelled by UniversityScheduler
+            conflicts.get('preference_violations', 0),
+            conflicts.get('room_time_conflicts', 0) + conflicts.get('dosen_time_conflicts', 0),
+            round(progress_data.get('elapsed_time', 0.0), 3),
+            None
+        )
+        
+        try:
+            self.queue.put_nowait(row)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+            
+    def run(self):
+        """Drain the queue in batches until close() is called"""
+        stopping = False
+        while not stopping:
+            batch = []
+            item = self.queue.get()
+            while True:
+                if item is self._STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                    
+            try:
+                self.written += self.store.write_logs(batch) if batch else 0
+            except Exception as e:
+                # Logging is best effort; the schedule itself is saved separately
+                self.error = str(e)
+                print(f"Error writing scheduling logs: {e}")
+                
+    def close(self, timeout: float = 10.0) -> None:
+        """Flush the remaining rows and stop the writer thread"""
+        if not self.is_alive():
+            return
+        self.queue.put(self._STOP)
+        self.join(timeout)
+
+def _to_float(value) -> Optional[float]:
+    """Convert DECIMAL values from the database to float"""
+    return float(value) if value is not None else None
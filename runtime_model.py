@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Any, Optional, Sequence, Tuple
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Where finished runs are recorded (one JSON object per line)
+RUN_HISTORY_PATH = os.getenv('RUN_HISTORY_PATH', os.path.join(BASE_DIR, 'cache', 'run_history.jsonl'))
+
+# Most recent runs used for fitting; the file is trimmed to this size
+RUN_HISTORY_LIMIT = 500
+
+# Runs needed before a fitted model replaces the heuristic estimate
+MIN_RUNS = 3
+
+# Ridge penalty; keeps fits stable when a feature barely varies (e.g. one dataset)
+RIDGE = 1e-3
+
+def run_record(result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Training row for one finished generation run, or None if unusable"""
+    metadata = result.get('metadata', {})
+    params = metadata.get('algorithm_params', {})
+    generations = metadata.get('generations') or 0
+    execution_time = metadata.get('execution_time') or 0
+    if result.get('cached') or generations <= 0 or execution_time <= 0:
+        return None
+    if not metadata.get('total_waktu') or not metadata.get('total_ruangan'):
+        return None
+        
+    return {
+        'recorded_at': round(time.time(), 3),
+        'n_kuliah': metadata.get('total_kuliah', 0),
+        'n_waktu': metadata['total_waktu'],
+        'n_ruangan': metadata['total_ruangan'],
+        'population_size': params.get('population_size'),
+        'max_generations': params.get('max_generations'),
+        'crossover_rate': params.get('crossover_rate'),
+        'mutation_rate': params.get('mutation_rate'),
+        'generations': generations,
+        'execution_time': execution_time,
+        'seconds_per_generation': execution_time / generations,
+        'conflict_free_generation': metadata.get('conflict_free_generation')
+    }
+
+def time_features(population_size: int, n_kuliah: int, n_slots: int) -> List[float]:
+    # One generation evaluates and breeds population_size schedules of n_kuliah classes
+    return [math.log(max(population_size, 1)), math.log(max(n_kuliah, 1)), math.log(max(n_slots, 1))]
+
+def convergence_features(population_size: int, n_kuliah: int, n_slots: int,
+                         mutation_rate: float) -> List[float]:
+    return time_features(population_size, n_kuliah, n_slots) + [mutation_rate or 0.0]
+
+class LinearFit:
+    """
+    Ridge least-squares fit y ~ intercept + X·coef on centered features
+    
+    Small enough to solve with the normal equations, so no numpy needed.
+    Features that never vary in the data get a zero coefficient.
+    """
+    
+    def __init__(self, rows: Sequence[Sequence[float]], targets: Sequence[float], ridge: float = RIDGE):
+        n = len(rows)
+        k = len(rows[0])
+        self.means = [sum(row[j] for row in rows) / n for j in range(k)]
+        self.intercept = sum(targets) / n
+        
+        centered = [[row[j] - self.means[j] for j in range(k)] for row in rows]
+        y = [t - self.intercept for t in targets]
+        xtx = [[sum(r[i] * r[j] for r in centered) + (ridge if i == j else 0.0) for j in range(k)]
+               for i in range(k)]
+        xty = [sum(r[i] * t for r, t in zip(centered, y)) for i in range(k)]
+        self.coef = solve(xtx, xty)
+        
+        residuals = [t - self.predict(row) for row, t in zip(rows, targets)]
+        self.samples = n
+        self.rmse = math.sqrt(sum(r * r for r in residuals) / n)
+        
+    def predict(self, features: Sequence[float]) -> float:
+        return self.intercept + sum(c * (x - m) for c, x, m in zip(self.coef, features, self.means))
+
+def solve(matrix: List[List[float]], vector: List[float]) -> List[float]:
+    """Solve a small linear system by Gaussian elimination with partial pivoting"""
+    n = len(vector)
+    a = [row[:] + [value] for row, value in zip(matrix, vector)]
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda r: abs(a[r][col]))
+        a[col], a[pivot] = a[pivot], a[col]
+        if abs(a[col][col]) < 1e-12:
+            continue
+        for r in range(col + 1, n):
+            factor = a[r][col] / a[col][col]
+            for c in range(col, n + 1):
+                a[r][c] -= factor * a[col][c]
+                
+    x = [0.0] * n
+    for row in range(n - 1, -1, -1):
+        if abs(a[row][row]) < 1e-12:
+            continue
+        x[row] = (a[row][n] - sum(a[row][c] * x[c] for c in range(row + 1, n))) / a[row][row]
+    return x
+
+class RuntimeModel:
+    """
+    Runtime and convergence model learned from recorded runs
+    
+    Two log-space regressions:
+    - seconds per generation from population size, number of classes and
+      number of slots (waktu × ruangan)
+    - generations until the first conflict-free schedule, from the same
+      features plus the mutation rate (runs that reached one only)
+      
+    Each is None until MIN_RUNS usable runs exist; callers then fall back
+    to their heuristics.
+    """
+    
+    def __init__(self, runs: List[Dict[str, Any]]):
+        timed = [run for run in runs if run.get('seconds_per_generation')]
+        converged = [run for run in timed if run.get('conflict_free_generation')]
+        self.runs = len(timed)
+        
+        self.time_fit = None
+        if len(timed) >= MIN_RUNS:
+            self.time_fit = LinearFit(
+                [time_features(run['population_size'], run['n_kuliah'], run['n_waktu'] * run['n_ruangan'])
+                 for run in timed],
+                [math.log(run['seconds_per_generation']) for run in timed])
+                
+        self.convergence_fit = None
+        if len(converged) >= MIN_RUNS:
+            self.convergence_fit = LinearFit(
+                [convergence_features(run['population_size'], run['n_kuliah'],
+                                      run['n_waktu'] * run['n_ruangan'], run['mutation_rate'])
+                 for run in converged],
+                [math.log(run['conflict_free_generation']) for run in converged])
+                
+    def seconds_per_generation(self, population_size: int, n_kuliah: int, n_slots: int) -> Optional[float]:
+        if self.time_fit is None:
+            return None
+        return math.exp(self.time_fit.predict(time_features(population_size, n_kuliah, n_slots)))
+        
+    def conflict_free_generation(self, population_size: int, n_kuliah: int, n_slots: int,
+                                 mutation_rate: float) -> Optional[float]:
+        if self.convergence_fit is None:
+            return None
+        return math.exp(self.convergence_fit.predict(
+            convergence_features(population_size, n_kuliah, n_slots, mutation_rate)))
+            
+    def summary(self) -> Dict[str, Any]:
+        """Fit quality; rmse is in log space (0.1 ≈ ±10% typical error)"""
+        def describe(fit: Optional[LinearFit]) -> Optional[Dict[str, Any]]:
+            return {'samples': fit.samples, 'rmse_log': round(fit.rmse, 3)} if fit else None
+        return {
+            'runs': self.runs,
+            'min_runs': MIN_RUNS,
+            'time_model': describe(self.time_fit),
+            'convergence_model': describe(self.convergence_fit)
+        }
+
+class RunHistory:
+    """
+    Local log of finished generation runs used to train the RuntimeModel
+    
+    Runs are appended as JSON lines, so every worker process can record
+    into the same file. The fitted model is cached until the file changes.
+    """
+    
+    def __init__(self, path: str = RUN_HISTORY_PATH, limit: int = RUN_HISTORY_LIMIT):
+        self.path = path
+        self.limit = limit
+        self._model: Optional[Tuple[Tuple[float, int], RuntimeModel]] = None
+        self._lock = threading.Lock()
+        
+    def record(self, result: Dict[str, Any]) -> bool:
+        """Append a finished run; returns whether it was usable"""
+        run = run_record(result)
+        if run is None:
+            return False
+            
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(run, separators=(',', ':')) + '\n')
+        return True
+        
+    def load(self) -> List[Dict[str, Any]]:
+        """The most recent runs, oldest first (trims the file when it grew too long)"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return []
+            
+        runs = deque(maxlen=self.limit)
+        for line in lines:
+            try:
+                runs.append(json.loads(line))
+            except ValueError:
+                continue  # partial line from an interrupted write
+                
+        if len(lines) > 2 * self.limit:
+            self._rewrite(list(runs))
+        return list(runs)
+        
+    def _rewrite(self, runs: List[Dict[str, Any]]) -> None:
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with self._lock:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.writelines(json.dumps(run, separators=(',', ':')) + '\n' for run in runs)
+            os.replace(temp_path, self.path)
+            
+    def model(self) -> RuntimeModel:
+        """Model fitted on the current history (refitted only after new runs)"""
+        try:
+            stat = os.stat(self.path)
+            state = (stat.st_mtime, stat.st_size)
+        except FileNotFoundError:
+            state = (0.0, 0)
+            
+        cached = self._model
+        if cached is not None and cached[0] == state:
+            return cached[1]
+            
+        model = RuntimeModel(self.load())
+        self._model = (state, model)
+        return model
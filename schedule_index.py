@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Any, Optional
+
+# Schedule row fields that can be filtered on
+FILTER_FIELDS = ('hari', 'dosen', 'ruangan', 'prodi')
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+class ScheduleIndex:
+    """
+    Lookup indexes over one generated schedule
+    
+    Built once when a job finishes (or a stored session is loaded). Rows are
+    put in timetable order (waktu, then ruangan) and every filter field maps
+    each value to the positions of its rows in that order, so filtered pages
+    and per-dosen/per-room timetables never scan the whole schedule.
+    """
+    
+    def __init__(self, schedule: List[Dict[str, Any]]):
+        self.rows = sorted(schedule, key=lambda row: (row['waktu_id'], row['ruangan_id']))
+        self.positions: Dict[str, Dict[Any, List[int]]] = {field: {} for field in FILTER_FIELDS}
+        
+        for position, row in enumerate(self.rows):
+            for field in FILTER_FIELDS:
+                self.positions[field].setdefault(row[field], []).append(position)
+                
+    def __len__(self) -> int:
+        return len(self.rows)
+        
+    def values(self, field: str) -> Dict[Any, int]:
+        """Distinct values of a filter field with their row counts"""
+        return {value: len(positions) for value, positions in self.positions[field].items()}
+        
+    def select(self, filters: Dict[str, Any]) -> List[int]:
+        """
+        Positions of the rows matching every filter (field -> value)
+        
+        Starts from the smallest matching position list and checks the
+        remaining filters on those rows only.
+        """
+        active = [(field, value) for field, value in filters.items() if value is not None]
+        if not active:
+            return list(range(len(self.rows)))
+            
+        candidates = []
+        for field, value in active:
+            positions = self.positions[field].get(value)
+            if not positions:
+                return []
+            candidates.append((len(positions), field, positions))
+        candidates.sort(key=lambda candidate: candidate[0])
+        
+        _, first_field, positions = candidates[0]
+        others = [(field, value) for field, value in active if field != first_field]
+        if not others:
+            return positions
+        return [p for p in positions if all(self.rows[p][field] == value for field, value in others)]
+        
+    def page(self, filters: Dict[str, Any], page: int = 1,
+             per_page: int = DEFAULT_PAGE_SIZE) -> Dict[str, Any]:
+        """One page of the filtered schedule with paging metadata"""
+        positions = self.select(filters)
+        total = len(positions)
+        start = (page - 1) * per_page
+        
+        return {
+            'items': [self.rows[p] for p in positions[start:start + per_page]],
+            'total': total,
+            'page': page,
+            'per_page': per_page,
+            'pages': -(-total // per_page) if total else 0,
+            'filters': {field: value for field, value in filters.items() if value is not None}
+        }
+        
+    def timetable(self, field: str, value: Any) -> Optional[Dict[str, Any]]:
+        """
+        Timetable of one dosen or room grouped by hari, or None if unknown
+        
+        Days keep timetable (kode_waktu) order.
+        """
+        positions = self.positions[field].get(value)
+        if positions is None:
+            return None
+            
+        by_hari: Dict[str, List[Dict[str, Any]]] = {}
+        for p in positions:
+            row = self.rows[p]
+            by_hari.setdefault(row['hari'], []).append(row)
+            
+        return {
+            field: value,
+            'total': len(positions),
+            'total_sks': sum(self.rows[p]['sks'] or 0 for p in positions),
+            'by_hari': [{'hari': hari, 'classes': classes} for hari, classes in by_hari.items()]
+        }
+
+class SessionIndexCache:
+    """Small LRU of indexes for persisted sessions (stored results never change)"""
+    
+    def __init__(self, loader, max_entries: int = 8):
+        """
+        Args:
+            loader: session_name -> result dict (or None), e.g. ScheduleResultStore.load_result
+        """
+        self.loader = loader
+        self.max_entries = max_entries
+        self._indexes: 'OrderedDict[str, ScheduleIndex]' = OrderedDict()
+        self._lock = threading.Lock()
+        
+    def get(self, session_name: str) -> Optional[ScheduleIndex]:
+        with self._lock:
+            index = self._indexes.get(session_name)
+            if index is not None:
+                self._indexes.move_to_end(session_name)
+                return index
+                
+        result = self.loader(session_name)
+        if not result:
+            return None
+            
+        index = ScheduleIndex(result['schedule'])
+        with self._lock:
+            self._indexes[session_name] = index
+            while len(self._indexes) > self.max_entries:
+                self._indexes.popitem(last=False)
+        return index
@@ -1,11 +1,29 @@
 #!/usr/bin/env python3
 
-import json
 import random
-import math
+import sys
+import threading
 from time import perf_counter
 from typing import Dict, List, Any, Tuple
-from dbConfig import get_schedule_data
+from dbConfig import get_schedule_data, iter_kuliah_with_dosen_info
+from progress_reporter import ProgressReporter
+
+class CancellationToken:
+    """
+    Cooperative cancellation flag for generate_schedule
+    
+    Wraps a threading.Event by default; pass a multiprocessing Event to
+    cancel a run in a worker process from the parent.
+    """
+    
+    def __init__(self, event=None):
+        self.event = event if event is not None else threading.Event()
+        
+    def cancel(self) -> None:
+        self.event.set()
+        
+    def is_cancelled(self) -> bool:
+        return self.event.is_set()
 
 class UniversityScheduler:
     """
@@ -13,31 +31,51 @@ class UniversityScheduler:
     Clean wrapper for web integration with existing database structure
     """
     
-    def __init__(self):
-        """Initialize scheduler with default parameters"""
+    def __init__(self, kode_prodi=None, seed=None, data=None):
+        """
+        Initialize scheduler with default parameters
+        
+        Args:
+            kode_prodi: Optional prodi code (or list of codes) to schedule only those kuliah
+            seed: Optional random seed; the same data, parameters and seed give the same schedule
+            data: Optional get_schedule_data() snapshot (kuliah already filtered to
+                  kode_prodi) to use instead of loading from the database
+        """
         self.population_size = 8
         self.max_generations = 100
         self.crossover_rate = 0.75
         self.mutation_rate = 0.25
         self.per_sks = 50  # minutes per SKS
+        self.kode_prodi = kode_prodi
+        self.cancel_token = None  # set by generate_schedule
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.random = random.Random(self.seed)  # per instance, so concurrent runs stay independent
         
-        # Load data from database
-        self.data = get_schedule_data()
+        # Load data from database (kuliah is streamed in process_data)
+        self.data = data if data is not None else get_schedule_data(include_kuliah=False)
         self.process_data()
         
     def process_data(self):
         """Process database data for algorithm consumption"""
-        # Process kuliah data
+        # Process kuliah data: stream rows from the database unless the caller
+        # already supplied them, so the raw result set is never held in full
+        if 'kuliah' in self.data:
+            kuliah_rows = ((k['kode_kuliah'], k['kode_matakuliah'], k['nama_kelas'], k['sks'],
+                            k['kode_prodi'], k['nama_dosen']) for k in self.data['kuliah'])
+        else:
+            kuliah_rows = iter_kuliah_with_dosen_info(kode_prodi=self.kode_prodi)
+        
         self.kuliah = []
-        for k in self.data['kuliah']:
+        for kode_kuliah, kode_matakuliah, nama_kelas, sks, kode_prodi, nama_dosen, *_ in kuliah_rows:
+            sks = int(sks)
             self.kuliah.append({
-                'id': k['kode_kuliah'],
-                'nama': k['kode_matakuliah'],
-                'kelas': k['nama_kelas'],
-                'dosen': k['nama_dosen'],
-                'sks': int(k['sks']),
-                'prodi': k['kode_prodi'],
-                'duration': int(k['sks']) * self.per_sks  # duration in minutes
+                'id': kode_kuliah,
+                'nama': kode_matakuliah,
+                'kelas': _intern(nama_kelas),
+                'dosen': _intern(nama_dosen),
+                'sks': sks,
+                'prodi': _intern(kode_prodi),
+                'duration': sks * self.per_sks  # duration in minutes
             })
         
         # Process waktu data (create time mapping)
@@ -59,22 +97,8 @@ class UniversityScheduler:
                 'nama': r['nama_ruangan']
             })
         
-        # Process preferences
-        self.preferensi_dosen = {}
-        for pref in self.data.get('preferences', []):
-            dosen_nama = pref['nama_dosen']
-            if dosen_nama not in self.preferensi_dosen:
-                self.preferensi_dosen[dosen_nama] = {'suka': [], 'tidak_bisa': []}
-            
-            # Parse JSON arrays
-            try:
-                waktu_suka = json.loads(pref['waktu_suka']) if pref['waktu_suka'] else []
-                waktu_tidak_bisa = json.loads(pref['waktu_tidak_bisa']) if pref['waktu_tidak_bisa'] else []
-                
-                self.preferensi_dosen[dosen_nama]['suka'].extend(waktu_suka)
-                self.preferensi_dosen[dosen_nama]['tidak_bisa'].extend(waktu_tidak_bisa)
-            except:
-                continue
+        # Preferences arrive compiled into per-dosen kode_waktu bitmasks
+        self.preferensi_dosen = self.data['preferences']
     
     def get_day_index(self, hari: str) -> int:
         """Convert day name to index"""
@@ -92,8 +116,8 @@ class UniversityScheduler:
         
         for kuliah in self.kuliah:
             # Randomly assign time and room
-            waktu_id = random.choice([w['id'] for w in self.waktu])
-            ruangan_id = random.choice([r['id'] for r in self.ruangan])
+            waktu_id = self.random.choice([w['id'] for w in self.waktu])
+            ruangan_id = self.random.choice([r['id'] for r in self.ruangan])
             
             gene = {
                 'kuliah_id': kuliah['id'],
@@ -186,10 +210,8 @@ class UniversityScheduler:
             waktu_id = gene['waktu_id']
             
             if dosen in self.preferensi_dosen:
-                prefs = self.preferensi_dosen[dosen]
-                
                 # Heavy penalty for scheduling at blocked times
-                if waktu_id in prefs.get('tidak_bisa', []):
+                if self.preferensi_dosen.is_blocked(dosen, waktu_id):
                     conflicts['preference_violations'] += 1
                     penalty += 300
                     detailed_conflicts.append({
@@ -200,7 +222,7 @@ class UniversityScheduler:
                     })
                 
                 # Bonus for preferred times
-                elif waktu_id in prefs.get('suka', []):
+                elif self.preferensi_dosen.is_preferred(dosen, waktu_id):
                     penalty -= 20  # Increased bonus
         
         # Calculate fitness (higher is better, so we invert penalty)
@@ -225,11 +247,11 @@ class UniversityScheduler:
     
     def crossover(self, parent1: List[Dict], parent2: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
         """Perform crossover between two parents"""
-        if random.random() > self.crossover_rate:
+        if self.random.random() > self.crossover_rate:
             return parent1.copy(), parent2.copy()
         
         # Single point crossover
-        crossover_point = random.randint(1, len(parent1) - 1)
+        crossover_point = self.random.randint(1, len(parent1) - 1)
         
         child1 = parent1[:crossover_point] + parent2[crossover_point:]
         child2 = parent2[:crossover_point] + parent1[crossover_point:]
@@ -249,7 +271,7 @@ class UniversityScheduler:
         
         # Then perform random mutations
         for i, gene in enumerate(mutated):
-            if random.random() < self.mutation_rate:
+            if self.random.random() < self.mutation_rate:
                 # Smart mutation: try to avoid creating new conflicts
                 self.smart_mutate_gene(mutated, i)
         
@@ -262,6 +284,8 @@ class UniversityScheduler:
         max_attempts = len(individual) * 2
         
         while conflicts_found and attempts < max_attempts:
+            if self.is_cancelled():
+                return  # leave the individual partially repaired
             conflicts_found = False
             attempts += 1
             
@@ -310,7 +334,7 @@ class UniversityScheduler:
         for _ in range(max_tries):
             if conflict_type == 'room':
                 # Try different room
-                new_room_id = random.choice([r['id'] for r in self.ruangan])
+                new_room_id = self.random.choice([r['id'] for r in self.ruangan])
                 temp_gene = gene.copy()
                 temp_gene['ruangan_id'] = new_room_id
                 
@@ -321,7 +345,7 @@ class UniversityScheduler:
                     
             elif conflict_type == 'time':
                 # Try different time
-                new_waktu_id = random.choice([w['id'] for w in self.waktu])
+                new_waktu_id = self.random.choice([w['id'] for w in self.waktu])
                 temp_gene = gene.copy()
                 temp_gene['waktu_id'] = new_waktu_id
                 
@@ -355,7 +379,7 @@ class UniversityScheduler:
         
         # Check preference violation
         if dosen in self.preferensi_dosen:
-            if waktu_id in self.preferensi_dosen[dosen].get('tidak_bisa', []):
+            if self.preferensi_dosen.is_blocked(dosen, waktu_id):
                 return True
         
         return False
@@ -381,17 +405,17 @@ class UniversityScheduler:
         
         # Apply a random valid mutation if available
         if mutation_options:
-            mutation_type, new_value = random.choice(mutation_options)
+            mutation_type, new_value = self.random.choice(mutation_options)
             if mutation_type == 'room':
                 individual[gene_index]['ruangan_id'] = new_value
             else:
                 individual[gene_index]['waktu_id'] = new_value
         else:
             # Fallback to random mutation if no conflict-free option
-            if random.random() < 0.5:
-                individual[gene_index]['ruangan_id'] = random.choice([r['id'] for r in self.ruangan])
+            if self.random.random() < 0.5:
+                individual[gene_index]['ruangan_id'] = self.random.choice([r['id'] for r in self.ruangan])
             else:
-                individual[gene_index]['waktu_id'] = random.choice([w['id'] for w in self.waktu])
+                individual[gene_index]['waktu_id'] = self.random.choice([w['id'] for w in self.waktu])
     
     def select_parents(self, population: List[List[Dict]], fitness_scores: List[Dict]) -> List[List[Dict]]:
         """Select parents using tournament selection"""
@@ -400,33 +424,65 @@ class UniversityScheduler:
         for _ in range(2):
             # Tournament selection
             tournament_size = 3
-            tournament = random.sample(list(zip(population, fitness_scores)), 
+            tournament = self.random.sample(list(zip(population, fitness_scores)), 
                                      min(tournament_size, len(population)))
             winner = max(tournament, key=lambda x: x[1]['fitness'])
             parents.append(winner[0])
         
         return parents
     
-    def generate_schedule(self, progress_callback=None) -> Dict[str, Any]:
+    def is_cancelled(self) -> bool:
+        """Whether the running generation was asked to stop"""
+        return self.cancel_token is not None and self.cancel_token.is_cancelled()
+        
+    def generate_schedule(self, progress_callback=None, cancel_token: CancellationToken = None,
+                          reporter: ProgressReporter = None) -> Dict[str, Any]:
         """
         Generate schedule using genetic algorithm
         
         Args:
             progress_callback: Optional callback function for progress updates
+            cancel_token: Optional CancellationToken; checked every generation and
+                          inside the conflict repair loop. A cancelled run stops
+                          early and returns the best schedule found so far.
+            reporter: Optional ProgressReporter (throttling and stats buffer);
+                      by default one with the default throttle wraps progress_callback
         
         Returns:
             Dictionary containing best schedule and metadata
         """
         start_time = perf_counter()
+        self.cancel_token = cancel_token
+        if reporter is None:
+            reporter = ProgressReporter(progress_callback)
         
         # Create initial population
         population = self.create_population()
         best_individual = None
         best_fitness = -1
-        generation_data = []
+        generations_run = 0
+        conflict_free_generation = None  # first generation with a conflict-free individual
+        breed_time = 0.0  # time spent building the population evaluated next
+        
+        def progress_data():
+            """Progress dict for the current generation (built only when a report is due)"""
+            generation_best = max(fitness_scores, key=lambda f: f['fitness'])
+            return {
+                'generation': generation + 1,
+                'max_generations': self.max_generations,
+                'best_fitness': best_fitness,
+                'avg_fitness': avg_fitness,
+                'progress': (generation + 1) / self.max_generations * 100,
+                'penalty': generation_best['penalty'],
+                'conflicts': generation_best['conflicts'],
+                'total_conflicts': generation_best['total_conflicts'],
+                'timings': {'evaluate': evaluate_time, 'breed': breed_time},
+                'elapsed_time': perf_counter() - start_time
+            }
         
         for generation in range(self.max_generations):
             # Calculate fitness for all individuals
+            evaluate_start = perf_counter()
             fitness_scores = []
             for individual in population:
                 fitness_data = self.calculate_fitness(individual)
@@ -437,37 +493,34 @@ class UniversityScheduler:
                     best_fitness = fitness_data['fitness']
                     best_individual = individual.copy()
             
-            # Store generation data
-            avg_fitness = sum(f['fitness'] for f in fitness_scores) / len(fitness_scores)
-            generation_data.append({
-                'generation': generation,
-                'best_fitness': best_fitness,
-                'avg_fitness': avg_fitness,
-                'total_conflicts': min(f['total_conflicts'] for f in fitness_scores)
-            })
+            evaluate_time = perf_counter() - evaluate_start
+            generations_run = generation + 1
             
-            # Progress callback
-            if progress_callback:
-                progress_callback({
-                    'generation': generation + 1,
-                    'max_generations': self.max_generations,
-                    'best_fitness': best_fitness,
-                    'avg_fitness': avg_fitness,
-                    'progress': (generation + 1) / self.max_generations * 100
-                })
+            # Store generation stats (fixed-size buffer) and report when due
+            avg_fitness = sum(f['fitness'] for f in fitness_scores) / len(fitness_scores)
+            min_conflicts = min(f['total_conflicts'] for f in fitness_scores)
+            if min_conflicts == 0 and conflict_free_generation is None:
+                conflict_free_generation = generations_run
+            if reporter.record(generation, best_fitness, avg_fitness, min_conflicts):
+                reporter.emit(progress_data())
             
             # Early termination if good solution found
             if best_fitness >= 950:  # Adjust threshold as needed
                 break
             
+            # Stop with the best individual so far when cancelled
+            if self.is_cancelled():
+                break
+            
             # Create new population
+            breed_start = perf_counter()
             new_population = []
             
             # Elitism - keep best individual
             new_population.append(best_individual.copy())
             
             # Generate rest of population
-            while len(new_population) < self.population_size:
+            while len(new_population) < self.population_size and not self.is_cancelled():
                 parents = self.select_parents(population, fitness_scores)
                 child1, child2 = self.crossover(parents[0], parents[1])
                 
@@ -476,7 +529,15 @@ class UniversityScheduler:
                 
                 new_population.extend([child1, child2])
             
+            if self.is_cancelled():
+                break
+            
             population = new_population[:self.population_size]
+            breed_time = perf_counter() - breed_start
+        
+        # The last generation is always reported, even if throttled
+        if reporter.finish_due():
+            reporter.emit(progress_data())
         
         end_time = perf_counter()
         execution_time = end_time - start_time
@@ -488,25 +549,33 @@ class UniversityScheduler:
         # Validate final schedule
         validation_result = self.validate_schedule(best_individual)
         
+        cancelled = self.is_cancelled()
+        self.cancel_token = None
+        
         return {
             'success': True,
+            'cancelled': cancelled,
             'schedule': formatted_schedule,
             'metadata': {
-                'generations': len(generation_data),
+                'generations': generations_run,
                 'best_fitness': best_fitness,
                 'final_conflicts': final_fitness['conflicts'],
                 'execution_time': round(execution_time, 2),
                 'total_kuliah': len(self.kuliah),
+                'total_waktu': len(self.waktu),
+                'total_ruangan': len(self.ruangan),
+                'conflict_free_generation': conflict_free_generation,
                 'conflict_free': final_fitness['conflict_free'],
                 'validation': validation_result,
                 'algorithm_params': {
                     'population_size': self.population_size,
                     'max_generations': self.max_generations,
                     'crossover_rate': self.crossover_rate,
-                    'mutation_rate': self.mutation_rate
+                    'mutation_rate': self.mutation_rate,
+                    'seed': self.seed
                 }
             },
-            'generation_data': generation_data,
+            'generation_data': reporter.generation_data(),
             'detailed_conflicts': final_fitness.get('detailed_conflicts', [])
         }
     
@@ -577,8 +646,7 @@ class UniversityScheduler:
             waktu_id = gene['waktu_id']
             
             if dosen in self.preferensi_dosen:
-                prefs = self.preferensi_dosen[dosen]
-                if waktu_id in prefs.get('tidak_bisa', []):
+                if self.preferensi_dosen.is_blocked(dosen, waktu_id):
                     waktu_detail = next((w for w in self.waktu if w['id'] == waktu_id), None)
                     
                     validation['preference_violations'].append({
@@ -662,4 +730,8 @@ class UniversityScheduler:
             'classes_per_ruangan': by_ruangan,
             'unique_dosen': len(by_dosen),
             'unique_ruangan': len(by_ruangan)
-        }
\ No newline at end of file
+        }
+
+def _intern(value):
+    """Intern repeated labels (dosen, kelas, prodi) so every kuliah shares one string object"""
+    return sys.intern(value) if isinstance(value, str) else value
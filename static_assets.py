@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+import hashlib
+import mimetypes
+import os
+import threading
+from typing import Dict, Optional
+
+from flask import Response, request
+
+from read_cache import EncodedPayload, choose_encoding
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Re-read changed files on every request (development); set STATIC_RELOAD=1
+STATIC_RELOAD = os.getenv('STATIC_RELOAD', '0').lower() in ('1', 'true', 'yes')
+
+# Suffix of the ETag of each content-coding (strong ETags differ per coding)
+ETAG_SUFFIXES = {'identity': '', 'gzip': '-gz', 'br': '-br'}
+
+class StaticAsset(EncodedPayload):
+    """
+    One static file held in memory with its gzip/brotli variants
+    
+    The file is read and compressed once; the ETag is a hash of its bytes,
+    so it only changes when the content does.
+    """
+    
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            body = f.read()
+        super().__init__(body, hashlib.sha1(body).hexdigest()[:20])
+        self.path = path
+        self.mtime = os.stat(path).st_mtime
+        self.mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        self.precompress()
+        
+    def etag_for(self, encoding: str) -> str:
+        return self.etag + ETAG_SUFFIXES[encoding]
+        
+    def is_stale(self) -> bool:
+        try:
+            return os.stat(self.path).st_mtime != self.mtime
+        except OSError:
+            return True
+
+class StaticAssets:
+    """
+    In-memory store of static files served from one directory
+    
+    Files are loaded on first request (or by preload() at startup) and then
+    answered from memory. reload() drops everything so edited files are read
+    again; with auto_reload a file is reloaded as soon as its mtime changes.
+    """
+    
+    def __init__(self, directory: str = BASE_DIR, auto_reload: bool = STATIC_RELOAD):
+        self.directory = directory
+        self.auto_reload = auto_reload
+        self._assets: Dict[str, StaticAsset] = {}
+        self._lock = threading.Lock()
+        
+    def get(self, name: str) -> Optional[StaticAsset]:
+        """Asset for a file name relative to the directory, or None if missing"""
+        asset = self._assets.get(name)
+        if asset is not None and not (self.auto_reload and asset.is_stale()):
+            return asset
+            
+        path = os.path.join(self.directory, name)
+        try:
+            asset = StaticAsset(path)
+        except (FileNotFoundError, IsADirectoryError):
+            self._assets.pop(name, None)
+            return None
+            
+        with self._lock:
+            self._assets[name] = asset
+        return asset
+        
+    def preload(self, *names: str) -> None:
+        for name in names:
+            self.get(name)
+            
+    def reload(self, name: str = None) -> None:
+        """Forget one (or every) loaded file so it is read from disk again"""
+        with self._lock:
+            if name is None:
+                self._assets.clear()
+            else:
+                self._assets.pop(name, None)
+                
+    def response(self, name: str, cache_control: str = 'public, max-age=31536000, immutable') -> Response:
+        """
+        Response for a file with a strong ETag and the best accepted encoding
+        
+        Answers 304 when If-None-Match names the ETag of any variant.
+        """
+        asset = self.get(name)
+        if asset is None:
+            return Response(f"{name} not found", status=404, mimetype='text/plain')
+            
+        encoding = choose_encoding(len(asset.body))
+        if any(request.if_none_match.contains(asset.etag_for(e)) for e in ETAG_SUFFIXES):
+            response = Response(status=304)
+        else:
+            response = Response(asset.encoded(encoding), mimetype=asset.mimetype)
+            if encoding != 'identity':
+                response.headers['Content-Encoding'] = encoding
+                
+        response.set_etag(asset.etag_for(encoding))
+        response.headers['Cache-Control'] = cache_control
+        response.vary.add('Accept-Encoding')
+        return response
@@ -6,34 +6,437 @@ Provides web interface for CSV/Excel upload and scheduling optimization
 
 import os
 import io
+import csv
 import json
+import codecs
+import hashlib
+import pickle
+import tempfile
 import time
+import uuid
 import pandas as pd
 import numpy as np
 from datetime import datetime
 from flask import Flask, render_template, request, jsonify, send_file, Response
 from werkzeug.utils import secure_filename
 import threading
-import queue
+from collections import OrderedDict
 from typing import Dict, List, Any, Optional
 
 # Import our enhanced scheduling system
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from enhanced_scheduler import EnhancedScheduler
+from scheduler_pool import SchedulingPool, default_pool_size, optimize_schedule
+from event_stream import EventHistory, stream_job_events, parse_last_event_id
+from result_cache import DiskCache
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'your-secret-key-here'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 app.config['UPLOAD_FOLDER'] = 'uploads'
+# 'thread' runs optimizations in the web process; 'process' sends them to a CPU worker pool
+app.config['SCHEDULER_EXECUTOR'] = os.getenv('SCHEDULER_EXECUTOR', 'thread')
+app.config['SCHEDULER_WORKERS'] = int(os.getenv('SCHEDULER_WORKERS', 0)) or default_pool_size()
 
 # Ensure upload folder exists
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
+# Parsed uploads cached by content hash (LRU by last use, bounded in bytes)
+UPLOAD_CACHE_DIR = os.getenv('UPLOAD_CACHE_DIR', os.path.join(app.config['UPLOAD_FOLDER'], 'cache'))
+UPLOAD_CACHE_MAX_BYTES = int(os.getenv('UPLOAD_CACHE_MAX_BYTES', 100 * 1024 * 1024))
+
+# Upload ingestion
+ALLOWED_EXTENSIONS = {'.csv', '.xlsx', '.xls'}
+UPLOAD_CHUNK_ROWS = 10000
+ENCODING_SNIFF_BYTES = 64 * 1024
+# Encoding to retry with when bytes after the sniffed prefix do not decode (latin-1 accepts any byte)
+ENCODING_FALLBACKS = {'utf-8': 'cp1252', 'cp1252': 'latin-1'}
+
+REQUIRED_COLUMNS = {
+    'courses': ['nama', 'dosen', 'sks'],
+    'times': ['hari', 'jam_mulai'],
+    'rooms': ['nama', 'kapasitas'],
+    'preferences': ['dosen']  # Optional file
+}
+NUMERIC_COLUMNS = {
+    'courses': ['sks'],
+    'rooms': ['kapasitas']
+}
+TIME_PATTERN = r'^\d{2}:\d{2}(:\d{2})?$'
+
+# Exports
+EXPORT_CHUNK_ROWS = 1000
+
+# Scheduling jobs
+MAX_FINISHED_JOBS = 20  # finished jobs (with their results) kept for events, exports and reports
+EVENT_HISTORY = 500  # events kept per job for late subscribers and Last-Event-ID resume
+FINAL_STATUSES = ('complete', 'error')
+
+# Reports
+REPORT_FLUSH_LINES = 500  # lines buffered per streamed chunk
+
+def sniff_encoding(prefix: bytes) -> str:
+    """
+    Guess a text encoding from the first bytes of a file
+    
+    BOMs win; otherwise UTF-8 if the prefix decodes as UTF-8 (a character
+    cut off at the end of the prefix is fine), then cp1252, then latin-1,
+    which accepts any byte.
+    """
+    if prefix.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    if prefix.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return 'utf-16'
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(prefix, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+    try:
+        prefix.decode('cp1252')
+        return 'cp1252'
+    except UnicodeDecodeError:
+        return 'latin-1'
+
+def iter_csv_chunks(stream, encoding: str = None):
+    """Parse a CSV upload in chunks of text columns (encoding sniffed unless given)"""
+    if encoding is None:
+        encoding = sniff_encoding(stream.read(ENCODING_SNIFF_BYTES))
+        stream.seek(0)
+    reader = pd.read_csv(stream, encoding=encoding, dtype=str, chunksize=UPLOAD_CHUNK_ROWS)
+    with reader:
+        for chunk in reader:
+            yield chunk
+
+def iter_xlsx_chunks(stream):
+    """Stream the first sheet of an .xlsx upload in chunks (openpyxl read-only mode)"""
+    from openpyxl import load_workbook
+    
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = ['' if name is None else str(name) for name in header]
+        
+        batch = []
+        start = 0
+        for row in rows:
+            batch.append(row)
+            if len(batch) == UPLOAD_CHUNK_ROWS:
+                yield chunk_frame(batch, columns, start)
+                start += len(batch)
+                batch = []
+        if batch:
+            yield chunk_frame(batch, columns, start)
+    finally:
+        workbook.close()
+
+def chunk_frame(rows: List[tuple], columns: List[str], start: int) -> pd.DataFrame:
+    """Spreadsheet rows as text cells (empty cells stay missing), indexed by data row like read_csv"""
+    text_rows = [tuple(None if value is None else str(value) for value in row) for row in rows]
+    return pd.DataFrame.from_records(text_rows, columns=columns, index=pd.RangeIndex(start, start + len(rows)))
+
+def first_row(df: pd.DataFrame, mask: pd.Series) -> int:
+    """1-based data row number of the first row where mask is set"""
+    return int(df.index[mask.to_numpy()][0]) + 1
+
+def parse_waktu_list(text: str) -> List:
+    """Parse one preference cell: a JSON array, or comma-separated numbers"""
+    try:
+        value = json.loads(text)
+        return value if isinstance(value, list) else [value]
+    except (json.JSONDecodeError, ValueError):
+        return [int(x.strip()) for x in text.split(',') if x.strip().isdigit()]
+
+def parse_waktu_column(df: pd.DataFrame, column: str) -> List[List]:
+    """
+    Parse a preference column in one pass
+    
+    Each distinct cell text is parsed once and mapped back onto the rows
+    (uploads repeat the same lists a lot); missing cells become [].
+    """
+    if column not in df.columns:
+        return [[] for _ in range(len(df))]
+    
+    values = df[column]
+    present = values.notna().to_numpy()
+    texts = values.astype(str).to_numpy()
+    parsed = {text: parse_waktu_list(text) for text in pd.unique(texts[present])}
+    return [parsed[text] if has_value else [] for text, has_value in zip(texts, present)]
+
+def export_columns(rows: List[Dict[str, Any]]) -> List[str]:
+    """Column order for exported rows: every key, in order of first appearance"""
+    return list(dict.fromkeys(key for row in rows for key in row))
+
+def iter_csv_export(rows: List[Dict[str, Any]]):
+    """Yield a CSV of schedule rows in chunks of EXPORT_CHUNK_ROWS (header first)"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=export_columns(rows), lineterminator='\n')
+    writer.writeheader()
+    for start in range(0, len(rows), EXPORT_CHUNK_ROWS):
+        writer.writerows(rows[start:start + EXPORT_CHUNK_ROWS])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def write_excel_export(result: Dict[str, Any], target) -> None:
+    """
+    Write schedule (and statistics) sheets with openpyxl's write-only mode
+    
+    Rows are serialized as they are appended instead of being held as cell
+    objects, so memory stays flat however long the schedule is.
+    """
+    from openpyxl import Workbook
+    
+    workbook = Workbook(write_only=True)
+    rows = result['schedule']
+    columns = export_columns(rows)
+    sheet = workbook.create_sheet('Schedule')
+    sheet.append(columns)
+    for row in rows:
+        sheet.append([row.get(column) for column in columns])
+    
+    if result.get('statistics'):
+        stats = workbook.create_sheet('Statistics')
+        stats.append(list(result['statistics'].keys()))
+        stats.append(list(result['statistics'].values()))
+    
+    workbook.save(target)
+
+def row_sks(row: Dict[str, Any]) -> int:
+    try:
+        return int(row.get('sks') or 0)
+    except (TypeError, ValueError):
+        return 0
+
+class ReportIndex:
+    """
+    Groupings and totals of one formatted schedule for reports
+    
+    Built once when a job finishes (or per posted schedule). Rows are put
+    in timetable order (days in order of first appearance, then time) and
+    every group field maps each value to the positions of its rows in that
+    order, with class and SKS totals gathered in the same pass, so each
+    report section is one walk over its group.
+    """
+    
+    GROUP_FIELDS = ('day', 'lecturer', 'room')
+    
+    def __init__(self, schedule: List[Dict[str, Any]]):
+        day_order = {}
+        for row in schedule:
+            day_order.setdefault(row.get('day'), len(day_order))
+        self.rows = sorted(schedule, key=lambda row: (day_order[row.get('day')], str(row.get('time', ''))))
+        
+        self.positions: Dict[str, Dict[Any, List[int]]] = {field: {} for field in self.GROUP_FIELDS}
+        self.sks: Dict[str, Dict[Any, int]] = {field: {} for field in self.GROUP_FIELDS}
+        self.status_counts: Dict[str, int] = {}
+        self.total_sks = 0
+        
+        for position, row in enumerate(self.rows):
+            sks = row_sks(row)
+            self.total_sks += sks
+            status = row.get('status', 'N/A')
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+            for field in self.GROUP_FIELDS:
+                value = row.get(field, 'N/A')
+                self.positions[field].setdefault(value, []).append(position)
+                self.sks[field][value] = self.sks[field].get(value, 0) + sks
+    
+    def __len__(self) -> int:
+        return len(self.rows)
+    
+    def busiest(self, field: str) -> Optional[tuple]:
+        """(value, classes) of the group with the most classes, or None if empty"""
+        groups = self.positions[field]
+        if not groups:
+            return None
+        value = max(groups, key=lambda key: len(groups[key]))
+        return value, len(groups[value])
+
+# Columns shown per row in each grouped report section (the grouping column is left out)
+REPORT_SECTIONS = (
+    ('SCHEDULE BY DAY', 'day', ('time', 'course', 'lecturer', 'room', 'status')),
+    ('SCHEDULE BY LECTURER', 'lecturer', ('day', 'time', 'course', 'room', 'status')),
+    ('SCHEDULE BY ROOM', 'room', ('day', 'time', 'course', 'lecturer', 'status'))
+)
+
+def iter_report(results: Dict[str, Any], index: ReportIndex, config: Dict[str, Any]):
+    """Yield the text report line by line: statistics, summary, configuration, grouped schedule"""
+    stats = results.get('statistics', {})
+    yield "ENHANCED SCHEDULING SYSTEM - OPTIMIZATION REPORT\n"
+    yield f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+    
+    yield "STATISTICS:\n"
+    yield f"- Best Fitness: {stats.get('fitness', 'N/A')}\n"
+    yield f"- Execution Time: {stats.get('executionTime', 'N/A')}s\n"
+    yield f"- Generations: {stats.get('generations', 'N/A')}\n"
+    yield f"- Total Violations: {stats.get('totalViolations', 'N/A')}\n\n"
+    
+    yield "SUMMARY:\n"
+    yield f"- Classes: {len(index)} ({index.total_sks} SKS)\n"
+    yield (f"- Days: {len(index.positions['day'])}, Lecturers: {len(index.positions['lecturer'])}, "
+           f"Rooms: {len(index.positions['room'])}\n")
+    for status, count in sorted(index.status_counts.items(), key=lambda item: -item[1]):
+        yield f"- Status {status}: {count}\n"
+    for label, field in (('Busiest lecturer', 'lecturer'), ('Busiest room', 'room')):
+        busiest = index.busiest(field)
+        if busiest:
+            yield f"- {label}: {busiest[0]} ({busiest[1]} classes)\n"
+    yield "\n"
+    
+    yield "CONFIGURATION:\n"
+    yield json.dumps(config, indent=2) + "\n"
+    
+    for title, field, columns in REPORT_SECTIONS:
+        yield f"\n{title}:\n"
+        groups = index.positions[field]
+        # Days stay in timetable order; lecturers and rooms are listed by name
+        values = groups if field == 'day' else sorted(groups, key=str)
+        for value in values:
+            positions = groups[value]
+            yield f"\n{value} ({len(positions)} classes, {index.sks[field][value]} SKS)\n"
+            for p in positions:
+                row = index.rows[p]
+                yield "- " + " | ".join(str(row.get(column, 'N/A')) for column in columns) + "\n"
+
+def iter_buffered(lines, flush_lines: int = REPORT_FLUSH_LINES):
+    """Join a line generator into chunks of flush_lines lines for a streamed response"""
+    buffer = []
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) >= flush_lines:
+            yield ''.join(buffer)
+            buffer = []
+    if buffer:
+        yield ''.join(buffer)
+
+class SchedulingJob(EventHistory):
+    """
+    One scheduling run, its numbered event history and its result
+    
+    Updates are appended to one bounded history that every subscriber reads
+    at its own pace (see event_stream.stream_job_events), so any number of
+    clients can follow a job without a queue each, and a slow client never
+    holds up the run or the other clients.
+    """
+    
+    FINAL_STATUSES = FINAL_STATUSES
+    FINAL_EVENTS = FINAL_STATUSES  # the 'complete' and 'error' updates
+    PROGRESS_EVENT = 'generation'
+    
+    def __init__(self, config: Dict):
+        super().__init__(uuid.uuid4().hex[:12], EVENT_HISTORY)
+        self.config = config
+        self.created_at = time.time()
+        self.finished_at = None
+        self.result = None
+        self.index = None  # ReportIndex, built once from the result
+        self.progress = {
+            'status': 'queued',
+            'progress': 0,
+            'message': 'Waiting to start...'
+        }
+    
+    def publish(self, update: Dict) -> None:
+        """Record a progress/generation/complete/error update and wake subscribers"""
+        with self._changed:
+            if self.status in FINAL_STATUSES:
+                return  # late progress from a worker process after the result
+            if update['type'] == 'complete':
+                self.progress.update(status='complete', progress=100, message=update['result'].get('message', ''))
+            elif update['type'] == 'error':
+                self.progress.update(status='error', message=update['message'])
+            else:
+                self.progress.update(status='running', progress=update['progress'], message=update['message'])
+            if self.status in FINAL_STATUSES:
+                self.finished_at = time.time()
+            
+            self._append_event(update['type'], update)
+    
+    def set_result(self, result: Dict) -> None:
+        """Attach the formatted result with its report index (before publishing 'complete')"""
+        self.index = ReportIndex(result.get('schedule', []))
+        self.result = result
+    
+    def summary(self) -> Dict[str, Any]:
+        """Job metadata without the (possibly large) result"""
+        return {
+            'job_id': self.job_id,
+            'created_at': self.created_at,
+            'finished_at': self.finished_at,
+            'has_result': self.result is not None,
+            **self.progress
+        }
+
+class UploadCache(DiskCache):
+    """
+    Disk cache of validated, converted uploads keyed by file content
+    
+    The key is a SHA-256 of the file bytes plus the upload type and
+    extension, so re-submitting the same file skips reading, validation and
+    conversion. Entries are pickled (binary, no re-parsing on load) one
+    file per key; past max_bytes the least recently used are deleted.
+    """
+    
+    # Bump when parsing or conversion changes, so old entries are not reused
+    FORMAT_VERSION = 1
+    SUFFIX = '.pkl'
+    
+    def __init__(self, directory: str = UPLOAD_CACHE_DIR, max_bytes: int = UPLOAD_CACHE_MAX_BYTES):
+        super().__init__(directory, max_bytes)
+    
+    def key_for(self, file, data_type: str) -> str:
+        """Content hash of an uploaded file (the stream is rewound afterwards)"""
+        digest = hashlib.sha256(f"{self.FORMAT_VERSION}:{data_type}:{os.path.splitext(file.filename)[1].lower()}:".encode('utf-8'))
+        stream = file.stream
+        for block in iter(lambda: stream.read(1024 * 1024), b''):
+            digest.update(block)
+        stream.seek(0)
+        return digest.hexdigest()
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached entry for key, or None"""
+        return self._load(key, pickle.loads)
+    
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        """Store an entry (atomically) and evict old entries beyond max_bytes"""
+        self._store(key, pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL))
+
 class SchedulingWebService:
     def __init__(self):
-        self.current_jobs = {}
-        self.job_counter = 0
+        self.current_jobs: Dict[str, SchedulingJob] = OrderedDict()
+        self.scheduler_pool = None
+        self._lock = threading.Lock()
+    
+    def submit(self, data: Dict, config: Dict) -> SchedulingJob:
+        """Register a job and start scheduling it in a background thread"""
+        job = SchedulingJob(config)
+        with self._lock:
+            self.current_jobs[job.job_id] = job
+        threading.Thread(target=self.run_scheduling, args=(job, data), daemon=True).start()
+        return job
+    
+    def prune(self) -> None:
+        """Forget the oldest finished jobs beyond MAX_FINISHED_JOBS"""
+        with self._lock:
+            finished = [job_id for job_id, job in self.current_jobs.items() if job.status in FINAL_STATUSES]
+            for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+                del self.current_jobs[job_id]
+    
+    def get_job(self, job_id: str) -> Optional[SchedulingJob]:
+        return self.current_jobs.get(job_id)
+    
+    def get_scheduler_pool(self) -> SchedulingPool:
+        """CPU worker pool, created on first use in this process"""
+        with self._lock:
+            if self.scheduler_pool is None:
+                self.scheduler_pool = SchedulingPool(app.config['SCHEDULER_WORKERS'])
+            return self.scheduler_pool
     
     def validate_file(self, file) -> tuple[bool, str]:
         """Validate uploaded file"""
@@ -44,201 +447,212 @@ class SchedulingWebService:
             return False, "No file selected"
         
         # Check file extension
-        allowed_extensions = {'.csv', '.xlsx', '.xls'}
         file_ext = os.path.splitext(file.filename)[1].lower()
-        if file_ext not in allowed_extensions:
-            return False, f"Invalid file type. Allowed: {', '.join(allowed_extensions)}"
-        
-        # Check file size (already handled by Flask config, but double-check)
-        file.seek(0, 2)  # Go to end
-        file_size = file.tell()
-        file.seek(0)  # Reset to beginning
-        
-        if file_size > app.config['MAX_CONTENT_LENGTH']:
-            return False, "File too large. Maximum size: 16MB"
+        if file_ext not in ALLOWED_EXTENSIONS:
+            return False, f"Invalid file type. Allowed: {', '.join(sorted(ALLOWED_EXTENSIONS))}"
         
+        # File size is enforced by MAX_CONTENT_LENGTH before the request reaches us
         return True, "File valid"
     
-    def read_file_data(self, file) -> tuple[bool, pd.DataFrame, str]:
-        """Read data from uploaded file"""
+    def read_file_data(self, file, data_type: str) -> tuple[bool, pd.DataFrame, str]:
+        """
+        Read and validate an uploaded file in one streaming pass
+        
+        The encoding is sniffed once from a prefix (and stepped through
+        ENCODING_FALLBACKS if a later byte does not decode), then the file
+        is parsed in chunks of UPLOAD_CHUNK_ROWS rows with every column read
+        as text (no per-chunk dtype inference). Each chunk is validated as
+        it arrives and reading stops at the first bad one.
+        """
+        if data_type not in REQUIRED_COLUMNS:
+            return False, None, f"Unknown data type: {data_type}"
+        
         try:
             file_ext = os.path.splitext(file.filename)[1].lower()
             
             if file_ext == '.csv':
-                # Try different encodings for CSV
-                try:
-                    df = pd.read_csv(file, encoding='utf-8')
-                except UnicodeDecodeError:
-                    file.seek(0)
+                encoding = sniff_encoding(file.stream.read(ENCODING_SNIFF_BYTES))
+                file.stream.seek(0)
+                while True:
                     try:
-                        df = pd.read_csv(file, encoding='latin-1')
+                        return self.collect_chunks(iter_csv_chunks(file.stream, encoding), data_type)
                     except UnicodeDecodeError:
-                        file.seek(0)
-                        df = pd.read_csv(file, encoding='cp1252')
+                        if encoding not in ENCODING_FALLBACKS:
+                            raise
+                        # Undecodable bytes after the sniffed prefix: another pass with the fallback
+                        encoding = ENCODING_FALLBACKS[encoding]
+                        file.stream.seek(0)
+            
+            elif file_ext == '.xlsx':
+                return self.collect_chunks(iter_xlsx_chunks(file.stream), data_type)
             
-            elif file_ext in ['.xlsx', '.xls']:
-                df = pd.read_excel(file, engine='openpyxl' if file_ext == '.xlsx' else 'xlrd')
+            elif file_ext == '.xls':
+                # xlrd cannot stream; the sheet is read at once and validated in chunks
+                df = pd.read_excel(file.stream, engine='xlrd', dtype=str)
+                return self.collect_chunks(
+                    (df.iloc[start:start + UPLOAD_CHUNK_ROWS].copy() for start in range(0, len(df), UPLOAD_CHUNK_ROWS)),
+                    data_type)
             
             else:
                 return False, None, "Unsupported file format"
-            
-            # Clean column names
-            df.columns = df.columns.str.strip().str.lower()
-            
-            # Remove empty rows
-            df = df.dropna(how='all')
-            
-            return True, df, "File read successfully"
         
+        except UnicodeDecodeError as e:
+            return False, None, f"Error reading file: not valid {e.encoding} text at byte {e.start}"
         except Exception as e:
             return False, None, f"Error reading file: {str(e)}"
     
+    def collect_chunks(self, chunks, data_type: str) -> tuple[bool, pd.DataFrame, str]:
+        """Clean and validate chunks as they are parsed; stop at the first invalid one"""
+        frames = []
+        for chunk in chunks:
+            # Clean column names and remove empty rows
+            chunk.columns = chunk.columns.astype(str).str.strip().str.lower()
+            chunk = chunk.dropna(how='all')
+            
+            valid, message = self.validate_data_structure(chunk, data_type)
+            if not valid:
+                return False, None, message
+            frames.append(chunk)
+        
+        if not frames:
+            return False, None, "File contains no data"
+        
+        df = pd.concat(frames) if len(frames) > 1 else frames[0]
+        return True, df, f"{data_type.title()} data validated successfully"
+    
     def validate_data_structure(self, df: pd.DataFrame, data_type: str) -> tuple[bool, str]:
-        """Validate data structure based on type"""
-        required_columns = {
-            'courses': ['nama', 'dosen', 'sks'],
-            'times': ['hari', 'jam_mulai'],
-            'rooms': ['nama', 'kapasitas'],
-            'preferences': ['dosen']  # Optional file
-        }
+        """
+        Validate one chunk of an upload based on type
         
-        if data_type not in required_columns:
+        Numeric columns are converted in place; error messages name the
+        first offending row (as a 1-based data row number).
+        """
+        if data_type not in REQUIRED_COLUMNS:
             return False, f"Unknown data type: {data_type}"
         
-        required = required_columns[data_type]
+        required = REQUIRED_COLUMNS[data_type]
         missing = [col for col in required if col not in df.columns]
         
         if missing and data_type != 'preferences':
             return False, f"Missing required columns: {', '.join(missing)}"
         
-        # Additional validation
-        if data_type == 'courses':
-            # Check if SKS column contains numeric values
-            try:
-                df['sks'] = pd.to_numeric(df['sks'], errors='coerce')
-                if df['sks'].isna().any():
-                    return False, "SKS column must contain numeric values"
-            except Exception:
-                return False, "Invalid SKS data format"
+        # Required text columns must be filled in
+        for column in required:
+            if column in df.columns and df[column].isna().any():
+                return False, f"{column} is empty in row {first_row(df, df[column].isna())}"
         
-        elif data_type == 'rooms':
-            # Check if capacity column contains numeric values
-            try:
-                df['kapasitas'] = pd.to_numeric(df['kapasitas'], errors='coerce')
-                if df['kapasitas'].isna().any():
-                    return False, "Kapasitas column must contain numeric values"
-            except Exception:
-                return False, "Invalid kapasitas data format"
+        # Numeric columns (sks, kapasitas)
+        for column in NUMERIC_COLUMNS.get(data_type, []):
+            values = pd.to_numeric(df[column], errors='coerce')
+            if values.isna().any():
+                return False, f"{column} must contain numeric values (row {first_row(df, values.isna())})"
+            df[column] = values
         
-        elif data_type == 'times':
+        if data_type == 'times':
             # Validate time format
-            time_pattern = r'^\\d{2}:\\d{2}$'
-            if not df['jam_mulai'].str.match(time_pattern).all():
-                return False, "jam_mulai must be in HH:MM format"
+            valid = df['jam_mulai'].astype(str).str.match(TIME_PATTERN)
+            if not valid.all():
+                return False, f"jam_mulai must be in HH:MM format (row {first_row(df, ~valid)})"
         
         return True, f"{data_type.title()} data validated successfully"
     
     def convert_to_scheduler_format(self, data_dict: Dict[str, pd.DataFrame]) -> Dict[str, List]:
-        """Convert pandas DataFrames to format expected by scheduler"""
+        """
+        Convert pandas DataFrames to format expected by scheduler
+        
+        Works column-wise: every column is converted once and the columns are
+        zipped into rows, so no per-row Series is built.
+        """
         converted = {}
         
         # Convert courses
         if 'courses' in data_dict:
             df = data_dict['courses']
-            converted['kuliah'] = []
-            for idx, row in df.iterrows():
-                converted['kuliah'].append({
-                    'id': idx,
-                    'nama': str(row['nama']),
-                    'dosen': str(row['dosen']),
-                    'sks': int(row['sks'])
-                })
+            converted['kuliah'] = [
+                {'id': idx, 'nama': nama, 'dosen': dosen, 'sks': sks}
+                for idx, nama, dosen, sks in zip(
+                    df.index.tolist(),
+                    df['nama'].astype(str).tolist(),
+                    df['dosen'].astype(str).tolist(),
+                    df['sks'].astype(int).tolist()
+                )
+            ]
         
         # Convert times
         if 'times' in data_dict:
             df = data_dict['times']
-            converted['waktu'] = []
-            for idx, row in df.iterrows():
-                converted['waktu'].append([
-                    idx,
-                    str(row['hari']),
-                    str(row['jam_mulai'])
-                ])
+            converted['waktu'] = [
+                list(row) for row in zip(
+                    df.index.tolist(),
+                    df['hari'].astype(str).tolist(),
+                    df['jam_mulai'].astype(str).tolist()
+                )
+            ]
         
         # Convert rooms
         if 'rooms' in data_dict:
             df = data_dict['rooms']
-            converted['ruangan'] = []
-            for idx, row in df.iterrows():
-                converted['ruangan'].append([
-                    idx,
-                    str(row['nama']),
-                    int(row['kapasitas'])
-                ])
+            converted['ruangan'] = [
+                list(row) for row in zip(
+                    df.index.tolist(),
+                    df['nama'].astype(str).tolist(),
+                    df['kapasitas'].astype(int).tolist()
+                )
+            ]
         
         # Convert preferences if available
         if 'preferences' in data_dict:
             df = data_dict['preferences']
-            converted['preferensi_dosen'] = []
-            for _, row in df.iterrows():
-                pref_waktu = []
-                tidak_bisa = []
-                
-                # Parse preference columns if they exist
-                if 'preferensi_waktu' in df.columns and pd.notna(row['preferensi_waktu']):
-                    try:
-                        pref_waktu = json.loads(str(row['preferensi_waktu']))
-                    except (json.JSONDecodeError, ValueError):
-                        # Try to parse as comma-separated values
-                        pref_waktu = [int(x.strip()) for x in str(row['preferensi_waktu']).split(',') if x.strip().isdigit()]
-                
-                if 'tidak_bisa_waktu' in df.columns and pd.notna(row['tidak_bisa_waktu']):
-                    try:
-                        tidak_bisa = json.loads(str(row['tidak_bisa_waktu']))
-                    except (json.JSONDecodeError, ValueError):
-                        # Try to parse as comma-separated values
-                        tidak_bisa = [int(x.strip()) for x in str(row['tidak_bisa_waktu']).split(',') if x.strip().isdigit()]
-                
-                converted['preferensi_dosen'].append({
-                    'dosen': str(row['dosen']),
-                    'preferensi_waktu': pref_waktu,
-                    'tidak_bisa_waktu': tidak_bisa
-                })
+            converted['preferensi_dosen'] = [
+                {'dosen': dosen, 'preferensi_waktu': pref_waktu, 'tidak_bisa_waktu': tidak_bisa}
+                for dosen, pref_waktu, tidak_bisa in zip(
+                    df['dosen'].astype(str).tolist(),
+                    parse_waktu_column(df, 'preferensi_waktu'),
+                    parse_waktu_column(df, 'tidak_bisa_waktu')
+                )
+            ]
         
         return converted
     
-    def run_scheduling(self, job_id: str, data: Dict, config: Dict, progress_queue: queue.Queue):
-        """Run scheduling in background thread"""
+    def load_upload(self, file, data_type: str) -> tuple[bool, Dict[str, Any], str]:
+        """
+        Validated and converted data of one uploaded file
+        
+        Served from the upload cache when the same file was processed before;
+        otherwise read, validated, converted and cached. The entry holds the
+        file's row count, columns and its part of the scheduler data.
+        """
+        key = upload_cache.key_for(file, data_type)
+        entry = upload_cache.get(key)
+        if entry is not None:
+            return True, dict(entry, cached=True), "Loaded from upload cache"
+        
+        success, df, message = self.read_file_data(file, data_type)
+        if not success:
+            return False, None, message
+        
+        entry = {
+            'rows': len(df),
+            'columns': list(df.columns),
+            'data': self.convert_to_scheduler_format({data_type: df})
+        }
         try:
-            progress_queue.put({
-                'type': 'progress',
-                'progress': 10,
-                'message': 'Initializing scheduler...'
-            })
-            
-            # Initialize enhanced scheduler
-            scheduler = EnhancedScheduler(data, config)
-            
-            progress_queue.put({
-                'type': 'progress', 
-                'progress': 20,
-                'message': 'Pre-allocating reserved slots...'
-            })
-            
-            # Run scheduling with progress updates
-            def progress_callback(generation, fitness, message):
-                progress = 20 + (generation / config['algorithm']['maxGenerations']) * 60
-                progress_queue.put({
-                    'type': 'generation',
-                    'generation': generation,
-                    'fitness': fitness,
-                    'progress': progress,
-                    'message': message
-                })
-            
-            result = scheduler.optimize(progress_callback)
+            upload_cache.put(key, entry)
+        except Exception as e:
+            print(f"Error caching upload {file.filename}: {e}")
+        return True, dict(entry, cached=False), message
+    
+    def run_scheduling(self, job: SchedulingJob, data: Dict):
+        """Run scheduling in background thread, publishing updates to the job"""
+        config = job.config
+        try:
+            if app.config['SCHEDULER_EXECUTOR'] == 'process':
+                # The GA loop is pure Python; in a worker process it cannot block this one's I/O
+                result = self.get_scheduler_pool().run(job.job_id, data, config, job.publish)
+            else:
+                result = optimize_schedule(data, config, job.publish)
             
-            progress_queue.put({
+            job.publish({
                 'type': 'progress',
                 'progress': 90,
                 'message': 'Formatting results...'
@@ -246,17 +660,21 @@ class SchedulingWebService:
             
             # Format results for web display
             formatted_result = self.format_results(result, data)
+            formatted_result['job_id'] = job.job_id
+            job.set_result(formatted_result)
             
-            progress_queue.put({
+            job.publish({
                 'type': 'complete',
                 'result': formatted_result
             })
             
         except Exception as e:
-            progress_queue.put({
+            job.publish({
                 'type': 'error',
                 'message': str(e)
             })
+        finally:
+            self.prune()
     
     def format_results(self, raw_results: Dict, original_data: Dict) -> Dict:
         """Format scheduling results for web display"""
@@ -321,6 +739,7 @@ class SchedulingWebService:
             }
 
 # Initialize service
+upload_cache = UploadCache()
 service = SchedulingWebService()
 
 @app.route('/')
@@ -328,6 +747,25 @@ def index():
     """Main page with file upload interface"""
     return render_template('index.html')
 
+def wants_job_handle() -> bool:
+    """Whether the client prefers JSON (a job handle) to an event stream, by Accept header"""
+    for value, _ in request.accept_mimetypes:  # highest quality first
+        mimetype = value.split(';')[0].strip().lower()
+        if mimetype == 'application/json':
+            return True
+        if mimetype == 'text/event-stream':
+            return False
+    return False
+
+def job_handle(job: SchedulingJob) -> Dict[str, Any]:
+    """Job summary with the URLs to follow it"""
+    return dict(
+        job.summary(),
+        status_url=f'/api/jobs/{job.job_id}',
+        events_url=f'/api/jobs/{job.job_id}/events',
+        result_url=f'/api/jobs/{job.job_id}/result'
+    )
+
 @app.route('/api/schedule', methods=['POST'])
 def schedule():
     """Handle scheduling request with file uploads"""
@@ -337,7 +775,7 @@ def schedule():
             return jsonify({'error': 'Missing required files'}), 400
         
         # Process uploaded files
-        data_dict = {}
+        scheduler_data = {}
         file_info = {}
         
         for file_type in ['courses', 'times', 'rooms', 'preferences']:
@@ -349,21 +787,17 @@ def schedule():
                 if not valid:
                     return jsonify({'error': f'{file_type}: {message}'}), 400
                 
-                # Read file data
-                success, df, message = service.read_file_data(file)
+                # Read, validate and convert file data (or reuse a cached identical upload)
+                success, upload, message = service.load_upload(file, file_type)
                 if not success:
                     return jsonify({'error': f'{file_type}: {message}'}), 400
                 
-                # Validate data structure
-                valid, message = service.validate_data_structure(df, file_type)
-                if not valid:
-                    return jsonify({'error': f'{file_type}: {message}'}), 400
-                
-                data_dict[file_type] = df
+                scheduler_data.update(upload['data'])
                 file_info[file_type] = {
                     'filename': file.filename,
-                    'rows': len(df),
-                    'columns': list(df.columns)
+                    'rows': upload['rows'],
+                    'columns': upload['columns'],
+                    'cached': upload['cached']
                 }
         
         # Parse configuration
@@ -372,118 +806,92 @@ def schedule():
         except json.JSONDecodeError:
             return jsonify({'error': 'Invalid configuration JSON'}), 400
         
-        # Convert data to scheduler format
-        scheduler_data = service.convert_to_scheduler_format(data_dict)
+        job = service.submit(scheduler_data, config)
         
-        # For synchronous response (simple version)
-        if request.headers.get('Accept') == 'application/json':
-            # Run scheduling synchronously
-            job_id = f"job_{service.job_counter}"
-            service.job_counter += 1
-            
-            progress_queue = queue.Queue()
-            
-            # Run in thread but wait for completion
-            thread = threading.Thread(
-                target=service.run_scheduling,
-                args=(job_id, scheduler_data, config, progress_queue)
-            )
-            thread.start()
-            thread.join(timeout=300)  # 5 minute timeout
-            
-            # Get final result
-            final_result = None
-            while not progress_queue.empty():
-                update = progress_queue.get()
-                if update['type'] == 'complete':
-                    final_result = update['result']
-                elif update['type'] == 'error':
-                    return jsonify({'error': update['message']}), 500
-            
-            if final_result:
-                return jsonify(final_result)
-            else:
-                return jsonify({'error': 'Scheduling timeout or failed'}), 500
+        # JSON clients get a handle to poll or subscribe to instead of waiting for the run
+        if wants_job_handle():
+            return jsonify(job_handle(job)), 202
         
-        # For streaming response (Server-Sent Events)
-        else:
-            def generate_progress():
-                job_id = f"job_{service.job_counter}"
-                service.job_counter += 1
-                
-                progress_queue = queue.Queue()
-                
-                # Start background thread
-                thread = threading.Thread(
-                    target=service.run_scheduling,
-                    args=(job_id, scheduler_data, config, progress_queue)
-                )
-                thread.start()
-                
-                # Stream progress updates
-                while thread.is_alive() or not progress_queue.empty():
-                    try:
-                        update = progress_queue.get(timeout=1.0)
-                        yield f"data: {json.dumps(update)}\\n\\n"
-                        
-                        if update['type'] in ['complete', 'error']:
-                            break
-                    except queue.Empty:
-                        continue
-                
-                thread.join()
-            
-            return Response(
-                generate_progress(),
-                mimetype='text/event-stream',
-                headers={
-                    'Cache-Control': 'no-cache',
-                    'Connection': 'keep-alive'
-                }
-            )
+        # Streaming clients follow the job's events from the start on this response
+        return stream_job_events(job, 0)
     
     except Exception as e:
         return jsonify({'error': f'Server error: {str(e)}'}), 500
 
-@app.route('/api/export/<format>', methods=['POST'])
+@app.route('/api/jobs/<job_id>')
+def job_status(job_id):
+    """Status of a scheduling job"""
+    job = service.get_job(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    return jsonify(job_handle(job))
+
+@app.route('/api/jobs/<job_id>/events')
+def job_events(job_id):
+    """Server-Sent Events stream of a job's progress (any number of subscribers)"""
+    job = service.get_job(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    
+    return stream_job_events(job, parse_last_event_id())
+
+@app.route('/api/jobs/<job_id>/result')
+def job_result(job_id):
+    """Formatted result of a finished job"""
+    job = service.get_job(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    if job.result is None:
+        return jsonify({'error': f'Job has no result (status: {job.status})'}), 409
+    
+    return jsonify(job.result)
+
+@app.route('/api/export/<format>', methods=['GET', 'POST'])
 def export_schedule(format):
-    """Export schedule in various formats"""
+    """
+    Export schedule in various formats
+    
+    Exports the stored result of the job_id given (query string or JSON
+    body) when this process still has it, otherwise the schedule posted in
+    the body (jobs live in the memory of the worker that ran them). CSV is
+    streamed in chunks; Excel is written in write-only mode to a temporary
+    file that is streamed back.
+    """
     try:
-        data = request.get_json()
-        if not data or 'schedule' not in data:
+        data = request.get_json(silent=True) or {}
+        job_id = request.args.get('job_id') or data.get('job_id')
+        job = service.get_job(job_id) if job_id else None
+        if job is not None and job.result is not None:
+            data = job.result
+        elif 'schedule' not in data:
+            if job_id:
+                return jsonify({'error': f'No stored result for job {job_id}'}), 404
             return jsonify({'error': 'No schedule data provided'}), 400
         
-        schedule_df = pd.DataFrame(data['schedule'])
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
         if format.lower() == 'excel':
-            output = io.BytesIO()
-            with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                schedule_df.to_excel(writer, sheet_name='Schedule', index=False)
-                
-                # Add statistics sheet if available
-                if 'statistics' in data:
-                    stats_df = pd.DataFrame([data['statistics']])
-                    stats_df.to_excel(writer, sheet_name='Statistics', index=False)
-            
+            output = tempfile.TemporaryFile()
+            try:
+                write_excel_export(data, output)
+            except Exception:
+                output.close()
+                raise
             output.seek(0)
             return send_file(
                 output,
                 mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
                 as_attachment=True,
-                download_name=f'schedule_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
+                download_name=f'schedule_{timestamp}.xlsx'
             )
         
         elif format.lower() == 'csv':
-            output = io.StringIO()
-            schedule_df.to_csv(output, index=False)
-            output.seek(0)
-            
-            response = Response(
-                output.getvalue(),
+            return Response(
+                iter_csv_export(data['schedule']),
                 mimetype='text/csv',
-                headers={'Content-Disposition': f'attachment; filename=schedule_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv'}
+                headers={'Content-Disposition': f'attachment; filename=schedule_{timestamp}.csv'}
             )
-            return response
         
         else:
             return jsonify({'error': f'Unsupported export format: {format}'}), 400
@@ -491,45 +899,38 @@ def export_schedule(format):
     except Exception as e:
         return jsonify({'error': f'Export failed: {str(e)}'}), 500
 
-@app.route('/api/report', methods=['POST'])
+@app.route('/api/report', methods=['GET', 'POST'])
 def generate_report():
-    """Generate detailed PDF report"""
+    """
+    Generate detailed text report
+    
+    Reports the stored result of the job_id given (query string, JSON body
+    or the posted results) when this process still has it, using the index
+    built when the job finished; otherwise the posted results are indexed
+    once. The report is streamed as it is written, grouped by day, lecturer
+    and room.
+    """
     try:
-        data = request.get_json()
-        if not data:
+        data = request.get_json(silent=True) or {}
+        job_id = request.args.get('job_id') or data.get('job_id') or data.get('results', {}).get('job_id')
+        job = service.get_job(job_id) if job_id else None
+        if job is not None and job.result is not None:
+            results, config, index = job.result, job.config, job.index
+        elif 'results' in data:
+            results = data['results']
+            config = data.get('config', {})
+            index = ReportIndex(results.get('schedule', []))
+        elif job_id:
+            return jsonify({'error': f'No stored result for job {job_id}'}), 404
+        else:
             return jsonify({'error': 'No data provided'}), 400
         
-        # For now, return a simple text report
+        # For now, a plain text report
         # In production, you'd use a library like reportlab to generate PDFs
-        
-        report_content = f"""
-ENHANCED SCHEDULING SYSTEM - OPTIMIZATION REPORT
-Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-STATISTICS:
-- Best Fitness: {data.get('results', {}).get('statistics', {}).get('fitness', 'N/A')}
-- Execution Time: {data.get('results', {}).get('statistics', {}).get('executionTime', 'N/A')}s
-- Generations: {data.get('results', {}).get('statistics', {}).get('generations', 'N/A')}
-- Total Violations: {data.get('results', {}).get('statistics', {}).get('totalViolations', 'N/A')}
-
-CONFIGURATION:
-{json.dumps(data.get('config', {}), indent=2)}
-
-SCHEDULE:
-"""
-        
-        schedule = data.get('results', {}).get('schedule', [])
-        for item in schedule:
-            report_content += f"- {item.get('course', 'N/A')} | {item.get('lecturer', 'N/A')} | {item.get('day', 'N/A')} {item.get('time', 'N/A')} | {item.get('room', 'N/A')} | Status: {item.get('status', 'N/A')}\\n"
-        
-        output = io.BytesIO(report_content.encode('utf-8'))
-        output.seek(0)
-        
-        return send_file(
-            output,
+        return Response(
+            iter_buffered(iter_report(results, index, config)),
             mimetype='text/plain',
-            as_attachment=True,
-            download_name=f'scheduling_report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.txt'
+            headers={'Content-Disposition': f'attachment; filename=scheduling_report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.txt'}
         )
     
     except Exception as e:
@@ -13,9 +13,11 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from app import app
+from scheduler_pool import default_pool_size
 
-def setup_production_config():
+def setup_production_config(pool_size=None):
     """Setup production configuration"""
+    # The gevent worker must only do I/O: run optimizations in a CPU pool
     app.config.update({
         'SECRET_KEY': os.environ.get('SECRET_KEY', 'your-super-secret-production-key-change-this'),
         'DEBUG': False,
@@ -23,6 +25,8 @@ def setup_production_config():
         'MAX_CONTENT_LENGTH': 32 * 1024 * 1024,  # 32MB for production
         'UPLOAD_FOLDER': os.environ.get('UPLOAD_FOLDER', 'uploads'),
         'DATABASE_URL': os.environ.get('DATABASE_URL', 'sqlite:///scheduling.db'),
+        'SCHEDULER_EXECUTOR': os.environ.get('SCHEDULER_EXECUTOR', 'process'),
+        'SCHEDULER_WORKERS': pool_size or int(os.environ.get('SCHEDULER_WORKERS', 0)) or default_pool_size(),
     })
 
 def setup_development_config():
@@ -44,10 +48,22 @@ def main():
                       help='Host to bind to (default: 127.0.0.1)')
     parser.add_argument('--port', type=int, default=5000,
                       help='Port to bind to (default: 5000)')
-    parser.add_argument('--workers', type=int, default=4,
-                      help='Number of worker processes for production (default: 4)')
+    parser.add_argument('--workers', type=int, default=1,
+                      help='Number of gunicorn worker processes for production (only 1 is supported)')
+    parser.add_argument('--pool-size', type=int, default=None,
+                      help='Number of scheduling CPU worker processes for production (default: CPU cores)')
+    parser.add_argument('--max-requests', type=int, default=0,
+                      help='Restart the gunicorn worker after this many requests (default: 0, never; '
+                           'a restart drops running jobs)')
+    parser.add_argument('--max-requests-jitter', type=int, default=0,
+                      help='Random extra requests added to --max-requests (default: 0)')
     
     args = parser.parse_args()
+    if args.workers != 1:
+        # Jobs and their event streams live in one process's memory; several
+        # workers would answer job URLs for jobs they do not have
+        parser.error(f"--workers {args.workers} is not supported: run one web worker and set "
+                     f"the number of scheduling processes with --pool-size {args.workers}")
     
     # Ensure upload directory exists
     upload_dir = 'uploads'
@@ -58,18 +74,22 @@ def main():
     
     if args.mode == 'prod':
         print("🚀 Starting in PRODUCTION mode")
-        setup_production_config()
+        setup_production_config(args.pool_size)
+        print(f"🧮 Scheduling: {app.config['SCHEDULER_EXECUTOR']} executor, "
+              f"{app.config['SCHEDULER_WORKERS']} CPU worker(s)")
         
         try:
             import gunicorn.app.wsgiapp as wsgi
             sys.argv = [
                 'gunicorn',
                 '--bind', f'{args.host}:{args.port}',
+                # Jobs and their event streams live in this process's memory, so
+                # every request must reach the same worker; gevent serves them all
                 '--workers', str(args.workers),
                 '--worker-class', 'gevent',
                 '--worker-connections', '1000',
-                '--max-requests', '1000',
-                '--max-requests-jitter', '100',
+                '--max-requests', str(args.max_requests),
+                '--max-requests-jitter', str(args.max_requests_jitter),
                 '--timeout', '300',
                 '--keep-alive', '5',
                 '--access-logfile', '-',
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Enhanced University Scheduling System - CPU Worker Pool
+Runs scheduling optimizations in separate processes so web workers only do I/O
+"""
+
+import os
+import queue
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Callable, Optional
+
+from enhanced_scheduler import EnhancedScheduler
+
+# Fresh interpreters for workers: forking a gevent (monkey-patched) process is unsafe
+POOL_CONTEXT = multiprocessing.get_context('spawn')
+
+# Progress queue inherited by every pool worker (set by init_pool_worker)
+_worker_updates = None
+
+def default_pool_size(web_workers: int = 1) -> int:
+    """Cores available per web worker process (at least 1)"""
+    return max(1, (os.cpu_count() or 1) // max(1, web_workers))
+
+def optimize_schedule(data: Dict, config: Dict, report: Callable[[Dict], None]) -> Dict[str, Any]:
+    """Run one EnhancedScheduler optimization, reporting progress updates through report()"""
+    report({
+        'type': 'progress',
+        'progress': 10,
+        'message': 'Initializing scheduler...'
+    })
+    
+    # Initialize enhanced scheduler
+    scheduler = EnhancedScheduler(data, config)
+    
+    report({
+        'type': 'progress',
+        'progress': 20,
+        'message': 'Pre-allocating reserved slots...'
+    })
+    
+    # Run scheduling with progress updates
+    def progress_callback(generation, fitness, message):
+        progress = 20 + (generation / config['algorithm']['maxGenerations']) * 60
+        report({
+            'type': 'generation',
+            'generation': generation,
+            'fitness': fitness,
+            'progress': progress,
+            'message': message
+        })
+    
+    return scheduler.optimize(progress_callback)
+
+def init_pool_worker(updates) -> None:
+    global _worker_updates
+    _worker_updates = updates
+
+def optimize_in_worker(job_id: str, data: Dict, config: Dict) -> Dict[str, Any]:
+    """Pool task: optimize and send progress tagged with job_id to the parent"""
+    return optimize_schedule(data, config, lambda update: _worker_updates.put((job_id, update)))
+
+class SchedulingPool:
+    """
+    Process pool for CPU-bound scheduling jobs
+    
+    Under gunicorn's gevent workers a pure-Python GA loop in a thread blocks
+    the hub and with it every connection of the worker. Jobs are sent to a
+    pool of spawned processes instead; the caller waits on the job's future,
+    which yields to other greenlets. Progress from all workers comes back
+    on one shared queue and a dispatcher thread hands each update to its
+    job's report callback.
+    
+    The pool is started on first use, so it is created in each web worker
+    process rather than in the gunicorn master before it forks.
+    """
+    
+    def __init__(self, workers: int = None):
+        self.workers = workers or default_pool_size()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._updates = None
+        self._reporters: Dict[str, Callable[[Dict], None]] = {}
+        self._lock = threading.Lock()
+    
+    def _start(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._updates = POOL_CONTEXT.Queue()
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=POOL_CONTEXT,
+                    initializer=init_pool_worker,
+                    initargs=(self._updates,)
+                )
+                threading.Thread(target=self._dispatch, daemon=True).start()
+            return self._executor
+    
+    def _dispatch(self) -> None:
+        """Route progress updates from the workers to their jobs"""
+        while True:
+            try:
+                # Bounded waits poll the pipe through select, which gevent makes cooperative
+                job_id, update = self._updates.get(timeout=1.0)
+            except queue.Empty:
+                continue
+            except (EOFError, OSError):
+                return
+            report = self._reporters.get(job_id)
+            if report is not None:
+                report(update)
+    
+    def run(self, job_id: str, data: Dict, config: Dict, report: Callable[[Dict], None]) -> Dict[str, Any]:
+        """Optimize in a worker process and return the raw result (progress goes to report())"""
+        executor = self._start()
+        self._reporters[job_id] = report
+        try:
+            return executor.submit(optimize_in_worker, job_id, data, config).result()
+        finally:
+            self._reporters.pop(job_id, None)
+    
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
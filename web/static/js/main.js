@@ -281,10 +281,11 @@ class SchedulingInterface {
                 throw new Error(`HTTP error! status: ${response.status}`);
             }
 
-            // Handle streaming response if WebSocket is available
+            // A JSON response is a job handle: follow the job's event stream
             if (response.headers.get('content-type')?.includes('application/json')) {
-                const result = await response.json();
-                this.handleSchedulingComplete(result);
+                const job = await response.json();
+                const events = await fetch(job.events_url + '?last_event_id=0');
+                this.handleStreamingResponse(events);
             } else {
                 // Handle streaming response
                 this.handleStreamingResponse(response);
@@ -322,22 +323,27 @@ class SchedulingInterface {
     async handleStreamingResponse(response) {
         const reader = response.body.getReader();
         const decoder = new TextDecoder();
+        let buffer = '';
 
         try {
             while (true) {
                 const { done, value } = await reader.read();
                 if (done) break;
 
-                const chunk = decoder.decode(value);
-                const lines = chunk.split('\\n');
-
-                for (const line of lines) {
-                    if (line.startsWith('data: ')) {
-                        try {
-                            const data = JSON.parse(line.substring(6));
-                            this.handleProgressUpdate(data);
-                        } catch (e) {
-                            console.log('Non-JSON data:', line);
+                // Events end with a blank line and may span several chunks
+                buffer += decoder.decode(value, { stream: true });
+                const events = buffer.split('\n\n');
+                buffer = events.pop();
+
+                for (const event of events) {
+                    for (const line of event.split('\n')) {
+                        if (line.startsWith('data: ')) {
+                            try {
+                                const data = JSON.parse(line.substring(6));
+                                this.handleProgressUpdate(data);
+                            } catch (e) {
+                                console.log('Non-JSON data:', line);
+                            }
                         }
                     }
                 }
@@ -541,6 +547,7 @@ class SchedulingInterface {
         }
 
         try {
+            // Carries job_id: the server exports its stored copy when it still has the job
             const response = await fetch(`/api/export/${format}`, {
                 method: 'POST',
                 headers: {
@@ -585,6 +592,7 @@ class SchedulingInterface {
                 headers: {
                     'Content-Type': 'application/json',
                 },
+                // results carries job_id: the server reports from its stored copy when it still has the job
                 body: JSON.stringify({
                     results: this.currentResults,
                     config: this.config